@@ -1,7 +1,11 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 
+from .datumCollections import CollectionView, set_collection_format
+from .decodePlan import DecodePlan, ParameterPlan
+from .jsonCodec import JsonCodec, get_json_codec, set_json_codec
 from .meta import (
+    ConverterDispatch,
     Datum,
     InConverter,
     OutConverter,
@@ -23,12 +27,20 @@ from .web import (
 
 __all__ = [
     "Datum",
+    "ConverterDispatch",
     "_ConverterMeta",
     "_BaseConverter",
     "InConverter",
     "OutConverter",
     "SdkType",
     "get_binding_registry",
+    "DecodePlan",
+    "ParameterPlan",
+    "CollectionView",
+    "set_collection_format",
+    "JsonCodec",
+    "get_json_codec",
+    "set_json_codec",
     "ModuleTrackerMeta",
     "RequestTrackerMeta",
     "ResponseTrackerMeta",
@@ -0,0 +1,160 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import array
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+# App Setting that selects how collection Datums are exposed
+COLLECTION_FORMAT_SETTING = "PYTHON_COLLECTION_FORMAT"
+
+LIST = "list"
+ARRAY = "array"
+NUMPY = "numpy"
+FORMATS = (LIST, ARRAY, NUMPY)
+
+# array typecode and NumPy dtype of each numeric collection field
+_TYPECODES = {"double": "d", "sint64": "q"}
+_DTYPES = {"double": "float64", "sint64": "int64"}
+# Buffer formats of 8-byte values that can be copied as each field
+_BUFFER_FORMATS = {"double": ("d",), "sint64": ("q", "l")}
+
+_format: Optional[str] = None
+_format_lock = threading.Lock()
+
+
+class CollectionView(Sequence):
+    """
+    A read-only sequence over the values of a collection Datum.
+
+    The values are not copied: an element is read from the collection when
+    it is accessed, so iterating once over a large batch of strings or bytes
+    doesn't create a list of all of them.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Sequence) -> None:
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._values[i] for i in range(*index.indices(len(self)))]
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CollectionView):
+            other = other._values
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"CollectionView({list(self)!r})"
+
+
+def _get_buffer(values: Any, field: str) -> Optional[memoryview]:
+    # The values as a buffer, when they are a contiguous buffer of the
+    # numbers of the field
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+    if (
+        view.format in _BUFFER_FORMATS[field]
+        and view.itemsize == 8
+        and view.c_contiguous
+    ):
+        return view
+    return None
+
+
+def to_array(values: Sequence, field: str) -> array.array:
+    """
+    Copies numeric values into an array.array, 8 bytes per element instead
+    of a Python object per element. Values exposing the buffer protocol are
+    copied without creating an object per element.
+    """
+    result = array.array(_TYPECODES[field])
+    view = _get_buffer(values, field)
+    if view is not None:
+        result.frombytes(view.cast("B"))
+    else:
+        result.extend(values)
+    return result
+
+
+def to_numpy(values: Sequence, field: str) -> Any:
+    """
+    Copies numeric values into a NumPy array. Values exposing the buffer
+    protocol are copied directly, others are read with numpy.fromiter,
+    which doesn't keep an object per element.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            f"{COLLECTION_FORMAT_SETTING}={NUMPY} requires NumPy. Install it "
+            f"with 'pip install numpy'."
+        ) from e
+    dtype = _DTYPES[field]
+    view = _get_buffer(values, field)
+    if view is not None:
+        return numpy.frombuffer(view, dtype=dtype).copy()
+    return numpy.fromiter(values, dtype=dtype, count=len(values))
+
+
+def get_decoders(format: str) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Returns the decoders of the collection Datum types for the array or
+    numpy format. collection_double and collection_sint64 are exposed as
+    array.array or NumPy arrays, collection_string and collection_bytes as
+    CollectionView.
+    """
+    convert = to_array if format == ARRAY else to_numpy
+    return {
+        "collection_string": lambda value: CollectionView(value.string),
+        "collection_bytes": lambda value: CollectionView(value.bytes),
+        "collection_double": lambda value: convert(value.double, "double"),
+        "collection_sint64": lambda value: convert(value.sint64, "sint64"),
+    }
+
+
+def get_collection_format() -> str:
+    """
+    Returns the format of collection Datums, read on first use from the
+    PYTHON_COLLECTION_FORMAT App Setting (list by default).
+    """
+    format = _format
+    if format is None:
+        with _format_lock:
+            format = _format
+            if format is None:
+                format = set_collection_format(
+                    os.environ.get(COLLECTION_FORMAT_SETTING, LIST)
+                )
+    return format
+
+
+def set_collection_format(format: Optional[str]) -> Optional[str]:
+    """
+    Sets the format of collection Datums: list, array or numpy. None makes
+    the next get_collection_format() read the App Setting again.
+    """
+    global _format
+    if format is not None:
+        format = format.strip().lower() or LIST
+        if format not in FORMATS:
+            raise ValueError(
+                f"Unsupported collection format '{format}' in "
+                f"{COLLECTION_FORMAT_SETTING}. Supported: {', '.join(FORMATS)}."
+            )
+    _format = format
+    return format
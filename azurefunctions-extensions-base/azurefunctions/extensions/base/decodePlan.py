@@ -0,0 +1,112 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    get_args,
+    get_origin,
+)
+
+
+class ParameterPlan(NamedTuple):
+    """
+    How to decode one parameter of a function bound to an SDK type.
+
+    sdk_type is the SdkType the converter creates: the annotation, or its
+    item type for a list of SDK types. content is the binding as sent to
+    the host, such as its path and connection.
+    """
+
+    name: str
+    binding: str
+    pytype: Any
+    sdk_type: type
+    converter: type
+    decode: Callable[..., Any]
+    content: Mapping[str, Any]
+
+
+class DecodePlan:
+    """
+    The parameters of a function that are decoded into SDK types, compiled
+    once when the function is indexed.
+
+    Decoding a parameter through its plan calls the converter directly,
+    without looking up the binding registry or checking the annotation of
+    the parameter on every invocation.
+    """
+
+    __slots__ = ("_parameters",)
+
+    def __init__(self, parameters: Iterable[ParameterPlan] = ()) -> None:
+        self._parameters: Dict[str, ParameterPlan] = {
+            parameter.name: parameter for parameter in parameters
+        }
+
+    def __len__(self) -> int:
+        return len(self._parameters)
+
+    def __iter__(self) -> Iterator[ParameterPlan]:
+        return iter(self._parameters.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._parameters
+
+    def get(self, name: str) -> Optional[ParameterPlan]:
+        return self._parameters.get(name)
+
+    def decode(self, name: str, data: Any, trigger_metadata: Any = None) -> Any:
+        """
+        Decodes the data of a parameter with its converter. Raises KeyError
+        when the parameter isn't decoded into an SDK type.
+        """
+        return self._parameters[name].decode(data, trigger_metadata=trigger_metadata)
+
+    def decode_all(
+        self, data: Mapping[str, Any], trigger_metadata: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Decodes the data of every planned parameter present in data, keyed
+        by parameter name.
+        """
+        return {
+            name: parameter.decode(data[name], trigger_metadata=trigger_metadata)
+            for name, parameter in self._parameters.items()
+            if name in data
+        }
+
+    def __repr__(self) -> str:
+        return f"<DecodePlan {', '.join(self._parameters)}>"
+
+
+def compile_parameter(
+    name: str,
+    binding: str,
+    pytype: Any,
+    content: Mapping[str, Any],
+    dispatch: Any,
+) -> ParameterPlan:
+    """
+    Builds the plan of a parameter from the ConverterDispatch of its binding
+    and annotation.
+    """
+    sdk_type = pytype
+    if get_origin(pytype) is list:
+        (sdk_type,) = get_args(pytype)
+    return ParameterPlan(
+        name=name,
+        binding=binding,
+        pytype=pytype,
+        sdk_type=sdk_type,
+        converter=dispatch.converter,
+        decode=dispatch.decode,
+        content=MappingProxyType(dict(content)),
+    )
@@ -0,0 +1,200 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import abc
+import base64
+import json
+import os
+import threading
+from typing import Any, Optional, Union
+
+# App Setting that selects the JSON codec of the worker extensions
+JSON_CODEC_SETTING = "PYTHON_JSON_CODEC"
+
+AUTO = "auto"
+STDLIB = "json"
+ORJSON = "orjson"
+MSGSPEC = "msgspec"
+UJSON = "ujson"
+CODECS = (AUTO, STDLIB, ORJSON, MSGSPEC, UJSON)
+
+# The codec used unless PYTHON_JSON_CODEC selects another one. The faster
+# libraries don't decode every valid JSON document like the json module, so
+# they are only used when the function app opts in.
+DEFAULT = STDLIB
+
+# Codecs tried by auto, fastest first. The stdlib json module is used when
+# none of them is installed.
+_PREFERENCE = (ORJSON, MSGSPEC, UJSON)
+
+_codec: Optional["JsonCodec"] = None
+_codec_lock = threading.Lock()
+
+
+def encode_default(o: Any) -> Any:
+    """
+    Encodes the values JSON has no type for. Bytes are encoded as base64
+    and other objects, such as plain Enum members, as their str().
+    """
+    if isinstance(o, (bytes, bytearray, memoryview)):
+        return base64.b64encode(o).decode("ascii")
+    return str(o)
+
+
+class JsonCodec(abc.ABC):
+    """
+    Encodes and decodes JSON with one JSON library.
+
+    Every codec decodes str and bytes, raises ValueError on invalid JSON, and
+    encodes objects JSON has no type for with encode_default(). The output
+    of dumps() differs in whitespace and in the escaping of non-ASCII
+    characters, and orjson and msgspec encode plain Enum members as their
+    value instead of their str(). orjson and msgspec reject NaN, Infinity
+    and numbers out of the range of a float, which the json module accepts,
+    and orjson decodes integers of more than 64 bits as floats.
+    """
+
+    name: str
+
+    @abc.abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> str:
+        pass
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = STDLIB
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, default=encode_default)
+
+
+class OrjsonCodec(JsonCodec):
+    name = ORJSON
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+        # Keys that are not strings are converted, as the json module does
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        encoded = self._dumps(obj, default=encode_default, option=self._options)
+        return encoded.decode("utf-8")
+
+
+class MsgspecJsonCodec(JsonCodec):
+    name = MSGSPEC
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decode = msgspec.json.Decoder().decode
+        # msgspec encodes bytes as base64 itself
+        self._encode = msgspec.json.Encoder(enc_hook=encode_default).encode
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._encode(obj).decode("utf-8")
+
+
+class UjsonCodec(JsonCodec):
+    name = UJSON
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._loads = ujson.loads
+        self._dumps = ujson.dumps
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, default=encode_default, escape_forward_slashes=False)
+
+
+_CODEC_TYPES = {
+    STDLIB: StdlibJsonCodec,
+    ORJSON: OrjsonCodec,
+    MSGSPEC: MsgspecJsonCodec,
+    UJSON: UjsonCodec,
+}
+
+
+def create_json_codec(name: str = DEFAULT) -> JsonCodec:
+    """
+    Creates the codec of a JSON library: json, the stdlib module, orjson,
+    msgspec or ujson. auto picks the first of orjson, msgspec and ujson that
+    is installed, or else json.
+    """
+    name = name.strip().lower() or DEFAULT
+    if name not in CODECS:
+        raise ValueError(
+            f"Unsupported JSON codec '{name}' in {JSON_CODEC_SETTING}. "
+            f"Supported: {', '.join(CODECS)}."
+        )
+    if name != AUTO:
+        try:
+            return _CODEC_TYPES[name]()
+        except ImportError as e:
+            raise ImportError(
+                f"The {name} JSON codec selected by {JSON_CODEC_SETTING} is not "
+                f"installed. Install it with 'pip install {name}'."
+            ) from e
+    for preferred in _PREFERENCE:
+        try:
+            return _CODEC_TYPES[preferred]()
+        except ImportError:
+            continue
+    return StdlibJsonCodec()
+
+
+def get_json_codec() -> JsonCodec:
+    """
+    Returns the JSON codec of the process, created on first use from the
+    PYTHON_JSON_CODEC App Setting (json by default).
+    """
+    codec = _codec
+    if codec is None:
+        with _codec_lock:
+            codec = _codec
+            if codec is None:
+                codec = set_json_codec(os.environ.get(JSON_CODEC_SETTING, DEFAULT))
+    return codec
+
+
+def set_json_codec(codec: Optional[Union[str, JsonCodec]]) -> Optional[JsonCodec]:
+    """
+    Replaces the JSON codec of the process with a codec or the name of one.
+    None makes the next get_json_codec() read the App Setting again.
+    """
+    global _codec
+    if isinstance(codec, str):
+        codec = create_json_codec(codec)
+    _codec = codec
+    return codec
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    return get_json_codec().loads(data)
+
+
+def dumps(obj: Any) -> str:
+    return get_json_codec().dumps(obj)
@@ -2,36 +2,122 @@
 # Licensed under the MIT License.
 
 import abc
+import functools
 import inspect
-import json
-from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
 
-from . import sdkType, utils
+from . import datumCollections, jsonCodec, sdkType, utils
+from .decodePlan import DecodePlan
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _json(value: Any) -> Any:
+    return jsonCodec.loads(value)
+
+
+def _collection_string(value: Any) -> list:
+    return list(value.string)
+
+
+def _collection_bytes(value: Any) -> list:
+    return list(value.bytes)
+
+
+def _collection_double(value: Any) -> list:
+    return list(value.double)
+
+
+def _collection_sint64(value: Any) -> list:
+    return list(value.sint64)
+
+
+# Decoder of the python value of each Datum type. Types without a decoder
+# are returned as they are.
+_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "bytes": _identity,
+    "string": _identity,
+    "int": _identity,
+    "double": _identity,
+    "json": _json,
+    "collection_string": _collection_string,
+    "collection_bytes": _collection_bytes,
+    "collection_double": _collection_double,
+    "collection_sint64": _collection_sint64,
+}
+
+# The decoders of the opt-in collection formats, which don't copy collections
+# into lists
+_FORMAT_DECODERS: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+    format: {**_DECODERS, **datumCollections.get_decoders(format)}
+    for format in (datumCollections.ARRAY, datumCollections.NUMPY)
+}
+
+# Marks a Datum whose python value hasn't been decoded yet
+_NOT_DECODED = object()
 
 
 class Datum:
+    __slots__ = ("_value", "_type", "_python_value")
+
     def __init__(self, value: Any, type: Optional[str]):
-        self.value: Any = value
-        self.type: Optional[str] = type
+        self._value: Any = value
+        self._type: Optional[str] = type
+        self._python_value: Any = _NOT_DECODED
+
+    @property
+    def value(self) -> Any:
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+        self._python_value = _NOT_DECODED
+
+    @property
+    def type(self) -> Optional[str]:
+        return self._type
+
+    @type.setter
+    def type(self, type: Optional[str]) -> None:
+        self._type = type
+        self._python_value = _NOT_DECODED
 
     @property
     def python_value(self) -> Any:
-        if self.value is None or self.type is None:
-            return None
-        elif self.type in ("bytes", "string", "int", "double"):
-            return self.value
-        elif self.type == "json":
-            return json.loads(self.value)
-        elif self.type == "collection_string":
-            return [v for v in self.value.string]
-        elif self.type == "collection_bytes":
-            return [v for v in self.value.bytes]
-        elif self.type == "collection_double":
-            return [v for v in self.value.double]
-        elif self.type == "collection_sint64":
-            return [v for v in self.value.sint64]
-        else:
-            return self.value
+        """
+        The value decoded according to its type. It is decoded on first
+        access and cached, so a json value is parsed once however many
+        times it is read; the same object is returned each time.
+
+        Collections are lists, unless PYTHON_COLLECTION_FORMAT selects
+        array.array or NumPy arrays for numbers and views for strings and
+        bytes.
+        """
+        python_value = self._python_value
+        if python_value is _NOT_DECODED:
+            if self._value is None or self._type is None:
+                python_value = None
+            else:
+                format = datumCollections.get_collection_format()
+                decoders = _FORMAT_DECODERS.get(format, _DECODERS)
+                decoder = decoders.get(self._type, _identity)
+                python_value = decoder(self._value)
+            self._python_value = python_value
+        return python_value
 
     @property
     def python_type(self) -> type:
@@ -53,9 +139,24 @@ class Datum:
         return "<Datum {} {}>".format(self.type, val_repr)
 
 
+class ConverterDispatch(NamedTuple):
+    """
+    The converter of a binding and its decode() for one parameter type,
+    called as decode(data, trigger_metadata=...).
+    """
+
+    converter: type
+    decode: Callable[..., Any]
+
+
 class _ConverterMeta(abc.ABCMeta):
 
     _bindings: Dict[str, type] = {}
+    # (binding name, pytype) -> ConverterDispatch, or None when the binding
+    # has no converter for the type
+    _dispatch: Dict[Tuple[str, Any], Optional[ConverterDispatch]] = {}
+    # indexed function -> DecodePlan, compiled by get_raw_bindings
+    _decode_plans: Dict[Any, DecodePlan] = {}
 
     def __new__(
         mcls, name, bases, dct, *, binding: Optional[str], trigger: Optional[str] = None
@@ -75,6 +176,11 @@ class _ConverterMeta(abc.ABCMeta):
         mcls._bindings[binding] = cls
         if trigger is not None:
             mcls._bindings[trigger] = cls
+        # A binding may now resolve to the new converter. Functions are
+        # indexed after their converters are imported, so this only drops
+        # plans in tests.
+        mcls._dispatch.clear()
+        mcls._decode_plans.clear()
 
         return cls
 
@@ -82,12 +188,70 @@ class _ConverterMeta(abc.ABCMeta):
     def get(cls, binding_name):
         return cls._bindings.get(binding_name)
 
+    @classmethod
+    def get_dispatch(
+        cls, binding_name: str, pytype: Any
+    ) -> Optional[ConverterDispatch]:
+        """
+        Returns the converter of a binding and its decode() for a parameter
+        type, or None when the type isn't an SDK type supported by the
+        converter of the binding.
+
+        The result is cached per (binding name, pytype) until a converter
+        registers, so the converter lookup and the type checks run once per
+        parameter instead of on every invocation.
+        """
+        key = (binding_name, pytype)
+        try:
+            return cls._dispatch[key]
+        except KeyError:
+            dispatch = cls._resolve_dispatch(binding_name, pytype)
+            cls._dispatch[key] = dispatch
+            return dispatch
+        except TypeError:
+            # An annotation that can't be hashed isn't cached
+            return cls._resolve_dispatch(binding_name, pytype)
+
+    @classmethod
+    def _resolve_dispatch(
+        cls, binding_name: str, pytype: Any
+    ) -> Optional[ConverterDispatch]:
+        converter = cls.get(binding_name)
+        if (
+            converter is None
+            or not cls.check_supported_type(pytype, binding_name)
+            or not converter.check_input_type_annotation(pytype)
+        ):
+            return None
+        return ConverterDispatch(
+            converter, functools.partial(converter.decode, pytype=pytype)
+        )
+
     @classmethod
     def get_raw_bindings(cls, indexed_function, input_types):
         return utils.get_raw_bindings(indexed_function, input_types)
 
     @classmethod
-    def check_supported_type(cls, subclass: type) -> bool:
+    def get_decode_plan(cls, indexed_function) -> Optional[DecodePlan]:
+        """
+        Returns the DecodePlan compiled for a function by get_raw_bindings,
+        or None when the function hasn't been indexed.
+        """
+        return cls._decode_plans.get(indexed_function)
+
+    @classmethod
+    def check_supported_type(
+        cls, subclass: type, binding_name: Optional[str] = None
+    ) -> bool:
+        # A list of SDK types, e.g. List[BlobClient], is bound to a
+        # collection of model binding data when the converter of the binding
+        # supports collections
+        if get_origin(subclass) is list:
+            converter = cls.get(binding_name) if binding_name is not None else None
+            if converter is None or not converter.supports_collections:
+                return False
+            args = get_args(subclass)
+            subclass = args[0] if len(args) == 1 else None
         if subclass is not None and inspect.isclass(subclass):
             return issubclass(subclass, sdkType.SdkType)
         return False
@@ -98,6 +262,10 @@ class _ConverterMeta(abc.ABCMeta):
 
 class _BaseConverter(metaclass=_ConverterMeta, binding=None):
 
+    # Whether the converter decodes a collection of model binding data into
+    # a list of SDK types, for parameters annotated as List[SdkType]
+    supports_collections: bool = False
+
     @classmethod
     def _decode_typed_data(
         cls,
@@ -8,7 +8,7 @@ from abc import ABC
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 
-from . import meta
+from . import decodePlan, jsonCodec, meta
 
 SNAKE_CASE_RE = re.compile(r"^([a-zA-Z]+\d*_|_+[a-zA-Z\d])\w*$")
 WORD_RE = re.compile(r"^([a-zA-Z]+\d*)$")
@@ -23,7 +23,7 @@ class StringifyEnum(Enum):
 
 class StringifyEnumJsonEncoder(json.JSONEncoder):
     def default(self, o):
-        return str(o)
+        return jsonCodec.encode_default(o)
 
 
 class BuildDictMeta(type):
@@ -188,7 +188,7 @@ class Binding(ABC):
         if (
             binding.type in meta._ConverterMeta._bindings
             and binding.direction == 0
-            and meta._ConverterMeta.check_supported_type(pytype)
+            and meta._ConverterMeta.check_supported_type(pytype, binding.type)
         ):
             binding._dict["properties"] = {"SupportsDeferredBinding": True}
             binding_info = {binding.name: {pytype: "True"}}
@@ -245,14 +245,52 @@ def is_word(input_string: str) -> bool:
     return WORD_RE.match(input_string) is not None
 
 
+def stringify_enums(value):
+    """
+    Recursively replaces the plain Enum members of dictionaries and lists
+    with their str(), as StringifyEnumJsonEncoder does, so that every JSON
+    codec encodes them alike. Enums mixed with str, int or float are kept.
+    """
+    if isinstance(value, dict):
+        return {key: stringify_enums(val) for key, val in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [stringify_enums(x) for x in value]
+    elif isinstance(value, Enum) and not isinstance(value, (str, int, float)):
+        return str(value)
+    else:
+        return value
+
+
 def get_raw_bindings(indexed_function, input_types):
+    """
+    Returns the JSON of each binding of a function and whether its
+    parameter supports deferred binding. The DecodePlan of the parameters
+    decoded into SDK types is compiled and kept by the binding registry.
+    """
     binding_dict_repr = []
     bindings_logs = {}
+    parameters = []
     for b in indexed_function._bindings:
         dict_repr, logs = Binding.get_dict_repr(b, input_types)
-        clean_dict_repr = BuildDictMeta.clean_nones(dict_repr)
-        binding_dict_repr.append(
-            json.dumps(clean_dict_repr, cls=StringifyEnumJsonEncoder)
-        )
+        clean_dict_repr = stringify_enums(BuildDictMeta.clean_nones(dict_repr))
+        binding_dict_repr.append(jsonCodec.dumps(clean_dict_repr))
         bindings_logs.update(logs)
+        if dict_repr["properties"]["SupportsDeferredBinding"]:
+            pytype = input_types[b.name].pytype
+            try:
+                dispatch = meta._ConverterMeta.get_dispatch(b.type, pytype)
+            except Exception:
+                # The converter rejected the annotation. Indexing goes on
+                # without a plan, and the parameter is decoded as before,
+                # surfacing the error when the function is invoked
+                dispatch = None
+            if dispatch is not None:
+                parameters.append(
+                    decodePlan.compile_parameter(
+                        b.name, b.type, pytype, clean_dict_repr, dispatch
+                    )
+                )
+    meta._ConverterMeta._decode_plans[indexed_function] = decodePlan.DecodePlan(
+        parameters
+    )
     return binding_dict_repr, bindings_logs
@@ -0,0 +1,109 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""
+Measures the conversion time and memory per element of collection Datums
+in each PYTHON_COLLECTION_FORMAT: list, array and numpy.
+
+The collections are served by a sequence that creates a Python object for
+each element read and has no buffer protocol, as a protobuf repeated field
+does, so every format pays for reading one object per element and the
+array and numpy formats only save memory. Numeric collections are also
+measured with values exposing the buffer protocol, which the array and
+numpy formats copy without creating any object.
+
+Usage:
+    python benchmarks/datum_collections.py [--elements 1000000]
+"""
+
+import argparse
+import array
+import time
+import tracemalloc
+
+from azurefunctions.extensions.base import Datum, set_collection_format
+
+
+class RepeatedField:
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._values)
+
+
+class Collection:
+    def __init__(self, field: str, values):
+        setattr(self, field, values)
+
+
+def create_collections(elements: int):
+    doubles = array.array("d", (i * 0.5 for i in range(elements)))
+    integers = array.array("q", range(elements))
+    return [
+        ("collection_double", "repeated", Collection("double", RepeatedField(doubles))),
+        ("collection_double", "buffer", Collection("double", doubles)),
+        (
+            "collection_sint64",
+            "repeated",
+            Collection("sint64", RepeatedField(integers)),
+        ),
+        ("collection_sint64", "buffer", Collection("sint64", integers)),
+        (
+            "collection_string",
+            "repeated",
+            Collection(
+                "string", RepeatedField([f"value {i}" for i in range(elements)])
+            ),
+        ),
+        (
+            "collection_bytes",
+            "repeated",
+            Collection(
+                "bytes", RepeatedField([b"value %d" % i for i in range(elements)])
+            ),
+        ),
+    ]
+
+
+def measure(type_name: str, value, elements: int, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        Datum(value=value, type=type_name).python_value
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    python_value = Datum(value=value, type=type_name).python_value
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del python_value
+    return min(timings) * 1000, size / elements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    collections = create_collections(args.elements)
+    print(f"{args.elements} elements, best of {args.repeat}")
+    print(f"{'type':>18} {'values':>9} {'format':>7} {'ms':>9} {'bytes/element':>14}")
+    for type_name, source, value in collections:
+        for format in ("list", "array", "numpy"):
+            set_collection_format(format)
+            milliseconds, size = measure(type_name, value, args.elements, args.repeat)
+            print(
+                f"{type_name:>18} {source:>9} {format:>7} {milliseconds:>9.2f} "
+                f"{size:>14.1f}"
+            )
+    set_collection_format(None)
+
+
+if __name__ == "__main__":
+    main()
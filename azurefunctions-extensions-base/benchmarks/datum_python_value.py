@@ -0,0 +1,126 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""
+Measures Datum.python_value for every supported type, and the memory of a
+Datum, compared with the if/elif implementation it replaced.
+
+The previous Datum walked an if/elif chain on every access and decoded json
+values each time, so reading python_value and then python_type parsed them
+twice. Each access pattern is timed on a new Datum per invocation, as the
+worker creates one per binding.
+
+Usage:
+    python benchmarks/datum_python_value.py [--number 200000]
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Any, Optional
+
+from azurefunctions.extensions.base import Datum
+
+
+class IfElifDatum:
+    def __init__(self, value: Any, type: Optional[str]):
+        self.value: Any = value
+        self.type: Optional[str] = type
+
+    @property
+    def python_value(self) -> Any:
+        if self.value is None or self.type is None:
+            return None
+        elif self.type in ("bytes", "string", "int", "double"):
+            return self.value
+        elif self.type == "json":
+            return json.loads(self.value)
+        elif self.type == "collection_string":
+            return [v for v in self.value.string]
+        elif self.type == "collection_bytes":
+            return [v for v in self.value.bytes]
+        elif self.type == "collection_double":
+            return [v for v in self.value.double]
+        elif self.type == "collection_sint64":
+            return [v for v in self.value.sint64]
+        else:
+            return self.value
+
+    @property
+    def python_type(self) -> type:
+        return type(self.python_value)
+
+
+class Collection:
+    def __init__(self, field: str, values: list):
+        setattr(self, field, values)
+
+
+VALUES = {
+    "bytes": b"x" * 64,
+    "string": "x" * 64,
+    "int": 42,
+    "double": 4.2,
+    "json": json.dumps({"id": 1, "name": "item", "tags": ["a", "b"], "price": 2.5}),
+    "collection_string": Collection("string", ["x" * 16] * 8),
+    "collection_bytes": Collection("bytes", [b"x" * 16] * 8),
+    "collection_double": Collection("double", [4.2] * 8),
+    "collection_sint64": Collection("sint64", list(range(8))),
+    "model_binding_data": object(),
+}
+
+
+def access(datum_type, value, type_name):
+    def run():
+        datum = datum_type(value, type_name)
+        datum.python_value
+        datum.python_type
+        datum.python_value
+
+    return run
+
+
+def memory(datum_type, count: int = 100000) -> float:
+    tracemalloc.start()
+    datums = [datum_type(b"", "bytes") for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del datums
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        "python_value, python_type, python_value on a new Datum, "
+        f"best of {args.repeat}, ns per invocation"
+    )
+    print(f"{'type':>20} {'if/elif':>9} {'table':>9} {'speedup':>8}")
+    for type_name, value in VALUES.items():
+        timings = []
+        for datum_type in (IfElifDatum, Datum):
+            best = min(
+                timeit.repeat(
+                    access(datum_type, value, type_name),
+                    number=args.number,
+                    repeat=args.repeat,
+                )
+            )
+            timings.append(best / args.number * 1e9)
+        print(
+            f"{type_name:>20} {timings[0]:>9.0f} {timings[1]:>9.0f} "
+            f"{timings[0] / timings[1]:>7.2f}x"
+        )
+
+    print(
+        f"\nbytes per Datum: if/elif {memory(IfElifDatum):.0f}, "
+        f"table {memory(Datum):.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
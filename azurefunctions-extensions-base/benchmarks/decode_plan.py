@@ -0,0 +1,122 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""
+Measures the dispatch cost of decoding the SDK type parameters of an
+invocation: through the binding registry and annotation checks on every
+invocation, through the dispatch cache, and through the DecodePlan
+compiled when the function is indexed.
+
+The converter's decode() returns at once, so the timings are the cost of
+the dispatch alone.
+
+Usage:
+    python benchmarks/decode_plan.py [--number 200000]
+"""
+
+import argparse
+import inspect
+import timeit
+from typing import List, get_args, get_origin
+
+from azurefunctions.extensions.base import (
+    Datum,
+    InConverter,
+    SdkType,
+    get_binding_registry,
+    utils,
+)
+
+
+class Client(SdkType):
+    def get_sdk_type(self):
+        return None
+
+
+class Stream(SdkType):
+    def get_sdk_type(self):
+        return None
+
+
+class BenchmarkConverter(
+    InConverter, binding="benchmarkBlob", trigger="benchmarkBlobTrigger"
+):
+    @classmethod
+    def check_input_type_annotation(cls, pytype) -> bool:
+        if get_origin(pytype) is list:
+            (pytype,) = get_args(pytype)
+        return inspect.isclass(pytype) and issubclass(pytype, (Client, Stream))
+
+    @classmethod
+    def decode(cls, data, *, trigger_metadata, pytype):
+        return data
+
+    @classmethod
+    def has_implicit_output(cls) -> bool:
+        return False
+
+
+class ParamTypeInfo:
+    def __init__(self, binding_name: str, pytype):
+        self.binding_name = binding_name
+        self.pytype = pytype
+
+
+class Function:
+    def __init__(self, bindings):
+        self._bindings = bindings
+
+
+PARAMETERS = {
+    "client": ("benchmarkBlobTrigger", Client),
+    "streams": ("benchmarkBlob", List[Stream]),
+}
+DATA = {name: Datum(value=None, type="model_binding_data") for name in PARAMETERS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = get_binding_registry()
+    function = Function(
+        [
+            utils.Binding(name=name, direction=utils.BindingDirection.IN, type=binding)
+            for name, (binding, _) in PARAMETERS.items()
+        ]
+    )
+    registry.get_raw_bindings(
+        function,
+        {
+            name: ParamTypeInfo(binding, pytype)
+            for name, (binding, pytype) in PARAMETERS.items()
+        },
+    )
+    plan = registry.get_decode_plan(function)
+
+    def reflection():
+        for name, (binding, pytype) in PARAMETERS.items():
+            converter = registry.get(binding)
+            if not registry.check_supported_type(pytype):
+                continue
+            if converter.check_input_type_annotation(pytype):
+                converter.decode(DATA[name], trigger_metadata=None, pytype=pytype)
+
+    def dispatch_cache():
+        for name, (binding, pytype) in PARAMETERS.items():
+            dispatch = registry.get_dispatch(binding, pytype)
+            if dispatch is not None:
+                dispatch.decode(DATA[name], trigger_metadata=None)
+
+    def decode_plan():
+        plan.decode_all(DATA)
+
+    print(f"{len(PARAMETERS)} parameters, best of {args.repeat}, ns per invocation")
+    for run in (reflection, dispatch_cache, decode_plan):
+        best = min(timeit.repeat(run, number=args.number, repeat=args.repeat))
+        print(f"{run.__name__:>15} {best / args.number * 1e9:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""
+Measures the decode and encode throughput of each installed JSON codec on
+payloads from 1 KB to 10 MB.
+
+The payloads are lists of records such as the ones received by a function
+with a json binding. Decoding goes through Datum.python_value, encoding
+through the codec's dumps(), as in get_raw_bindings.
+
+Usage:
+    python benchmarks/json_codec.py [--sizes-kb 1 100 1024 10240]
+"""
+
+import argparse
+import importlib.util
+import json
+import time
+
+from azurefunctions.extensions.base import Datum, jsonCodec, set_json_codec
+
+KB = 1024
+MB = 1024 * 1024
+
+
+def create_payload(size: int) -> str:
+    records = []
+    encoded = 2
+    while encoded < size:
+        record = {
+            "id": len(records),
+            "name": f"item {len(records)}",
+            "price": len(records) * 0.25,
+            "tags": ["blob", "trigger"],
+            "active": len(records) % 2 == 0,
+        }
+        records.append(record)
+        encoded += len(json.dumps(record)) + 2
+    return json.dumps(records)
+
+
+def measure(run, size: int, min_time: float) -> float:
+    # Repeats the run for at least min_time and returns the best MB/s
+    best = float("inf")
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_time:
+        before = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - before)
+    return size / best / MB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes-kb", type=int, nargs="+", default=[1, 100, 1024, 10240]
+    )
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    names = [jsonCodec.STDLIB] + [
+        name for name in jsonCodec._PREFERENCE if importlib.util.find_spec(name)
+    ]
+    print(f"codecs: {', '.join(names)}; best MB/s over {args.min_time} s")
+    print(f"{'payload':>9} {'codec':>8} {'decode':>9} {'encode':>9}")
+    for size_kb in args.sizes_kb:
+        payload = create_payload(size_kb * KB)
+        value = json.loads(payload)
+        for name in names:
+            codec = set_json_codec(name)
+            decode = measure(
+                lambda: Datum(value=payload, type="json").python_value,
+                len(payload),
+                args.min_time,
+            )
+            encode = measure(lambda: codec.dumps(value), len(payload), args.min_time)
+            print(f"{size_kb:>6} KB {name:>8} {decode:>9.1f} {encode:>9.1f}")
+    set_json_codec(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import array
+import os
+import unittest
+from unittest.mock import patch
+
+import numpy
+from azurefunctions.extensions.base import (
+    CollectionView,
+    Datum,
+    datumCollections,
+    set_collection_format,
+)
+
+
+class RepeatedField:
+    """
+    Like a protobuf repeated field: a sequence without the buffer protocol,
+    creating a Python object for each element read.
+    """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._values)
+
+
+class Collection:
+    def __init__(self, **fields):
+        for name, values in fields.items():
+            setattr(self, name, RepeatedField(values))
+
+
+class TestCollectionView(unittest.TestCase):
+    def test_sequence(self):
+        view = CollectionView(RepeatedField(["a", "b", "c"]))
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[1], "b")
+        self.assertEqual(view[-1], "c")
+        self.assertEqual(view[::2], ["a", "c"])
+        self.assertEqual(list(view), ["a", "b", "c"])
+        self.assertEqual(view, ["a", "b", "c"])
+        self.assertNotEqual(view, ["a", "b"])
+        self.assertIn("b", view)
+        self.assertEqual(repr(view), "CollectionView(['a', 'b', 'c'])")
+        with self.assertRaises(IndexError):
+            view[3]
+
+
+class TestConversions(unittest.TestCase):
+    def test_to_array(self):
+        result = datumCollections.to_array(RepeatedField([1.5, 2.5]), "double")
+        self.assertEqual(result, array.array("d", [1.5, 2.5]))
+        result = datumCollections.to_array(RepeatedField([-(2**63), 7]), "sint64")
+        self.assertEqual(result, array.array("q", [-(2**63), 7]))
+
+    def test_buffers(self):
+        source = numpy.arange(6, dtype=numpy.int64)
+        self.assertEqual(
+            datumCollections.to_array(source, "sint64"), array.array("q", range(6))
+        )
+        # Copied, not a view of the source
+        result = datumCollections.to_numpy(array.array("d", [1.0, 2.0]), "double")
+        self.assertTrue(result.flags.owndata)
+        # Buffers of other types or strides are read element by element
+        numpy.testing.assert_array_equal(
+            datumCollections.to_numpy(source[::2], "sint64"), [0, 2, 4]
+        )
+        numpy.testing.assert_array_equal(
+            datumCollections.to_numpy(source.astype(numpy.int32), "sint64"),
+            source,
+        )
+
+    def test_to_numpy(self):
+        result = datumCollections.to_numpy(RepeatedField([1.5, 2.5]), "double")
+        self.assertEqual(result.dtype, numpy.float64)
+        numpy.testing.assert_array_equal(result, [1.5, 2.5])
+        result = datumCollections.to_numpy(RepeatedField([]), "sint64")
+        self.assertEqual((result.dtype, len(result)), (numpy.int64, 0))
+
+    def test_numpy_not_installed(self):
+        with patch.dict("sys.modules", {"numpy": None}):
+            with self.assertRaisesRegex(ImportError, "pip install numpy"):
+                datumCollections.to_numpy([1.0], "double")
+
+
+class TestCollectionFormat(unittest.TestCase):
+    def setUp(self):
+        set_collection_format(None)
+        self.addCleanup(set_collection_format, None)
+
+    def decode(self, type, **fields):
+        return Datum(value=Collection(**fields), type=type).python_value
+
+    def test_list_by_default(self):
+        self.assertEqual(datumCollections.get_collection_format(), "list")
+        self.assertEqual(self.decode("collection_double", double=[1.0]), [1.0])
+
+    def test_array(self):
+        set_collection_format("array")
+        self.assertEqual(
+            self.decode("collection_double", double=[1.0, 2.0]),
+            array.array("d", [1.0, 2.0]),
+        )
+        self.assertEqual(
+            self.decode("collection_sint64", sint64=[3, 4]), array.array("q", [3, 4])
+        )
+        strings = self.decode("collection_string", string=["a", "b"])
+        self.assertIsInstance(strings, CollectionView)
+        self.assertEqual(strings, ["a", "b"])
+        self.assertEqual(self.decode("collection_bytes", bytes=[b"a"]), [b"a"])
+        # Other types are not affected
+        self.assertEqual(Datum(value="[1, 2]", type="json").python_value, [1, 2])
+
+    @patch.dict(os.environ, {datumCollections.COLLECTION_FORMAT_SETTING: " NumPy "})
+    def test_numpy_from_app_setting(self):
+        values = self.decode("collection_sint64", sint64=[1, 2, 3])
+        self.assertIsInstance(values, numpy.ndarray)
+        self.assertEqual(values.dtype, numpy.int64)
+        self.assertEqual(values.sum(), 6)
+        self.assertEqual(
+            Datum(value=Collection(double=[0.5]), type="collection_double").python_type,
+            numpy.ndarray,
+        )
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            set_collection_format("tuple")
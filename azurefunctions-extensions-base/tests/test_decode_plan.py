@@ -0,0 +1,158 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from azurefunctions.extensions.base import (
+    DecodePlan,
+    ParameterPlan,
+    get_binding_registry,
+    meta,
+    sdkType,
+    utils,
+)
+
+
+class MockSdkType(sdkType.SdkType):
+    def get_sdk_type(self):
+        return None
+
+
+class MockParamTypeInfo:
+    def __init__(self, binding_name: str, pytype: type):
+        self.binding_name = binding_name
+        self.pytype = pytype
+
+
+class MockFunction:
+    def __init__(self, bindings):
+        self._bindings = bindings
+
+
+class TestDecodePlan(unittest.TestCase):
+    def setUp(self):
+        for name in ("_bindings", "_dispatch", "_decode_plans"):
+            patcher = patch.object(meta._ConverterMeta, name, {})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        class MockConverter(meta.InConverter, binding="blob", trigger="blobTrigger"):
+            supports_collections = True
+            checked = 0
+
+            @classmethod
+            def check_input_type_annotation(cls, pytype):
+                cls.checked += 1
+                return True
+
+            @classmethod
+            def decode(cls, data, *, trigger_metadata, pytype):
+                return (data, trigger_metadata, pytype)
+
+            @classmethod
+            def has_implicit_output(cls):
+                return False
+
+        self.converter = MockConverter
+
+    def index(self, function, input_types):
+        registry = get_binding_registry()
+        registry.get_raw_bindings(function, input_types)
+        return registry.get_decode_plan(function)
+
+    def test_plan_of_sdk_type_parameters(self):
+        trigger = utils.Binding(
+            name="client", direction=utils.BindingDirection.IN, type="blobTrigger"
+        )
+        streams = utils.Binding(
+            name="streams", direction=utils.BindingDirection.IN, type="blob"
+        )
+        content = utils.Binding(
+            name="content", direction=utils.BindingDirection.IN, type="blob"
+        )
+        output = utils.Binding(
+            name="$return", direction=utils.BindingDirection.OUT, type="blob"
+        )
+        function = MockFunction([trigger, streams, content, output])
+        plan = self.index(
+            function,
+            {
+                "client": MockParamTypeInfo("blobTrigger", MockSdkType),
+                "streams": MockParamTypeInfo("blob", List[MockSdkType]),
+                "content": MockParamTypeInfo("blob", bytes),
+            },
+        )
+
+        self.assertIsInstance(plan, DecodePlan)
+        self.assertEqual([parameter.name for parameter in plan], ["client", "streams"])
+        self.assertNotIn("content", plan)
+        client = plan.get("client")
+        self.assertIsInstance(client, ParameterPlan)
+        self.assertEqual(
+            (client.binding, client.pytype, client.sdk_type, client.converter),
+            ("blobTrigger", MockSdkType, MockSdkType, self.converter),
+        )
+        self.assertEqual(client.content["type"], "blobTrigger")
+        self.assertEqual(client.content["direction"], "IN")
+        self.assertEqual(
+            client.content["properties"], {"SupportsDeferredBinding": True}
+        )
+        with self.assertRaises(TypeError):
+            client.content["type"] = "queue"
+        self.assertEqual(plan.get("streams").sdk_type, MockSdkType)
+
+        # Invocations don't check the annotations again
+        checked = self.converter.checked
+        self.assertEqual(plan.decode("client", "data", {}), ("data", {}, MockSdkType))
+        self.assertEqual(
+            plan.decode_all({"streams": "data", "content": b"bytes"}),
+            {"streams": ("data", None, List[MockSdkType])},
+        )
+        self.assertEqual(self.converter.checked, checked)
+        with self.assertRaises(KeyError):
+            plan.decode("content", b"bytes")
+
+    def test_annotation_check_raises(self):
+        class MockRaisingConverter(meta.InConverter, binding="queue"):
+            @classmethod
+            def check_input_type_annotation(cls, pytype):
+                raise TypeError("unsupported annotation")
+
+        queue = utils.Binding(
+            name="queue", direction=utils.BindingDirection.IN, type="queue"
+        )
+        client = utils.Binding(
+            name="client", direction=utils.BindingDirection.IN, type="blob"
+        )
+        function = MockFunction([queue, client])
+        plan = self.index(
+            function,
+            {
+                "queue": MockParamTypeInfo("queue", MockSdkType),
+                "client": MockParamTypeInfo("blob", MockSdkType),
+            },
+        )
+
+        # Indexing succeeds, and only the other parameter is planned
+        self.assertNotIn("queue", plan)
+        self.assertIn("client", plan)
+
+    def test_function_without_sdk_types(self):
+        binding = utils.Binding(
+            name="content", direction=utils.BindingDirection.IN, type="queue"
+        )
+        function = MockFunction([binding])
+        plan = self.index(function, {"content": MockParamTypeInfo("queue", str)})
+        self.assertEqual(len(plan), 0)
+        self.assertIsNone(get_binding_registry().get_decode_plan(MockFunction([])))
+
+    def test_registration_drops_plans(self):
+        function = MockFunction([])
+        self.index(function, {})
+
+        class MockQueueConverter(self.converter, binding="queue"):
+            pass
+
+        self.assertIsNone(get_binding_registry().get_decode_plan(function))
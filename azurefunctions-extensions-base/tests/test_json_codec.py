@@ -0,0 +1,175 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+
+import importlib.util
+import json
+import os
+import unittest
+from enum import Enum, IntEnum
+from unittest.mock import patch
+
+from azurefunctions.extensions.base import (
+    Datum,
+    get_json_codec,
+    jsonCodec,
+    set_json_codec,
+    utils,
+)
+
+INSTALLED = [jsonCodec.STDLIB] + [
+    name for name in jsonCodec._PREFERENCE if importlib.util.find_spec(name)
+]
+
+
+class Color(Enum):
+    RED = 1
+
+
+class Size(str, Enum):
+    LARGE = "large"
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+class MockFunction:
+    def __init__(self, bindings):
+        self._bindings = bindings
+
+
+class TestJsonCodecs(unittest.TestCase):
+    def test_loads(self):
+        for name in INSTALLED:
+            codec = jsonCodec.create_json_codec(name)
+            with self.subTest(codec=name):
+                self.assertEqual(codec.name, name)
+                self.assertEqual(
+                    codec.loads('{"a": [1, 2.5, null]}'), {"a": [1, 2.5, None]}
+                )
+                self.assertEqual(codec.loads(b'"\\u00e9"'), "é")
+                with self.assertRaises(ValueError):
+                    codec.loads("{")
+
+    def test_dumps(self):
+        value = {
+            "str_enum": Size.LARGE,
+            "int_enum": Level.HIGH,
+            "bytes": b"\x00\xff",
+            "nested": [(1, "a/b"), {"text": "é"}],
+            1: True,
+        }
+        expected = {
+            "str_enum": "large",
+            "int_enum": 3,
+            "bytes": "AP8=",
+            "nested": [[1, "a/b"], {"text": "é"}],
+            "1": True,
+        }
+        for name in INSTALLED:
+            codec = jsonCodec.create_json_codec(name)
+            with self.subTest(codec=name):
+                encoded = codec.dumps(value)
+                self.assertIsInstance(encoded, str)
+                self.assertEqual(json.loads(encoded), expected)
+
+    def test_plain_enum(self):
+        for name in INSTALLED:
+            codec = jsonCodec.create_json_codec(name)
+            with self.subTest(codec=name):
+                # Only the json and ujson codecs call encode_default for them
+                self.assertIn(
+                    json.loads(codec.dumps([Color.RED])), [["Color.RED"], [1]]
+                )
+                self.assertEqual(
+                    json.loads(codec.dumps(utils.stringify_enums([Color.RED]))),
+                    ["Color.RED"],
+                )
+
+    def test_stdlib_output(self):
+        codec = jsonCodec.create_json_codec("json")
+        self.assertEqual(codec.dumps({"a": Color.RED}), '{"a": "Color.RED"}')
+
+    def test_json_by_default(self):
+        codec = jsonCodec.create_json_codec()
+        self.assertIsInstance(codec, jsonCodec.StdlibJsonCodec)
+        # Valid JSON the faster libraries don't all decode alike
+        self.assertEqual(
+            codec.loads('{"a": 123456789012345678901234567890, "b": 1e400}'),
+            {"a": 123456789012345678901234567890, "b": float("inf")},
+        )
+
+    def test_auto(self):
+        codec = jsonCodec.create_json_codec("auto")
+        # The fastest installed codec, or else json
+        self.assertEqual(codec.name, (INSTALLED[1:] or INSTALLED)[0])
+        with patch.dict(
+            "sys.modules", {"orjson": None, "msgspec": None, "ujson": None}
+        ):
+            self.assertIsInstance(
+                jsonCodec.create_json_codec(" AUTO "), jsonCodec.StdlibJsonCodec
+            )
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ValueError):
+            jsonCodec.create_json_codec("simplejson")
+        with patch.dict("sys.modules", {"orjson": None}):
+            with self.assertRaisesRegex(ImportError, "pip install orjson"):
+                jsonCodec.create_json_codec("orjson")
+
+
+class TestJsonCodecSetting(unittest.TestCase):
+    def setUp(self):
+        set_json_codec(None)
+        self.addCleanup(set_json_codec, None)
+
+    @patch.dict(os.environ, {jsonCodec.JSON_CODEC_SETTING: "auto"})
+    def test_from_app_setting(self):
+        codec = get_json_codec()
+        self.assertEqual(codec.name, (INSTALLED[1:] or INSTALLED)[0])
+        self.assertIs(get_json_codec(), codec)
+
+    def test_datum_decoded_with_json_by_default(self):
+        with patch.dict(os.environ):
+            os.environ.pop(jsonCodec.JSON_CODEC_SETTING, None)
+            datum = Datum('{"a": 123456789012345678901234567890}', "json")
+            self.assertEqual(datum.python_value, {"a": 123456789012345678901234567890})
+            self.assertIsInstance(get_json_codec(), jsonCodec.StdlibJsonCodec)
+
+    def test_custom_codec(self):
+        class RecordingCodec(jsonCodec.StdlibJsonCodec):
+            name = "recording"
+            calls = []
+
+            def loads(self, data):
+                self.calls.append("loads")
+                return super().loads(data)
+
+            def dumps(self, obj):
+                self.calls.append("dumps")
+                return super().dumps(obj)
+
+        set_json_codec(RecordingCodec())
+        self.assertEqual(Datum(value='"text"', type="json").python_value, "text")
+        binding = utils.Binding(
+            name="client", direction=utils.BindingDirection.IN, type="blob"
+        )
+        utils.get_raw_bindings(MockFunction([binding]), {})
+        self.assertEqual(RecordingCodec.calls, ["loads", "dumps"])
+
+    def test_raw_bindings_with_every_codec(self):
+        binding = utils.Binding(
+            name="client", direction=utils.BindingDirection.IN, type="blob"
+        )
+        for name in INSTALLED:
+            set_json_codec(name)
+            with self.subTest(codec=name):
+                dict_repr, _ = utils.get_raw_bindings(MockFunction([binding]), {})
+                self.assertEqual(
+                    json.loads(dict_repr[0]),
+                    {
+                        "direction": "IN",
+                        "type": "blob",
+                        "properties": {"SupportsDeferredBinding": False},
+                    },
+                )
@@ -2,7 +2,7 @@
 # Licensed under the MIT License.
 import unittest
 from typing import List, Mapping
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from azurefunctions.extensions.base import meta, sdkType
 
@@ -117,6 +117,31 @@ class TestMeta(unittest.TestCase):
         self.assertDictEqual(datum.python_value, {"name": "awesome", "value": "cool"})
         self.assertEqual(datum.python_type, dict)
 
+    def test_datum_python_value_decoded_once(self):
+        datum = meta.Datum(value='{"name": "awesome"}', type="json")
+        with patch.dict(meta._DECODERS, {"json": Mock(wraps=meta._DECODERS["json"])}):
+            decoder = meta._DECODERS["json"]
+            value = datum.python_value
+            self.assertIs(datum.python_value, value)
+            self.assertEqual(datum.python_type, dict)
+        decoder.assert_called_once_with('{"name": "awesome"}')
+
+    def test_datum_python_value_reset(self):
+        datum = meta.Datum(value="1", type="json")
+        self.assertEqual(datum.python_value, 1)
+        datum.value = "2"
+        self.assertEqual(datum.python_value, 2)
+        datum.type = "string"
+        self.assertEqual(datum.python_value, "2")
+        datum.type = None
+        self.assertIsNone(datum.python_value)
+
+    def test_datum_slots(self):
+        datum = meta.Datum(value=b"awesome bytes", type="bytes")
+        self.assertFalse(hasattr(datum, "__dict__"))
+        with self.assertRaises(AttributeError):
+            datum.other = 1
+
     def test_equals(self):
         str_datum = meta.Datum(value="awesome string", type="string")
         str_datum_copy = meta.Datum(value="awesome string", type="string")
@@ -151,9 +176,37 @@ class TestMeta(unittest.TestCase):
         self.assertFalse(registry.check_supported_type(None))
         self.assertFalse(registry.check_supported_type("hello"))
         self.assertTrue(registry.check_supported_type(sdkType.SdkType))
+        # Lists of SDK types need a converter supporting collections
+        self.assertFalse(registry.check_supported_type(List[sdkType.SdkType]))
+        self.assertFalse(registry.check_supported_type(List[str]))
+        self.assertFalse(registry.check_supported_type(list))
 
         self.assertFalse(registry.has_trigger_support(MockIndexedFunction))
 
+    @patch.object(meta._ConverterMeta, "_bindings", {})
+    @patch.object(meta._ConverterMeta, "_dispatch", {})
+    @patch.object(meta._ConverterMeta, "_decode_plans", {})
+    def test_collections_of_sdk_types(self):
+        registry = meta.get_binding_registry()
+
+        class MockConverter(meta.InConverter, binding="mock"):
+            pass
+
+        class MockCollectionConverter(meta.InConverter, binding="mockCollection"):
+            supports_collections = True
+
+        self.assertFalse(meta._BaseConverter.supports_collections)
+        self.assertTrue(registry.check_supported_type(sdkType.SdkType, "mock"))
+        self.assertFalse(registry.check_supported_type(List[sdkType.SdkType], "mock"))
+        self.assertFalse(
+            registry.check_supported_type(List[sdkType.SdkType], "missing")
+        )
+        self.assertTrue(
+            registry.check_supported_type(List[sdkType.SdkType], "mockCollection")
+        )
+        self.assertFalse(registry.check_supported_type(List[str], "mockCollection"))
+        self.assertFalse(registry.check_supported_type(List, "mockCollection"))
+
     def test_decode_typed_data(self):
         # Case 1: data is None
         self.assertIsNone(
@@ -290,3 +343,63 @@ class TestMeta(unittest.TestCase):
         self.assertEqual(
             registry._bindings.get("serviceBusTrigger"), BindingServiceBusConverter
         )
+
+    def test_get_dispatch(self):
+        class MockSdkType(sdkType.SdkType):
+            def get_sdk_type(self):
+                return None
+
+        with patch.object(meta._ConverterMeta, "_bindings", {}), patch.object(
+            meta._ConverterMeta, "_dispatch", {}
+        ):
+
+            class MockInConverter(
+                meta.InConverter, binding="blob", trigger="blobTrigger"
+            ):
+                checked = []
+
+                @classmethod
+                def check_input_type_annotation(cls, pytype):
+                    cls.checked.append(pytype)
+                    return pytype is MockSdkType
+
+                @classmethod
+                def decode(cls, data, *, trigger_metadata, pytype):
+                    return data, trigger_metadata, pytype
+
+                @classmethod
+                def has_implicit_output(cls):
+                    return False
+
+            registry = meta.get_binding_registry()
+            dispatch = registry.get_dispatch("blobTrigger", MockSdkType)
+            self.assertIs(dispatch.converter, MockInConverter)
+            self.assertEqual(
+                dispatch.decode("data", trigger_metadata={}), ("data", {}, MockSdkType)
+            )
+            self.assertIs(registry.get_dispatch("blobTrigger", MockSdkType), dispatch)
+            self.assertEqual(MockInConverter.checked, [MockSdkType])
+
+            # Types the converter doesn't support, and unknown bindings
+            self.assertIsNone(registry.get_dispatch("blobTrigger", bytes))
+            self.assertIsNone(registry.get_dispatch("blob", sdkType.SdkType))
+            self.assertIsNone(registry.get_dispatch("queue", MockSdkType))
+            self.assertIsNone(registry.get_dispatch("blob", sdkType.SdkType))
+            self.assertEqual(MockInConverter.checked, [MockSdkType, sdkType.SdkType])
+
+            # A new converter clears the cache
+            class MockQueueConverter(MockInConverter, binding="queue"):
+                pass
+
+            self.assertEqual(len(registry._dispatch), 0)
+            dispatch = registry.get_dispatch("queue", MockSdkType)
+            self.assertIs(dispatch.converter, MockQueueConverter)
+
+    def test_get_dispatch_unhashable_type(self):
+        class Unhashable:
+            __hash__ = None
+
+        with patch.object(meta._ConverterMeta, "_dispatch", {}):
+            registry = meta.get_binding_registry()
+            self.assertIsNone(registry.get_dispatch("blob", Unhashable()))
+            self.assertEqual(len(registry._dispatch), 0)
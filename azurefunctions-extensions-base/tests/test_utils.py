@@ -37,7 +37,7 @@ class TestUtils(unittest.TestCase):
     # Test Utils class
     def test_get_dict_repr_sdk(self):
         # Create mock blob
-        meta._ConverterMeta._bindings = {"blob"}
+        meta._ConverterMeta._bindings = {"blob": None}
 
         # Create test binding
         mock_blob = utils.Binding(
@@ -74,7 +74,7 @@ class TestUtils(unittest.TestCase):
 
     def test_get_dict_repr_non_sdk(self):
         # Create mock blob
-        meta._ConverterMeta._bindings = {"blob"}
+        meta._ConverterMeta._bindings = {"blob": None}
 
         # Create test binding
         mock_blob = utils.Binding(
@@ -108,7 +108,7 @@ class TestUtils(unittest.TestCase):
 
     def test_get_dict_repr_binding_name_none(self):
         # Create mock blob
-        meta._ConverterMeta._bindings = {"blob"}
+        meta._ConverterMeta._bindings = {"blob": None}
 
         # Create test binding
         mock_blob = utils.Binding(
@@ -149,7 +149,7 @@ class TestUtils(unittest.TestCase):
 
     def test_get_dict_repr_init_params(self):
         # Create mock blob
-        meta._ConverterMeta._bindings = {"blob"}
+        meta._ConverterMeta._bindings = {"blob": None}
 
         # Create test binding
         mock_blob = MockInitParams(
@@ -186,7 +186,7 @@ class TestUtils(unittest.TestCase):
 
     def test_get_dict_repr_clean_nones(self):
         # Create mock blob
-        meta._ConverterMeta._bindings = {"blob"}
+        meta._ConverterMeta._bindings = {"blob": None}
 
         # Create test binding
         mock_blob = MockInitParams(
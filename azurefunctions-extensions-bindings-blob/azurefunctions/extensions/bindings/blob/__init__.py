@@ -1,15 +1,59 @@
 #  Copyright (c) Microsoft Corporation. All rights reserved.
 #  Licensed under the MIT License.
 
+from .appendBlobTail import AppendBlobTail
+from .blobCache import BlobCache, CachedBlobFile
 from .blobClient import BlobClient
 from .blobClientConverter import BlobClientConverter
+from .blobRawIO import BlobRawIO
+from .blobTail import BlobTail
+from .blobWriter import BlobWriter
+from .blockWriter import BlockBlobWriter
+from .cachedBlob import CachedBlob
+from .checkpointStore import (
+    Checkpoint,
+    CheckpointStore,
+    FileCheckpointStore,
+    set_checkpoint_store,
+)
 from .containerClient import ContainerClient
+from .decompressedBlob import DecompressedBlob
+from .decompressingDownloader import DecompressingStreamDownloader
+from .lazyDownloader import LazyStorageStreamDownloader
+from .memoryMappedBlob import BlobMapping, MemoryMappedBlob
+from .parquetBlob import ParquetBlob
+from .parquetReader import ParquetBlobReader
+from .recordBlob import RecordBlob
+from .recordReader import RecordReader
+from .seekableBlob import SeekableBlob
 from .storageStreamDownloader import StorageStreamDownloader
 
 __all__ = [
     "BlobClient",
     "ContainerClient",
     "StorageStreamDownloader",
+    "LazyStorageStreamDownloader",
+    "MemoryMappedBlob",
+    "BlobMapping",
+    "CachedBlob",
+    "CachedBlobFile",
+    "BlobCache",
+    "SeekableBlob",
+    "BlobRawIO",
+    "ParquetBlob",
+    "ParquetBlobReader",
+    "AppendBlobTail",
+    "BlobTail",
+    "Checkpoint",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "set_checkpoint_store",
+    "DecompressedBlob",
+    "DecompressingStreamDownloader",
+    "RecordBlob",
+    "RecordReader",
+    "BlobWriter",
+    "BlockBlobWriter",
     "BlobClientConverter",
 ]
 
@@ -0,0 +1,19 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from .blobClient import BlobClient
+from .blobWriter import BlobWriter
+from .blockWriter import BlockBlobWriter, upload_stream
+from .containerClient import ContainerClient
+from .lazyDownloader import LazyStorageStreamDownloader
+from .storageStreamDownloader import StorageStreamDownloader
+
+__all__ = [
+    "BlobClient",
+    "BlobWriter",
+    "BlockBlobWriter",
+    "ContainerClient",
+    "StorageStreamDownloader",
+    "LazyStorageStreamDownloader",
+    "upload_stream",
+]
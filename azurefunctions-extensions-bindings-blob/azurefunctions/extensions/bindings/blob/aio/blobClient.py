@@ -0,0 +1,22 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from .. import blobClient
+from ..clientPool import get_async_blob_service_client
+
+
+class BlobClient(blobClient.BlobClient):
+    # Returns an azure.storage.blob.aio.BlobClient
+    def get_sdk_type(self):
+        if self._data:
+            blob_service_client = get_async_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            return blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+        else:
+            return None
@@ -0,0 +1,25 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from .. import blobWriter
+from ..clientPool import get_async_blob_service_client
+from .blockWriter import BlockBlobWriter
+
+
+class BlobWriter(blobWriter.BlobWriter):
+    # Returns an async BlockBlobWriter. It is not committed by the worker, so
+    # the function must await its commit() or use upload_stream().
+    def get_sdk_type(self):
+        if self._data:
+            blob_service_client = get_async_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            return BlockBlobWriter(blob_client, self._upload_options)
+        else:
+            return None
@@ -0,0 +1,225 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Optional, Set, Union
+
+from azure.storage.blob.aio import BlobClient
+
+from ..blockWriter import get_block_id
+from ..uploadOptions import MAX_BLOCK_COUNT, UploadOptions
+
+
+class BlockBlobWriter:
+    """
+    An async writable stream that uploads a block blob in blocks.
+
+    Written data is buffered until it fills a block, which is then staged
+    with stage_block() in a background task on the function's event loop.
+    At most options.max_concurrency blocks are staged at a time: when they
+    are all in flight, write() waits until one completes. Memory use is
+    bounded by block_size * (max_concurrency + 1), regardless of the size of
+    the blob.
+
+    commit() stages the last block, waits for every block and commits the
+    block list. Data smaller than one block is uploaded with a single
+    upload_blob() instead. Leaving an async with block commits the writer,
+    unless an exception is raised, in which case the upload is aborted.
+    """
+
+    def __init__(
+        self,
+        blob_client: BlobClient,
+        options: Optional[UploadOptions] = None,
+        **upload_kwargs: Any,
+    ) -> None:
+        self._blob_client = blob_client
+        self._options = options or UploadOptions()
+        self._upload_kwargs = upload_kwargs
+        self._buffer = bytearray()
+        self._block_ids: List[str] = []
+        # Created on first use, inside the function's event loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._error: Optional[BaseException] = None
+        self._size = 0
+        self._result: Optional[Dict[str, Any]] = None
+        self._closed = False
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._blob_client
+
+    @property
+    def name(self) -> str:
+        return self._blob_client.blob_name
+
+    @property
+    def container(self) -> str:
+        return self._blob_client.container_name
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes written so far.
+        """
+        return self._size
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def committed(self) -> bool:
+        return self._result is not None
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        The properties of the committed blob, e.g. etag and last_modified.
+        """
+        return self._result
+
+    async def write(self, data: Any) -> int:
+        if self._closed:
+            raise ValueError("I/O operation on closed blob writer.")
+        await self._raise_error()
+        view = memoryview(data)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        size = len(view)
+        block_size = self._options.block_size
+        position = 0
+        while position < size:
+            end = position + min(block_size - len(self._buffer), size - position)
+            self._buffer += view[position:end]
+            position = end
+            if len(self._buffer) == block_size:
+                await self._stage(self._buffer)
+                self._buffer = bytearray()
+        self._size += size
+        return size
+
+    async def _stage(self, block: bytearray) -> None:
+        if len(self._block_ids) >= MAX_BLOCK_COUNT:
+            raise ValueError(
+                f"A block blob cannot have more than {MAX_BLOCK_COUNT} blocks. "
+                f"Use a larger block size."
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._options.max_concurrency)
+        # Backpressure: wait until a block in flight is staged
+        await self._slots.acquire()
+        try:
+            await self._raise_error()
+        except BaseException:
+            self._slots.release()
+            raise
+        block_id = get_block_id(len(self._block_ids))
+        self._block_ids.append(block_id)
+        task = asyncio.get_running_loop().create_task(
+            self._blob_client.stage_block(block_id, block, len(block))
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._block_staged)
+
+    def _block_staged(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            error = task.exception()
+            if error is not None and self._error is None:
+                self._error = error
+        self._slots.release()
+
+    async def _raise_error(self) -> None:
+        # A block that failed to stage can't be committed, so the upload is
+        # aborted
+        if self._error is not None:
+            await self.abort()
+            raise self._error
+
+    async def commit(self) -> Dict[str, Any]:
+        """
+        Uploads the buffered data and commits the blob. Returns the
+        properties of the committed blob.
+        """
+        if self._result is not None:
+            return self._result
+        if self._closed:
+            raise ValueError("The blob writer was aborted.")
+        try:
+            if not self._block_ids:
+                self._result = await self._blob_client.upload_blob(
+                    bytes(self._buffer), overwrite=True, **self._upload_kwargs
+                )
+            else:
+                if self._buffer:
+                    await self._stage(self._buffer)
+                if self._tasks:
+                    await asyncio.wait(set(self._tasks))
+                await self._raise_error()
+                self._result = await self._blob_client.commit_block_list(
+                    self._block_ids, **self._upload_kwargs
+                )
+        except BaseException:
+            await self.abort()
+            raise
+        self._buffer = bytearray()
+        self._closed = True
+        return self._result
+
+    async def abort(self) -> None:
+        """
+        Stops the upload without committing it. The blob keeps its previous
+        content, and the staged blocks are discarded by the service.
+        """
+        self._closed = True
+        self._buffer = bytearray()
+        tasks = set(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def close(self) -> None:
+        if not self._closed:
+            await self.commit()
+
+    async def __aenter__(self) -> "BlockBlobWriter":
+        return self
+
+    async def __aexit__(self, exc_type, *args) -> None:
+        if exc_type is not None:
+            await self.abort()
+        else:
+            await self.close()
+
+
+async def upload_stream(
+    chunks: AsyncIterable[bytes],
+    target: Union[BlobClient, BlockBlobWriter],
+    options: Optional[UploadOptions] = None,
+    **upload_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Uploads the chunks of an async iterable, e.g. the body of a FastAPI
+    request from Request.stream(), to a block blob and returns the properties
+    of the committed blob.
+
+    Blocks are staged concurrently as the chunks arrive. The next chunk is
+    only read once the previous one is buffered, so when storage is slower
+    than the client, the request body is not read any faster than blocks are
+    staged. Memory use is bounded by block_size * (max_concurrency + 1).
+
+    The target is an async BlobClient, or a BlockBlobWriter which is
+    committed at the end. The blob is left unchanged if reading the chunks
+    or uploading them fails.
+    """
+    if isinstance(target, BlockBlobWriter):
+        writer = target
+    else:
+        writer = BlockBlobWriter(target, options, **upload_kwargs)
+    async with writer:
+        async for chunk in chunks:
+            await writer.write(chunk)
+    return writer.result
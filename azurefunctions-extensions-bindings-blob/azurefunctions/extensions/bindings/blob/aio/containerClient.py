@@ -0,0 +1,21 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from .. import containerClient
+from ..clientPool import get_async_blob_service_client
+
+
+class ContainerClient(containerClient.ContainerClient):
+    # Returns an azure.storage.blob.aio.ContainerClient
+    def get_sdk_type(self):
+        if self._data:
+            blob_service_client = get_async_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            return blob_service_client.get_container_client(
+                container=self._containerName
+            )
+        else:
+            return None
@@ -0,0 +1,139 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+from typing import IO, Any, AsyncIterator, Optional, Union
+
+from azure.storage.blob import BlobProperties
+from azure.storage.blob.aio import BlobClient
+from azure.storage.blob.aio import StorageStreamDownloader as SdkStorageStreamDownloader
+
+from ..lazyDownloader import BufferWriter
+from ..readAhead import AsyncReadAheadIterator
+
+
+class LazyStorageStreamDownloader:
+    """
+    A proxy for an azure.storage.blob.aio.StorageStreamDownloader that
+    defers download_blob() until the content or properties are first
+    accessed.
+
+    The download starts on the first call to read(), readall(), readinto(),
+    chunks() or get_properties(), and runs on the function's event loop.
+    To download only part of the blob, or to tune the download, await
+    download() with the same arguments as BlobClient.download_blob() before
+    reading.
+
+    When read_ahead is set, chunks() prefetches that many chunks in a
+    background task while the function processes the current one.
+    """
+
+    def __init__(
+        self, blob_client: BlobClient, *, read_ahead: int = 0, **download_options: Any
+    ) -> None:
+        self._blob_client = blob_client
+        self._read_ahead = read_ahead
+        self._download_options = download_options
+        self._downloader: Optional[SdkStorageStreamDownloader] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._blob_client
+
+    @property
+    def started(self) -> bool:
+        return self._downloader is not None
+
+    @property
+    def name(self) -> str:
+        return self._blob_client.blob_name
+
+    @property
+    def container(self) -> str:
+        return self._blob_client.container_name
+
+    def _get_lock(self) -> asyncio.Lock:
+        # The lock is created on first use, inside the function's event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def download(
+        self,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        **kwargs: Any,
+    ) -> SdkStorageStreamDownloader:
+        """
+        Starts the download and returns the underlying
+        StorageStreamDownloader. The arguments are passed to
+        BlobClient.download_blob(), e.g. offset, length and max_concurrency.
+
+        This can only be called before the download has started.
+        """
+        async with self._get_lock():
+            if self._downloader is not None:
+                raise ValueError(
+                    "The blob download has already started. Call download() "
+                    "before reading the blob or accessing its properties."
+                )
+            options = dict(self._download_options, **kwargs)
+            self._downloader = await self._blob_client.download_blob(
+                offset=offset, length=length, **options
+            )
+            return self._downloader
+
+    async def _get_downloader(self) -> SdkStorageStreamDownloader:
+        if self._downloader is None:
+            async with self._get_lock():
+                if self._downloader is None:
+                    self._downloader = await self._blob_client.download_blob(
+                        **self._download_options
+                    )
+        return self._downloader
+
+    async def get_properties(self) -> BlobProperties:
+        return (await self._get_downloader()).properties
+
+    async def get_size(self) -> int:
+        return (await self._get_downloader()).size
+
+    async def read(self, size: int = -1, *, chars: Optional[int] = None) -> Any:
+        return await (await self._get_downloader()).read(size, chars=chars)
+
+    async def readall(self) -> Any:
+        return await (await self._get_downloader()).readall()
+
+    async def readinto(self, target: Union[IO[bytes], Any]) -> int:
+        """
+        Downloads the blob into a writable stream or a writable buffer and
+        returns the number of bytes written. A buffer is filled in place and
+        must be large enough for the whole blob.
+        """
+        downloader = await self._get_downloader()
+        if hasattr(target, "write"):
+            return await downloader.readinto(target)
+        writer = BufferWriter(target)
+        writer.check_size(downloader.size)
+        return await downloader.readinto(writer)
+
+    def chunks(self, *, read_ahead: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Iterates over the chunks of the blob.
+
+        With a read_ahead depth of N, a background task downloads up to N
+        chunks ahead of the function. The returned AsyncReadAheadIterator
+        exposes its queue depth and stall times through stats. Defaults to
+        the read-ahead depth of the binding; 0 disables it.
+        """
+        if read_ahead is None:
+            read_ahead = self._read_ahead
+        if not read_ahead:
+            return self._chunks()
+        return AsyncReadAheadIterator(self._chunks(), read_ahead)
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        downloader = await self._get_downloader()
+        async for chunk in downloader.chunks():
+            yield chunk
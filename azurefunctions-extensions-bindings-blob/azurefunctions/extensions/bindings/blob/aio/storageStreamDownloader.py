@@ -0,0 +1,34 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from .. import storageStreamDownloader
+from ..clientPool import get_async_blob_service_client
+from .lazyDownloader import LazyStorageStreamDownloader
+
+
+class StorageStreamDownloader(storageStreamDownloader.StorageStreamDownloader):
+    def get_sdk_type(self):
+        """
+        Returns an async LazyStorageStreamDownloader.
+
+        The download is not started while decoding. It starts when the
+        function first awaits the content or properties, so the first request
+        runs on the function's event loop instead of blocking it.
+        """
+        if self._data:
+            blob_service_client = get_async_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            return LazyStorageStreamDownloader(
+                self._download_options.configure_client(blob_client),
+                read_ahead=self._download_options.read_ahead or 0,
+                **self._download_options.get_download_kwargs(),
+            )
+        else:
+            return None
@@ -0,0 +1,59 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .blobTail import read_tail
+from .checkpointStore import get_checkpoint_store
+from .clientPool import get_blob_service_client
+
+
+class AppendBlobTail(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+
+    def get_sdk_type(self):
+        """
+        Returns a BlobTail with the bytes appended to the blob since the
+        checkpoint committed by the last invocation.
+
+        Checkpoints are kept by the store returned by get_checkpoint_store(),
+        by default in files under PYTHON_BLOB_TAIL_CHECKPOINT_DIRECTORY. When
+        the checkpoint doesn't match the blob, the whole blob is returned and
+        BlobTail.reset is True.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            return read_tail(blob_client, get_checkpoint_store())
+        else:
+            return None
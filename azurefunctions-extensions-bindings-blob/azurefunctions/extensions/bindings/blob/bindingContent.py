@@ -0,0 +1,184 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Hashable, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .credentials import CLIENT_ID_SUFFIX, RESOURCE_ID_SUFFIX, ManagedIdentity
+from .utils import get_connection_string, using_managed_identity
+
+DEFAULT_CACHE_MAX_SIZE = 256
+
+# Suffixes of the App Settings a connection name can resolve to, in the
+# order get_connection_string looks them up
+_CONNECTION_SUFFIXES = ("", "__serviceUri", "__blobServiceUri")
+
+
+class BindingContent(NamedTuple):
+    """
+    The parsed content of a blob model_binding_data, with its connection
+    resolved. content is a read-only view of the whole JSON object.
+    managed_identity is the identity of a Managed Identity connection, and
+    None for other connections.
+    """
+
+    content: Mapping[str, Any]
+    connection: str
+    using_managed_identity: bool
+    container_name: Optional[str]
+    blob_name: Optional[str]
+    managed_identity: Optional[ManagedIdentity] = None
+
+
+class _Connection(NamedTuple):
+    connection: str
+    using_managed_identity: bool
+    managed_identity: Optional[ManagedIdentity]
+    # The App Setting the connection was read from, its value, and the number
+    # of App Settings when it was read
+    setting: str
+    value: str
+    environ_size: int
+    # The App Settings selecting the identity of a Managed Identity
+    # connection, with their values
+    identity_settings: Tuple[Tuple[str, Optional[str]], ...] = ()
+
+    def is_current(self) -> bool:
+        # A missing App Setting costs far more to look up than an existing
+        # one, so settings added elsewhere are detected through the size
+        return (
+            len(os.environ) == self.environ_size
+            and os.environ.get(self.setting) == self.value
+            and all(
+                os.environ.get(setting) == value
+                for setting, value in self.identity_settings
+            )
+        )
+
+
+class BindingContentCache:
+    """
+    A bounded cache of parsed model_binding_data content.
+
+    The host sends the same content on every invocation of a function, so
+    the JSON is parsed once per distinct content. Connections are resolved
+    once per connection name. A resolved connection is used as long as the
+    App Setting it was read from keeps its value and no App Setting is added
+    or removed, e.g. when the worker is specialized. Otherwise it's resolved
+    again.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("The binding content cache size must be at least 1.")
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # content -> (binding content, connection it was resolved with)
+        self._contents: "OrderedDict[Hashable, Tuple[BindingContent, _Connection]]" = (
+            OrderedDict()
+        )
+        # connection name -> resolved connection
+        self._connections: "OrderedDict[str, _Connection]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._contents.clear()
+            self._connections.clear()
+
+    def get(self, content: Union[str, bytes]) -> BindingContent:
+        entry = self._contents.get(content)
+        if entry is not None:
+            binding, connection = entry
+            if connection.is_current():
+                self._touch(self._contents, content)
+                return binding
+            parsed = binding.content
+        else:
+            parsed = MappingProxyType(json.loads(content))
+
+        connection = self._get_connection(parsed.get("Connection"))
+        binding = BindingContent(
+            content=parsed,
+            connection=connection.connection,
+            using_managed_identity=connection.using_managed_identity,
+            container_name=parsed.get("ContainerName"),
+            blob_name=parsed.get("BlobName"),
+            managed_identity=connection.managed_identity,
+        )
+        self._put(self._contents, content, (binding, connection))
+        return binding
+
+    def _get_connection(self, connection_name: Optional[str]) -> _Connection:
+        if connection_name is not None:
+            connection = self._connections.get(connection_name)
+            if connection is not None and connection.is_current():
+                self._touch(self._connections, connection_name)
+                return connection
+
+        environ_size = len(os.environ)
+        # Raises the usual errors for a missing or undefined connection
+        value = get_connection_string(connection_name)
+        setting = next(
+            connection_name + suffix
+            for suffix in _CONNECTION_SUFFIXES
+            if connection_name + suffix in os.environ
+        )
+        managed = using_managed_identity(connection_name)
+        identity_settings = (
+            tuple(
+                (connection_name + suffix, os.environ.get(connection_name + suffix))
+                for suffix in (CLIENT_ID_SUFFIX, RESOURCE_ID_SUFFIX)
+            )
+            if managed
+            else ()
+        )
+        connection = _Connection(
+            connection=value,
+            using_managed_identity=managed,
+            managed_identity=(
+                ManagedIdentity.from_connection(connection_name) if managed else None
+            ),
+            setting=setting,
+            value=value,
+            environ_size=environ_size,
+            identity_settings=identity_settings,
+        )
+        self._put(self._connections, connection_name, connection)
+        return connection
+
+    @staticmethod
+    def _touch(entries: OrderedDict, key: Hashable) -> None:
+        try:
+            entries.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread in the meantime
+            pass
+
+    def _put(self, entries: OrderedDict, key: Hashable, value: Any) -> None:
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self._max_size:
+                entries.popitem(last=False)
+
+
+_cache = BindingContentCache()
+
+
+def get_binding_content(content: Union[str, bytes]) -> BindingContent:
+    """
+    Returns the parsed content of a model_binding_data, using the
+    process-wide cache.
+    """
+    return _cache.get(content)
+
+
+def clear_binding_content_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,340 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import IO, Any, Dict, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError
+from azure.storage.blob import BlobClient
+
+from .utils import get_app_setting_int
+
+# App Settings used to configure the process-wide blob cache
+CACHE_DIRECTORY_SETTING = "PYTHON_BLOB_CACHE_DIRECTORY"
+CACHE_MAX_SIZE_SETTING = "PYTHON_BLOB_CACHE_MAX_SIZE"
+
+DEFAULT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+_DATA_SUFFIX = ".blob"
+_METADATA_SUFFIX = ".json"
+_TEMP_PREFIX = ".tmp-"
+
+
+class CachedBlobFile:
+    """
+    A read-only file with the content of a blob, served by a BlobCache.
+
+    from_cache tells whether the content was served from the local copy
+    after a conditional request, or downloaded by this invocation.
+    """
+
+    def __init__(
+        self,
+        file: IO[bytes],
+        *,
+        name: str,
+        container: str,
+        etag: Optional[str],
+        size: int,
+        from_cache: bool,
+    ) -> None:
+        self._file = file
+        self.name = name
+        self.container = container
+        self.etag = etag
+        self.size = size
+        self.from_cache = from_cache
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readall(self) -> bytes:
+        self._file.seek(0)
+        return self._file.read()
+
+    def readinto(self, buffer: Any) -> int:
+        return self._file.readinto(buffer)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "CachedBlobFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class _Entry:
+    def __init__(self, digest: str, etag: str, size: int) -> None:
+        self.digest = digest
+        self.etag = etag
+        self.size = size
+
+
+class BlobCache:
+    """
+    A size-bounded LRU cache of blobs on the local disk.
+
+    Entries are keyed by account, container and blob name, and are stored
+    with the ETag of the blob. A cached blob is revalidated on every read
+    with a conditional GET (If-None-Match). When the blob has not changed the
+    service answers 304 Not Modified without a body, and the content is
+    served from disk. Otherwise the response already carries the new content,
+    which replaces the cached copy.
+
+    Files are written to a temporary name and renamed into place, so readers
+    never see a partial blob. When the cache grows past max_size bytes, the
+    least recently used entries are removed. Blobs larger than max_size are
+    served without being cached. The index is rebuilt from the directory when
+    the worker restarts.
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError(f"max_size must be a positive integer, got {max_size}.")
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.directory, digest + suffix)
+
+    def _load(self) -> None:
+        entries = []
+        names = os.listdir(self.directory)
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.startswith(_TEMP_PREFIX):
+                # Left behind by a worker that stopped during a download
+                _remove(path)
+                continue
+            if not name.endswith(_METADATA_SUFFIX):
+                continue
+            digest = name[: -len(_METADATA_SUFFIX)]
+            try:
+                with open(path) as file:
+                    metadata = json.load(file)
+                data_stat = os.stat(self._path(digest, _DATA_SUFFIX))
+                if data_stat.st_size != metadata["size"]:
+                    raise ValueError("Incomplete cache entry")
+            except (OSError, ValueError, KeyError):
+                self._remove_files(digest)
+                continue
+            entry = _Entry(digest, metadata["etag"], metadata["size"])
+            entries.append((os.stat(path).st_mtime, entry))
+        for _, entry in sorted(entries, key=lambda item: item[0]):
+            self._entries[entry.digest] = entry
+            self._size += entry.size
+        for name in names:
+            if (
+                name.endswith(_DATA_SUFFIX)
+                and name[: -len(_DATA_SUFFIX)] not in self._entries
+            ):
+                _remove(os.path.join(self.directory, name))
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size in bytes of the cached blobs.
+        """
+        return self._size
+
+    @staticmethod
+    def get_key(blob_client: BlobClient) -> Tuple[str, str, str]:
+        account = f"{blob_client.scheme}://{blob_client.primary_hostname}"
+        if blob_client.account_name:
+            account = f"{account}/{blob_client.account_name}"
+        return account, blob_client.container_name, blob_client.blob_name
+
+    def open(self, blob_client: BlobClient, **download_kwargs: Any) -> CachedBlobFile:
+        """
+        Returns the content of the blob, from the cache when its ETag still
+        matches, and downloads it into the cache otherwise. The keyword
+        arguments are passed to blob_client.download_blob().
+        """
+        digest = hashlib.sha256(
+            "\n".join(self.get_key(blob_client)).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+
+        if entry is not None:
+            # The file is opened before revalidating, so a concurrent eviction
+            # cannot remove the content that the 304 refers to
+            try:
+                file = open(self._path(digest, _DATA_SUFFIX), "rb")
+            except OSError:
+                file = None
+            if file is not None:
+                try:
+                    downloader = blob_client.download_blob(
+                        etag=entry.etag,
+                        match_condition=MatchConditions.IfModified,
+                        **download_kwargs,
+                    )
+                except HttpResponseError as e:
+                    if e.status_code != 304:
+                        file.close()
+                        raise
+                    with self._lock:
+                        self.hits += 1
+                    return CachedBlobFile(
+                        file,
+                        name=blob_client.blob_name,
+                        container=blob_client.container_name,
+                        etag=entry.etag,
+                        size=entry.size,
+                        from_cache=True,
+                    )
+                except BaseException:
+                    file.close()
+                    raise
+                file.close()
+                with self._lock:
+                    self.misses += 1
+                return self._store(digest, blob_client, downloader)
+
+        with self._lock:
+            self.misses += 1
+        downloader = blob_client.download_blob(**download_kwargs)
+        return self._store(digest, blob_client, downloader)
+
+    def _store(
+        self, digest: str, blob_client: BlobClient, downloader
+    ) -> CachedBlobFile:
+        fd, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.directory)
+        file = os.fdopen(fd, "w+b")
+        try:
+            downloader.readinto(file)
+            file.flush()
+            file.seek(0)
+            size = downloader.size
+            etag = downloader.properties.etag
+            if size <= self.max_size and etag:
+                # The open file keeps this content even if another invocation
+                # replaces the entry right after
+                os.replace(temp_path, self._path(digest, _DATA_SUFFIX))
+                self._write_metadata(digest, {"etag": etag, "size": size})
+                self._add(_Entry(digest, etag, size))
+            else:
+                _remove(temp_path)
+        except BaseException:
+            file.close()
+            _remove(temp_path)
+            raise
+        return CachedBlobFile(
+            file,
+            name=blob_client.blob_name,
+            container=blob_client.container_name,
+            etag=etag,
+            size=size,
+            from_cache=False,
+        )
+
+    def _write_metadata(self, digest: str, metadata: Dict[str, Any]) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(metadata, file)
+            os.replace(temp_path, self._path(digest, _METADATA_SUFFIX))
+        except BaseException:
+            _remove(temp_path)
+            raise
+
+    def _add(self, entry: _Entry) -> None:
+        with self._lock:
+            previous = self._entries.pop(entry.digest, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[entry.digest] = entry
+            self._size += entry.size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_size and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.size
+            self._remove_files(entry.digest)
+
+    def _remove_files(self, digest: str) -> None:
+        _remove(self._path(digest, _METADATA_SUFFIX))
+        _remove(self._path(digest, _DATA_SUFFIX))
+
+    def clear(self) -> None:
+        """
+        Removes every cached blob.
+        """
+        with self._lock:
+            for digest in self._entries:
+                self._remove_files(digest)
+            self._entries.clear()
+            self._size = 0
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        # Missing, or still open by a reader on Windows. A leftover file is
+        # removed the next time the cache is loaded.
+        pass
+
+
+_cache: Optional[BlobCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_blob_cache() -> BlobCache:
+    """
+    Returns the process-wide blob cache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BlobCache(
+                    os.getenv(CACHE_DIRECTORY_SETTING)
+                    or os.path.join(
+                        tempfile.gettempdir(), "azure-functions-blob-cache"
+                    ),
+                    # 0 selects the default size, and a negative size raises
+                    # an error naming the App Setting
+                    max_size=get_app_setting_int(CACHE_MAX_SIZE_SETTING, 0)
+                    or DEFAULT_CACHE_MAX_SIZE,
+                )
+    return _cache
@@ -1,12 +1,23 @@
 #  Copyright (c) Microsoft Corporation. All rights reserved.
 #  Licensed under the MIT License.
 
-from typing import Any
+import inspect
+from typing import Any, get_origin
 
 from azurefunctions.extensions.base import Datum, InConverter, OutConverter
 
+from . import aio
+from .appendBlobTail import AppendBlobTail
 from .blobClient import BlobClient
+from .blobWriter import BlobWriter
+from .cachedBlob import CachedBlob
+from .collection import get_item_type, get_model_binding_data, prefetch
 from .containerClient import ContainerClient
+from .decompressedBlob import DecompressedBlob
+from .memoryMappedBlob import MemoryMappedBlob
+from .parquetBlob import ParquetBlob
+from .recordBlob import RecordBlob
+from .seekableBlob import SeekableBlob
 from .storageStreamDownloader import StorageStreamDownloader
 
 
@@ -16,33 +27,105 @@ class BlobClientConverter(
     binding="blob",
     trigger="blobTrigger",
 ):
+    # A list of SDK types is bound to a batch of blobs
+    supports_collections = True
+
     @classmethod
     def check_input_type_annotation(cls, pytype: type) -> bool:
+        # A list of SDK types is bound to a batch of blobs
+        item_type = get_item_type(pytype)
+        if item_type is not None:
+            pytype = item_type
+        if get_origin(pytype) is not None or not inspect.isclass(pytype):
+            return False
+        # The async variants in the aio package subclass these types
         return issubclass(
-            pytype, (BlobClient, ContainerClient, StorageStreamDownloader)
+            pytype,
+            (
+                BlobClient,
+                ContainerClient,
+                StorageStreamDownloader,
+                MemoryMappedBlob,
+                CachedBlob,
+                SeekableBlob,
+                ParquetBlob,
+                AppendBlobTail,
+                DecompressedBlob,
+                RecordBlob,
+                BlobWriter,
+            ),
         )
 
+    @classmethod
+    def check_output_type_annotation(cls, pytype: type) -> bool:
+        # The host sends no model binding data for outputs. A BlobWriter is
+        # bound through an input binding on the target path, and the function
+        # commits it by closing it
+        return False
+
     @classmethod
     def decode(cls, data: Datum, *, trigger_metadata, pytype) -> Any:
         if data is None or data.type is None:
             return None
 
         data_type = data.type
+        item_type = get_item_type(pytype)
 
         if data_type == "model_binding_data":
-            data = data.value
+            if item_type is not None:
+                return [cls._decode_model_binding_data(data.value, item_type)]
+            return cls._decode_model_binding_data(data.value, pytype)
+        elif data_type == "collection_model_binding_data":
+            if item_type is None:
+                raise ValueError(
+                    f'a batch of blobs for the "blob" binding must be bound '
+                    f"to a list, e.g. list[BlobClient], not {pytype!r}"
+                )
+            # The items share the pooled service client of their connection
+            items = [
+                cls._decode_model_binding_data(item, item_type)
+                for item in get_model_binding_data(data.value)
+            ]
+            prefetch(items)
+            return items
         else:
             raise ValueError(
                 f'unexpected type of data received for the "blob" binding '
                 f": {data_type!r}"
             )
 
+    @classmethod
+    def _decode_model_binding_data(cls, data: Any, pytype: type) -> Any:
         # Determines which sdk type to return based on pytype
-        if pytype == BlobClient:
+        if pytype == aio.BlobClient:
+            return aio.BlobClient(data=data).get_sdk_type()
+        elif pytype == aio.ContainerClient:
+            return aio.ContainerClient(data=data).get_sdk_type()
+        elif pytype == aio.StorageStreamDownloader:
+            return aio.StorageStreamDownloader(data=data).get_sdk_type()
+        elif pytype == aio.BlobWriter:
+            return aio.BlobWriter(data=data).get_sdk_type()
+        elif pytype == BlobClient:
             return BlobClient(data=data).get_sdk_type()
         elif pytype == ContainerClient:
             return ContainerClient(data=data).get_sdk_type()
         elif pytype == StorageStreamDownloader:
             return StorageStreamDownloader(data=data).get_sdk_type()
+        elif pytype == MemoryMappedBlob:
+            return MemoryMappedBlob(data=data).get_sdk_type()
+        elif pytype == CachedBlob:
+            return CachedBlob(data=data).get_sdk_type()
+        elif pytype == SeekableBlob:
+            return SeekableBlob(data=data).get_sdk_type()
+        elif pytype == ParquetBlob:
+            return ParquetBlob(data=data).get_sdk_type()
+        elif pytype == AppendBlobTail:
+            return AppendBlobTail(data=data).get_sdk_type()
+        elif pytype == DecompressedBlob:
+            return DecompressedBlob(data=data).get_sdk_type()
+        elif pytype == RecordBlob:
+            return RecordBlob(data=data).get_sdk_type()
+        elif pytype == BlobWriter:
+            return BlobWriter(data=data).get_sdk_type()
         else:
             return None
@@ -0,0 +1,241 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.storage.blob import BlobClient, BlobProperties
+
+from .seekableOptions import SeekableOptions
+
+
+class BlobRawIO(io.RawIOBase):
+    """
+    A read-only, seekable file over a blob, backed by ranged GETs.
+
+    Libraries that seek in a file, such as zipfile, pyarrow or h5py, only
+    download the parts of the blob they read. Reads are aligned to blocks of
+    options.block_size bytes, which are kept in an LRU cache of
+    options.cache_size bytes. The blocks missing for a read are downloaded
+    with one GET per run of adjacent blocks, so a read never costs more than
+    one request per gap in the cache.
+
+    The blob properties are fetched on first use. Every later GET is
+    conditional on the ETag of the properties, so a blob that changes while
+    it is read raises an error instead of returning mixed content.
+    """
+
+    def __init__(
+        self,
+        blob_client: BlobClient,
+        options: Optional[SeekableOptions] = None,
+        *,
+        properties: Optional[BlobProperties] = None,
+    ) -> None:
+        super().__init__()
+        self._blob_client = blob_client
+        self._options = options or SeekableOptions()
+        self._properties = properties
+        self._position = 0
+        # block index -> content, ordered from least to most recently used
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.requests = 0
+        self.bytes_downloaded = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._blob_client
+
+    @property
+    def name(self) -> str:
+        return self._blob_client.blob_name
+
+    @property
+    def container(self) -> str:
+        return self._blob_client.container_name
+
+    @property
+    def properties(self) -> BlobProperties:
+        if self._properties is None:
+            with self._lock:
+                if self._properties is None:
+                    self._properties = self._blob_client.get_blob_properties()
+                    self.requests += 1
+        return self._properties
+
+    @property
+    def size(self) -> int:
+        return self.properties.size
+
+    @property
+    def block_size(self) -> int:
+        return self._options.block_size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._check_closed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_closed()
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence ({whence})")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer: Any) -> int:
+        self._check_closed()
+        view = memoryview(buffer).cast("B")
+        size = self.read_at(self._position, view)
+        self._position += size
+        return size
+
+    def readall(self) -> bytes:
+        self._check_closed()
+        remaining = max(self.size - self._position, 0)
+        buffer = bytearray(remaining)
+        self.readinto(buffer)
+        return bytes(buffer)
+
+    def read_at(self, offset: int, buffer: Any) -> int:
+        """
+        Reads into buffer from the given offset of the blob, without moving
+        the position of the file. Returns the number of bytes read, which is
+        less than the size of the buffer at the end of the blob.
+        """
+        view = memoryview(buffer).cast("B")
+        end = min(offset + len(view), self.size)
+        if end <= offset:
+            return 0
+        block_size = self._options.block_size
+        first, last = offset // block_size, (end - 1) // block_size
+        with self._lock:
+            blocks = self._get_blocks(first, last)
+        position = 0
+        for index in range(first, last + 1):
+            block = blocks[index]
+            start = max(offset - index * block_size, 0)
+            stop = min(end - index * block_size, len(block))
+            view[position : position + stop - start] = memoryview(block)[start:stop]
+            position += stop - start
+        return position
+
+    def prefetch(
+        self, ranges: Iterable[Tuple[int, int]], max_concurrency: int = 1
+    ) -> None:
+        """
+        Downloads the blocks of the given (offset, length) ranges into the
+        cache, so that reading them later sends no request.
+
+        The missing blocks are downloaded with one GET per run of adjacent
+        blocks, and up to max_concurrency GETs are sent in parallel. Ranges
+        that don't fit in the cache after the first ones are left to be
+        downloaded when they are read.
+        """
+        self._check_closed()
+        block_size = self._options.block_size
+        size = self.size
+        indexes = set()
+        for offset, length in ranges:
+            end = min(offset + length, size)
+            if end > offset:
+                indexes.update(range(offset // block_size, (end - 1) // block_size + 1))
+        with self._lock:
+            missing = sorted(index for index in indexes if index not in self._blocks)
+        missing = missing[: self._options.cache_blocks]
+        runs = _runs(missing)
+        if len(runs) <= 1 or max_concurrency <= 1:
+            results = [self._fetch(first, last) for first, last in runs]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(runs)),
+                thread_name_prefix="blob-raw-io-prefetch",
+            ) as executor:
+                results = list(executor.map(lambda run: self._fetch(*run), runs))
+        with self._lock:
+            for blocks in results:
+                self._store(blocks)
+
+    def _get_blocks(self, first: int, last: int) -> Dict[int, bytes]:
+        blocks: Dict[int, bytes] = {}
+        missing: List[int] = []
+        for index in range(first, last + 1):
+            block = self._blocks.get(index)
+            if block is None:
+                missing.append(index)
+                self.misses += 1
+            else:
+                self._blocks.move_to_end(index)
+                blocks[index] = block
+                self.hits += 1
+        for run_first, run_last in _runs(missing):
+            fetched = self._fetch(run_first, run_last)
+            self._store(fetched)
+            blocks.update(fetched)
+        return blocks
+
+    def _fetch(self, first: int, last: int) -> Dict[int, bytes]:
+        # One GET for a run of adjacent blocks
+        block_size = self._options.block_size
+        offset = first * block_size
+        length = min((last + 1) * block_size, self.size) - offset
+        content = self._blob_client.download_blob(
+            offset=offset,
+            length=length,
+            etag=self.properties.etag,
+            match_condition=MatchConditions.IfNotModified,
+        ).readall()
+        with self._lock:
+            self.requests += 1
+            self.bytes_downloaded += len(content)
+        return {
+            index: content[
+                (index - first) * block_size : (index - first + 1) * block_size
+            ]
+            for index in range(first, last + 1)
+        }
+
+    def _store(self, blocks: Dict[int, bytes]) -> None:
+        # A run larger than the cache only keeps its last blocks
+        for index in list(blocks)[-self._options.cache_blocks :]:
+            self._blocks[index] = blocks[index]
+            self._blocks.move_to_end(index)
+        while len(self._blocks) > self._options.cache_blocks:
+            self._blocks.popitem(last=False)
+
+    def _check_closed(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed blob file.")
+
+    def close(self) -> None:
+        self._blocks.clear()
+        super().close()
+
+
+def _runs(indexes: List[int]) -> List[Tuple[int, int]]:
+    # Groups sorted block indexes into (first, last) runs of adjacent blocks
+    runs: List[Tuple[int, int]] = []
+    for index in indexes:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
@@ -0,0 +1,207 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import hashlib
+from typing import Optional
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError
+from azure.storage.blob import BlobClient, BlobProperties, BlobType
+
+from .blobCache import BlobCache
+from .checkpointStore import Checkpoint, CheckpointStore
+
+# Number of bytes before the checkpoint that are downloaded again with the
+# tail, to check that the blob was not overwritten since the checkpoint
+FINGERPRINT_SIZE = 1024
+# Number of attempts when the blob changes between the properties request
+# and the download
+_MAX_ATTEMPTS = 3
+
+
+class BlobTail:
+    """
+    The bytes appended to a blob since its last checkpoint.
+
+    content holds the bytes from offset start to end of the blob. When
+    reset is True, the checkpoint didn't match the blob, e.g. because it was
+    deleted and created again, and content is the whole blob.
+
+    The checkpoint is not moved until commit() is called, so an invocation
+    that fails leaves the tail to the next one. Used as a context manager,
+    the tail is committed when the block exits without an error.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        key: str,
+        *,
+        name: str,
+        container: str,
+        properties: BlobProperties,
+        start: int,
+        buffer: bytes,
+        buffer_start: int,
+        checkpoint: Optional[Checkpoint],
+        reset: bool,
+    ) -> None:
+        self._store = store
+        self._key = key
+        self._properties = properties
+        # The downloaded bytes, which start before the tail so that the
+        # fingerprint of any committed offset can be computed
+        self._buffer = buffer
+        self._buffer_start = buffer_start
+        self._checkpoint = checkpoint
+        self.name = name
+        self.container = container
+        self.start = start
+        self.end = buffer_start + len(buffer)
+        self.reset = reset
+        self.committed = False
+
+    @property
+    def content(self) -> bytes:
+        return self._buffer[self.start - self._buffer_start :]
+
+    @property
+    def etag(self) -> str:
+        return self._properties.etag
+
+    def read(self) -> bytes:
+        return self.content
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def commit(self, offset: Optional[int] = None) -> None:
+        """
+        Moves the checkpoint of the blob to offset, by default the end of the
+        tail. An offset inside the tail, such as the end of the last complete
+        record, leaves the rest of the tail to the next invocation.
+        """
+        if offset is None:
+            offset = self.end
+        if not self.start <= offset <= self.end:
+            raise ValueError(
+                f"offset must be between {self.start} and {self.end}, got {offset}."
+            )
+        self._store.set(
+            self._key,
+            Checkpoint(
+                offset,
+                etag=self.etag if offset == self._properties.size else None,
+                creation_time=_get_creation_time(self._properties),
+                fingerprint=self._fingerprint(offset),
+            ),
+        )
+        self.committed = True
+
+    def _fingerprint(self, offset: int) -> str:
+        if self._checkpoint is not None and offset == self._checkpoint.offset:
+            # The bytes before the checkpoint may not have been downloaded
+            return self._checkpoint.fingerprint
+        start = max(offset - FINGERPRINT_SIZE, 0) - self._buffer_start
+        return _hash(self._buffer[start : offset - self._buffer_start])
+
+    def __enter__(self) -> "BlobTail":
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is None and not self.committed:
+            self.commit()
+
+
+def read_tail(blob_client: BlobClient, store: CheckpointStore) -> BlobTail:
+    """
+    Returns the bytes appended to the blob since its checkpoint in store.
+
+    One request reads the properties of the blob. When its ETag is the one of
+    the checkpoint, nothing was appended and nothing is downloaded. Otherwise
+    one ranged GET downloads the tail of an append blob, together with the
+    bytes just before the checkpoint, whose fingerprint must match the one of
+    the checkpoint. Appended blocks can't be modified, so a match means the
+    blob is the one that was checkpointed. When the lineage is broken, e.g.
+    the blob was deleted, overwritten, or is not an append blob, the whole
+    blob is downloaded instead.
+    """
+    key = "/".join(BlobCache.get_key(blob_client))
+    for attempt in range(_MAX_ATTEMPTS):
+        properties = blob_client.get_blob_properties()
+        checkpoint = store.get(key)
+        try:
+            return _read_tail(blob_client, store, key, properties, checkpoint)
+        except ResourceModifiedError:
+            # Appended to after the properties were read
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+
+
+def _read_tail(
+    blob_client: BlobClient,
+    store: CheckpointStore,
+    key: str,
+    properties: BlobProperties,
+    checkpoint: Optional[Checkpoint],
+) -> BlobTail:
+    size = properties.size
+    start = 0
+    buffer: Optional[bytes] = None
+    buffer_start = 0
+    if (
+        checkpoint is not None
+        and properties.blob_type == BlobType.APPENDBLOB
+        and checkpoint.creation_time == _get_creation_time(properties)
+        and checkpoint.offset <= size
+    ):
+        if checkpoint.etag == properties.etag and checkpoint.offset == size:
+            # Nothing was appended
+            start = buffer_start = size
+            buffer = b""
+        else:
+            buffer_start = max(checkpoint.offset - FINGERPRINT_SIZE, 0)
+            buffer = _download(blob_client, properties, buffer_start)
+            fingerprint = _hash(buffer[: checkpoint.offset - buffer_start])
+            if fingerprint == checkpoint.fingerprint:
+                start = checkpoint.offset
+            elif buffer_start > 0:
+                buffer = None
+    if buffer is None:
+        # The whole blob
+        buffer_start = 0
+        buffer = _download(blob_client, properties, 0)
+    return BlobTail(
+        store,
+        key,
+        name=blob_client.blob_name,
+        container=blob_client.container_name,
+        properties=properties,
+        start=start,
+        buffer=buffer,
+        buffer_start=buffer_start,
+        checkpoint=checkpoint if start > 0 else None,
+        reset=checkpoint is not None and start != checkpoint.offset,
+    )
+
+
+def _download(
+    blob_client: BlobClient, properties: BlobProperties, offset: int
+) -> bytes:
+    if offset >= properties.size:
+        return b""
+    return blob_client.download_blob(
+        offset=offset,
+        length=properties.size - offset,
+        etag=properties.etag,
+        match_condition=MatchConditions.IfNotModified,
+    ).readall()
+
+
+def _get_creation_time(properties: BlobProperties) -> Optional[str]:
+    creation_time = properties.creation_time
+    return creation_time.isoformat() if creation_time else None
+
+
+def _hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,226 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from azure.storage.blob import BlobClient
+
+from .uploadOptions import MAX_BLOCK_COUNT, UploadOptions
+
+_logger = logging.getLogger(__name__)
+
+
+def get_block_id(index: int) -> str:
+    # Block IDs of a blob must all have the same length. The SDK encodes them
+    # in base64.
+    return f"{index:08d}"
+
+
+class BlockBlobWriter(io.RawIOBase):
+    """
+    A writable stream that uploads a block blob in blocks.
+
+    Written data is buffered until it fills a block, which is then staged
+    with stage_block() on a background thread while the function keeps
+    writing. At most options.max_concurrency blocks are staged at a time:
+    when they are all in flight, write() blocks until one completes. Memory
+    use is bounded by block_size * (max_concurrency + 1), regardless of the
+    size of the blob.
+
+    commit() stages the last block, waits for every block and commits the
+    block list, which makes the new content visible. Data smaller than one
+    block is uploaded with a single upload_blob() instead. Closing the writer
+    commits it, unless it is used as a context manager and an exception is
+    raised, in which case the staged blocks are discarded by abort().
+
+    The writer must be closed, committed or used in a with block: nothing
+    commits it after the function returns. A writer garbage collected
+    without being closed is aborted, and a warning is logged.
+    """
+
+    def __init__(
+        self,
+        blob_client: BlobClient,
+        options: Optional[UploadOptions] = None,
+        **upload_kwargs: Any,
+    ) -> None:
+        super().__init__()
+        self._blob_client = blob_client
+        self._options = options or UploadOptions()
+        self._upload_kwargs = upload_kwargs
+        self._buffer = bytearray()
+        self._block_ids: List[str] = []
+        self._slots = threading.BoundedSemaphore(self._options.max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._error: Optional[BaseException] = None
+        self._size = 0
+        self._result: Optional[Dict[str, Any]] = None
+        self._aborted = False
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._blob_client
+
+    @property
+    def name(self) -> str:
+        return self._blob_client.blob_name
+
+    @property
+    def container(self) -> str:
+        return self._blob_client.container_name
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes written so far.
+        """
+        return self._size
+
+    @property
+    def committed(self) -> bool:
+        return self._result is not None
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        The properties of the committed blob, e.g. etag and last_modified.
+        """
+        return self._result
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed blob writer.")
+        self._raise_error()
+        view = memoryview(data)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        size = len(view)
+        block_size = self._options.block_size
+        position = 0
+        while position < size:
+            end = position + min(block_size - len(self._buffer), size - position)
+            self._buffer += view[position:end]
+            position = end
+            if len(self._buffer) == block_size:
+                self._stage(self._buffer)
+                self._buffer = bytearray()
+        self._size += size
+        return size
+
+    def _stage(self, block: bytearray) -> None:
+        if len(self._block_ids) >= MAX_BLOCK_COUNT:
+            raise ValueError(
+                f"A block blob cannot have more than {MAX_BLOCK_COUNT} blocks. "
+                f"Use a larger block size."
+            )
+        # Backpressure: wait until a block in flight is staged
+        self._slots.acquire()
+        try:
+            self._raise_error()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._options.max_concurrency,
+                    thread_name_prefix="blob-block-writer",
+                )
+            block_id = get_block_id(len(self._block_ids))
+            future = self._executor.submit(
+                self._blob_client.stage_block, block_id, block, len(block)
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        self._block_ids.append(block_id)
+        future.add_done_callback(self._block_staged)
+
+    def _block_staged(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None and self._error is None:
+            self._error = error
+        self._slots.release()
+
+    def _raise_error(self) -> None:
+        # A block that failed to stage can't be committed, so the upload is
+        # aborted
+        if self._error is not None:
+            self.abort()
+            raise self._error
+
+    def _wait(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def commit(self) -> Dict[str, Any]:
+        """
+        Uploads the buffered data and commits the blob. Returns the
+        properties of the committed blob.
+        """
+        if self._result is not None:
+            return self._result
+        if self._aborted:
+            raise ValueError("The blob writer was aborted.")
+        try:
+            if not self._block_ids:
+                self._result = self._blob_client.upload_blob(
+                    bytes(self._buffer), overwrite=True, **self._upload_kwargs
+                )
+            else:
+                if self._buffer:
+                    self._stage(self._buffer)
+                self._wait()
+                self._raise_error()
+                self._result = self._blob_client.commit_block_list(
+                    self._block_ids, **self._upload_kwargs
+                )
+        except BaseException:
+            self.abort()
+            raise
+        self._buffer = bytearray()
+        super().close()
+        return self._result
+
+    def abort(self) -> None:
+        """
+        Stops the upload without committing it. The blob keeps its previous
+        content, and the staged blocks are discarded by the service.
+        """
+        self._abort(wait=True)
+
+    def _abort(self, wait: bool) -> None:
+        self._aborted = True
+        self._buffer = bytearray()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+        super().close()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.commit()
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def __del__(self) -> None:
+        # Never commit partial data from the garbage collector
+        if not self.closed:
+            _logger.warning(
+                "The writer of blob %s was not closed, so %d bytes written to "
+                "it were discarded. Call close() or use it in a with block to "
+                "commit the blob.",
+                self._blob_client.blob_name,
+                self._size,
+            )
+            # The writer may be collected on a thread of its executor, which
+            # can't wait for itself
+            self._abort(wait=False)
@@ -0,0 +1,65 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .blobCache import get_blob_cache
+from .clientPool import get_blob_service_client
+from .downloadOptions import DownloadOptions
+
+
+class CachedBlob(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        self._download_options = DownloadOptions()
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._download_options = DownloadOptions.from_binding(binding.content)
+
+    def get_sdk_type(self):
+        """
+        Returns a CachedBlobFile with the content of the blob.
+
+        The blob is kept in the worker's local blob cache. When it is already
+        cached, only a conditional request is sent to check that its ETag
+        still matches, and the content is read from disk. The cache is
+        configured by the PYTHON_BLOB_CACHE_DIRECTORY and
+        PYTHON_BLOB_CACHE_MAX_SIZE App Settings.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = self._download_options.configure_client(
+                blob_service_client.get_blob_client(
+                    container=self._containerName,
+                    blob=self._blobName,
+                )
+            )
+            return get_blob_cache().open(
+                blob_client, **self._download_options.get_download_kwargs()
+            )
+        else:
+            return None
@@ -0,0 +1,161 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import abc
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+# App Setting used to configure the default checkpoint store
+CHECKPOINT_DIRECTORY_SETTING = "PYTHON_BLOB_TAIL_CHECKPOINT_DIRECTORY"
+
+_SUFFIX = ".json"
+_TEMP_PREFIX = ".tmp-"
+
+
+class Checkpoint:
+    """
+    The position up to which a blob was processed.
+
+    offset is the number of bytes processed. etag is the ETag of the blob
+    when its size was offset, or None when more was already appended.
+    creation_time identifies the blob, which changes when it is deleted and
+    created again, and fingerprint is the SHA-256 of the bytes just before
+    offset, which changes when the blob is overwritten.
+    """
+
+    def __init__(
+        self,
+        offset: int,
+        *,
+        etag: Optional[str] = None,
+        creation_time: Optional[str] = None,
+        fingerprint: str = "",
+    ) -> None:
+        if offset < 0:
+            raise ValueError(f"offset must be a non-negative integer, got {offset}.")
+        self.offset = offset
+        self.etag = etag
+        self.creation_time = creation_time
+        self.fingerprint = fingerprint
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, value: Dict[str, Any]) -> "Checkpoint":
+        return cls(
+            value["offset"],
+            etag=value.get("etag"),
+            creation_time=value.get("creation_time"),
+            fingerprint=value.get("fingerprint", ""),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Checkpoint):
+            return False
+        return vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"Checkpoint(offset={self.offset}, etag={self.etag!r}, "
+            f"creation_time={self.creation_time!r})"
+        )
+
+
+class CheckpointStore(abc.ABC):
+    """
+    Stores the checkpoints of the blobs read by AppendBlobTail, by key.
+
+    The default store keeps them in files on the local disk, which are only
+    seen by the instance that wrote them. A function app that scales out
+    can pass a store backed by a shared service to set_checkpoint_store().
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Checkpoint]:
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: str, checkpoint: Checkpoint) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    A CheckpointStore keeping one JSON file per blob in a directory.
+
+    Files are written to a temporary name and renamed into place, so a
+    worker that stops while writing leaves the previous checkpoint.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Checkpoint]:
+        try:
+            with open(self._path(key)) as file:
+                return Checkpoint.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or unreadable, the blob is read from the start
+            return None
+
+    def set(self, key: str, checkpoint: Checkpoint) -> None:
+        fd, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=self.directory)
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(checkpoint.to_dict(), file)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """
+    Returns the checkpoint store used by AppendBlobTail, creating a
+    FileCheckpointStore on first use when none was set.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FileCheckpointStore(
+                    os.getenv(CHECKPOINT_DIRECTORY_SETTING)
+                    or os.path.join(
+                        tempfile.gettempdir(), "azure-functions-blob-checkpoints"
+                    )
+                )
+    return _store
+
+
+def set_checkpoint_store(store: Optional[CheckpointStore]) -> None:
+    """
+    Replaces the checkpoint store used by AppendBlobTail. None restores the
+    default store on next use.
+    """
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,270 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import atexit
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+from .credentials import (
+    AsyncCachedTokenCredential,
+    ManagedIdentity,
+    close_credentials,
+    get_managed_identity_credential,
+)
+from .transport import close_transports, get_async_transport, get_transport
+from .utils import get_app_setting_int
+
+# App Settings used to tune the process-wide client pool
+POOL_MAX_SIZE_SETTING = "PYTHON_BLOB_CLIENT_POOL_MAX_SIZE"
+POOL_IDLE_TIMEOUT_SETTING = "PYTHON_BLOB_CLIENT_POOL_IDLE_TIMEOUT"
+
+DEFAULT_POOL_MAX_SIZE = 32
+DEFAULT_POOL_IDLE_TIMEOUT = 300
+
+
+class BlobServiceClientPool:
+    """
+    A thread-safe pool of service clients keyed by the resolved connection,
+    whether Managed Identity is being used, and which identity.
+
+    Creating a BlobServiceClient builds a new HTTP pipeline and connection
+    pool, so every invocation that creates its own client pays for new
+    sockets and TLS handshakes. Clients in this pool are shared by every
+    SDK type created for the same connection.
+
+    The pool holds at most max_size clients. When it is full, the least
+    recently used client is dropped. Clients that have not been used for
+    idle_timeout seconds are dropped as well. Dropped clients are not closed:
+    SDK objects handed to a function may still be using their transport, so
+    the connections are released once the last reference goes away.
+    Every client still in the pool is closed by close().
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_POOL_MAX_SIZE,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("The client pool size must be at least 1.")
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (client, last used timestamp), ordered from least to most
+        # recently used
+        self._clients: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def get(
+        self,
+        connection: str,
+        using_managed_identity: bool,
+        *,
+        managed_identity: Optional[ManagedIdentity] = None,
+        factory: Optional[Callable[[], Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Returns the pooled client for the connection, creating it if needed.
+
+        The factory is used to create the client when it is not pooled yet.
+        By default, a BlobServiceClient is created the same way the SDK types
+        would create it. Callers that pool other client types must provide a
+        key that distinguishes them.
+        """
+        if key is None:
+            key = (connection, using_managed_identity, managed_identity)
+        if factory is None:
+
+            def factory():
+                return create_blob_service_client(
+                    connection,
+                    using_managed_identity,
+                    managed_identity=managed_identity,
+                )
+
+        now = self._clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                client = entry[0]
+                self._clients.move_to_end(key)
+            else:
+                client = factory()
+                while len(self._clients) >= self._max_size:
+                    self._clients.popitem(last=False)
+            self._clients[key] = (client, now)
+            return client
+
+    def _evict_idle(self, now: float) -> None:
+        # The oldest entry is always first, so stop at the first one in use
+        while self._clients:
+            key, (_, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self._idle_timeout:
+                break
+            del self._clients[key]
+
+    def close(self) -> None:
+        """
+        Closes every pooled client and empties the pool.
+        """
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            try:
+                _close_client(client)
+            except Exception:  # pragma: no cover
+                # The worker is shutting down, nothing else can be done
+                pass
+
+
+def _close_client(client: Any) -> None:
+    # Async clients return a coroutine from close(). It's scheduled on the
+    # running event loop, or run to completion when there is none.
+    result = client.close()
+    if inspect.isawaitable(result):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(result)
+        else:
+            loop.create_task(result)
+
+
+def create_blob_service_client(
+    connection: str,
+    using_managed_identity: bool,
+    client_type: type = BlobServiceClient,
+    *,
+    managed_identity: Optional[ManagedIdentity] = None,
+):
+    """
+    When using Managed Identity, the only way to create a BlobServiceClient is
+    through the constructor. Otherwise, it's created through
+    from_connection_string. The same applies to the async BlobServiceClient.
+
+    Clients for a Managed Identity connection share the process-wide
+    credential of their identity and account, so tokens are reused across
+    clients. managed_identity selects a user-assigned identity. Every
+    client shares the HTTP transport configured by the App Settings, so
+    connections are pooled across clients as well.
+    """
+    is_async = issubclass(client_type, AsyncBlobServiceClient)
+    transport = get_async_transport() if is_async else get_transport()
+    if not using_managed_identity:
+        return client_type.from_connection_string(connection, transport=transport)
+    credential = get_managed_identity_credential(connection, managed_identity)
+    if credential is not None and is_async:
+        credential = AsyncCachedTokenCredential(credential)
+    return client_type(
+        account_url=connection, credential=credential, transport=transport
+    )
+
+
+_pool: Optional[BlobServiceClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> BlobServiceClientPool:
+    """
+    Returns the process-wide client pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # 0 selects the default size, and a negative size raises an
+                # error naming the App Setting
+                _pool = BlobServiceClientPool(
+                    max_size=get_app_setting_int(POOL_MAX_SIZE_SETTING, 0)
+                    or DEFAULT_POOL_MAX_SIZE,
+                    idle_timeout=get_app_setting_int(
+                        POOL_IDLE_TIMEOUT_SETTING, DEFAULT_POOL_IDLE_TIMEOUT
+                    ),
+                )
+    return _pool
+
+
+def get_blob_service_client(
+    connection: str,
+    using_managed_identity: bool,
+    *,
+    managed_identity: Optional[ManagedIdentity] = None,
+) -> BlobServiceClient:
+    """
+    Returns the shared BlobServiceClient for the connection.
+    """
+    return get_client_pool().get(
+        connection, using_managed_identity, managed_identity=managed_identity
+    )
+
+
+def get_async_blob_service_client(
+    connection: str,
+    using_managed_identity: bool,
+    *,
+    managed_identity: Optional[ManagedIdentity] = None,
+) -> AsyncBlobServiceClient:
+    """
+    Returns the shared async BlobServiceClient for the connection.
+
+    The transport of an async client is bound to the event loop it is first
+    used on, so async clients are shared per event loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    def factory():
+        return create_blob_service_client(
+            connection,
+            using_managed_identity,
+            AsyncBlobServiceClient,
+            managed_identity=managed_identity,
+        )
+
+    return get_client_pool().get(
+        connection,
+        using_managed_identity,
+        factory=factory,
+        key=(
+            connection,
+            using_managed_identity,
+            managed_identity,
+            AsyncBlobServiceClient,
+            loop,
+        ),
+    )
+
+
+def close_client_pool() -> None:
+    """
+    Closes every client in the process-wide pool. This is called when the
+    worker shuts down.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+    close_credentials()
+    close_transports()
+
+
+atexit.register(close_client_pool)
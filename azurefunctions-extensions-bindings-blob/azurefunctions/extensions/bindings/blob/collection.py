@@ -0,0 +1,69 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, get_args, get_origin
+
+from .lazyDownloader import LazyStorageStreamDownloader
+from .utils import get_app_setting_int
+
+# App Setting for the number of blobs of a list[StorageStreamDownloader]
+# binding downloaded concurrently while decoding it. 0 disables the prefetch.
+PREFETCH_CONCURRENCY_SETTING = "PYTHON_BLOB_BATCH_PREFETCH_CONCURRENCY"
+
+_logger = logging.getLogger(__name__)
+
+
+def get_item_type(pytype: Any) -> Optional[type]:
+    """
+    Returns X for a list[X] or List[X] annotation, or None for any other
+    annotation.
+    """
+    if get_origin(pytype) is not list:
+        return None
+    args = get_args(pytype)
+    return args[0] if len(args) == 1 else None
+
+
+def get_model_binding_data(value: Any) -> Sequence[Any]:
+    """
+    Returns the items of a collection_model_binding_data.
+    """
+    if value is None:
+        return []
+    return list(getattr(value, "model_binding_data", value))
+
+
+def prefetch(items: List[Any], max_concurrency: Optional[int] = None) -> None:
+    """
+    Starts the downloads of the LazyStorageStreamDownloaders in items, at
+    most max_concurrency at a time, and waits for their first ranged GET.
+
+    A download that fails is left unstarted: the error is raised again when
+    the function reads that blob, so one missing blob doesn't fail the whole
+    batch.
+    """
+    if max_concurrency is None:
+        max_concurrency = get_app_setting_int(PREFETCH_CONCURRENCY_SETTING, 0)
+    downloaders = [
+        item for item in items if isinstance(item, LazyStorageStreamDownloader)
+    ]
+    if not max_concurrency or not downloaders:
+        return
+
+    def start(downloader: LazyStorageStreamDownloader) -> None:
+        try:
+            downloader.start()
+        except Exception as e:
+            _logger.debug("Prefetch of blob %s failed: %s", downloader.name, e)
+
+    if max_concurrency == 1 or len(downloaders) == 1:
+        for downloader in downloaders:
+            start(downloader)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_concurrency, len(downloaders)),
+        thread_name_prefix="blob-batch-prefetch",
+    ) as executor:
+        list(executor.map(start, downloaders))
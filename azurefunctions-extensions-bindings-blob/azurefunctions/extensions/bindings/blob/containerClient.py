@@ -1,12 +1,12 @@
 #  Copyright (c) Microsoft Corporation. All rights reserved.
 #  Licensed under the MIT License.
 
-import json
 from typing import Union
 
-from azure.storage.blob import BlobServiceClient
 from azurefunctions.extensions.base import Datum, SdkType
-from .utils import get_connection_string, using_managed_identity
+
+from .bindingContent import get_binding_content
+from .clientPool import get_blob_service_client
 
 
 class ContainerClient(SdkType):
@@ -14,6 +14,7 @@ class ContainerClient(SdkType):
         # model_binding_data properties
         self._data = data
         self._using_managed_identity = False
+        self._managed_identity = None
         self._version = ""
         self._source = ""
         self._content_type = ""
@@ -24,21 +25,20 @@ class ContainerClient(SdkType):
             self._version = data.version
             self._source = data.source
             self._content_type = data.content_type
-            content_json = json.loads(data.content)
-            self._connection = get_connection_string(content_json.get("Connection"))
-            self._using_managed_identity = using_managed_identity(
-                content_json.get("Connection")
-            )
-            self._containerName = content_json.get("ContainerName")
-            self._blobName = content_json.get("BlobName")
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
 
     # Returns a ContainerClient
     def get_sdk_type(self):
         if self._data:
-            blob_service_client = (
-                BlobServiceClient(account_url=self._connection)
-                if self._using_managed_identity
-                else BlobServiceClient.from_connection_string(self._connection)
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
             )
             return blob_service_client.get_container_client(
                 container=self._containerName
@@ -0,0 +1,264 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from azure.core.credentials import AccessToken, TokenCredential
+
+_logger = logging.getLogger(__name__)
+
+# Tokens are refreshed this many seconds before they expire, like the SDK's
+# BearerTokenCredentialPolicy does
+DEFAULT_REFRESH_MARGIN = 300
+# Minimum delay in seconds between two attempts to refresh a token that is
+# still valid, so a failing endpoint is not hammered by every invocation
+DEFAULT_RETRY_DELAY = 30
+
+
+# Suffixes of the App Settings selecting the user-assigned identity of a
+# Managed Identity connection
+CLIENT_ID_SUFFIX = "__clientId"
+RESOURCE_ID_SUFFIX = "__managedIdentityResourceId"
+
+
+class ManagedIdentity(NamedTuple):
+    """
+    The identity a Managed Identity connection authenticates as.
+
+    client_id or resource_id select a user-assigned identity. They are read
+    from the <CONNECTION>__clientId and <CONNECTION>__managedIdentityResourceId
+    App Settings of identity-based connections. When neither is set, the
+    system-assigned identity is used.
+    """
+
+    client_id: Optional[str] = None
+    resource_id: Optional[str] = None
+
+    @classmethod
+    def from_connection(cls, connection_name: str) -> "ManagedIdentity":
+        return cls(
+            client_id=os.getenv(connection_name + CLIENT_ID_SUFFIX) or None,
+            resource_id=os.getenv(connection_name + RESOURCE_ID_SUFFIX) or None,
+        )
+
+
+class _CachedToken:
+    def __init__(self) -> None:
+        self.token: Optional[AccessToken] = None
+        self.next_attempt = 0.0
+        self.lock = threading.Lock()
+
+
+class CachedTokenCredential:
+    """
+    A TokenCredential that caches the tokens of another credential and
+    refreshes them before they expire.
+
+    Every client created for a Managed Identity connection gets its own
+    BearerTokenCredentialPolicy, which requests a new token from the
+    credential. Sharing one CachedTokenCredential between clients means a
+    token is acquired once per identity and scope, instead of once per
+    client.
+
+    A token is refreshed once it is within refresh_margin seconds of its
+    expiry. Only one thread refreshes a token at a time: the others keep
+    using the current token while it is valid. If a refresh fails while the
+    current token is still valid, the current token is returned and the
+    refresh is retried after retry_delay seconds.
+    """
+
+    def __init__(
+        self,
+        credential: TokenCredential,
+        *,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._credential = credential
+        self._refresh_margin = refresh_margin
+        self._retry_delay = retry_delay
+        self._clock = clock
+        self._tokens: Dict[Hashable, _CachedToken] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.refreshes = 0
+        self.failures = 0
+
+    @property
+    def credential(self) -> TokenCredential:
+        return self._credential
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of get_token() calls served from the cache.
+        """
+        total = self.hits + self.refreshes
+        return self.hits / total if total else 0.0
+
+    def _get_cached(self, key: Hashable) -> _CachedToken:
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is None:
+                cached = self._tokens[key] = _CachedToken()
+            return cached
+
+    def get_cached_token(self, *scopes: str, **kwargs: Any) -> Optional[AccessToken]:
+        """
+        Returns the cached token if it does not need to be refreshed yet,
+        without calling the underlying credential.
+        """
+        if kwargs.get("claims"):
+            return None
+        token = self._get_cached(_get_key(scopes, kwargs)).token
+        if token is not None and not self._should_refresh(token):
+            self.hits += 1
+            return token
+        return None
+
+    def _should_refresh(self, token: AccessToken) -> bool:
+        return token.expires_on - self._clock() <= self._refresh_margin
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        if kwargs.get("claims"):
+            # A claims challenge always needs a new token
+            self.refreshes += 1
+            return self._credential.get_token(*scopes, **kwargs)
+
+        cached = self._get_cached(_get_key(scopes, kwargs))
+        token = cached.token
+        if token is not None and not self._should_refresh(token):
+            self.hits += 1
+            return token
+
+        now = self._clock()
+        valid = token is not None and token.expires_on > now
+        if valid and (now < cached.next_attempt or not cached.lock.acquire(False)):
+            # Another thread is refreshing it, or the last attempt failed
+            self.hits += 1
+            return token
+        if not valid:
+            cached.lock.acquire()
+        try:
+            if cached.token is not token and not self._should_refresh(cached.token):
+                # Refreshed by another thread while waiting for the lock
+                self.hits += 1
+                return cached.token
+            self.refreshes += 1
+            try:
+                cached.token = self._credential.get_token(*scopes, **kwargs)
+            except Exception:
+                self.failures += 1
+                if not valid:
+                    raise
+                cached.next_attempt = now + self._retry_delay
+                _logger.warning(
+                    "Failed to refresh the Managed Identity token. The current "
+                    "token is used until it expires.",
+                    exc_info=True,
+                )
+                return token
+            return cached.token
+        finally:
+            cached.lock.release()
+
+    def close(self) -> None:
+        close = getattr(self._credential, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncCachedTokenCredential:
+    """
+    An async TokenCredential served by a CachedTokenCredential.
+
+    Tokens cached by the CachedTokenCredential are returned without leaving
+    the event loop. Refreshes call the synchronous credential in the default
+    executor, so the tokens are shared with the synchronous clients.
+    """
+
+    def __init__(self, cached_credential: CachedTokenCredential) -> None:
+        self._cached_credential = cached_credential
+
+    async def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        token = self._cached_credential.get_cached_token(*scopes, **kwargs)
+        if token is not None:
+            return token
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self._cached_credential.get_token(*scopes, **kwargs)
+        )
+
+    async def close(self) -> None:
+        # The credential is shared with other clients, so it stays open
+        pass
+
+
+def _get_key(scopes: Tuple[str, ...], kwargs: Dict[str, Any]) -> Hashable:
+    return tuple(sorted(scopes)), kwargs.get("tenant_id")
+
+
+def _create_managed_identity_credential(
+    identity: ManagedIdentity,
+) -> Optional[TokenCredential]:
+    try:
+        from azure.identity import ManagedIdentityCredential
+    except ImportError:
+        return None
+    if identity.client_id:
+        return ManagedIdentityCredential(client_id=identity.client_id)
+    if identity.resource_id:
+        # The parameter of the App Service identity endpoint the Functions
+        # host runs on
+        return ManagedIdentityCredential(
+            identity_config={"mi_res_id": identity.resource_id}
+        )
+    return ManagedIdentityCredential()
+
+
+_credentials: Dict[Tuple[ManagedIdentity, str], Optional[CachedTokenCredential]] = {}
+_credentials_lock = threading.Lock()
+
+
+def get_managed_identity_credential(
+    account_url: str, identity: Optional[ManagedIdentity] = None
+) -> Optional[CachedTokenCredential]:
+    """
+    Returns the process-wide credential of the identity for the storage
+    account, shared by every client created for them. Without an identity,
+    the system-assigned identity is used.
+
+    The tokens are acquired with the ManagedIdentityCredential of
+    azure-identity, which is an optional dependency. None is returned when
+    it's not installed, and the clients are created without a credential.
+    """
+    identity = identity or ManagedIdentity()
+    key = (identity, urlparse(account_url).netloc.lower() or account_url)
+    with _credentials_lock:
+        if key not in _credentials:
+            credential = _create_managed_identity_credential(identity)
+            _credentials[key] = (
+                CachedTokenCredential(credential) if credential is not None else None
+            )
+        return _credentials[key]
+
+
+def close_credentials() -> None:
+    """
+    Closes every process-wide credential.
+    """
+    with _credentials_lock:
+        credentials = [c for c in _credentials.values() if c is not None]
+        _credentials.clear()
+    for credential in credentials:
+        try:
+            credential.close()
+        except Exception:  # pragma: no cover
+            pass
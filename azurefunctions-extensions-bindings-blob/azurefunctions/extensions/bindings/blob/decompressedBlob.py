@@ -0,0 +1,78 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .clientPool import get_blob_service_client
+from .decompressingDownloader import DEFAULT_READ_AHEAD, DecompressingStreamDownloader
+from .decompression import DecompressionOptions
+from .downloadOptions import DownloadOptions
+from .lazyDownloader import LazyStorageStreamDownloader
+
+
+class DecompressedBlob(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        self._download_options = DownloadOptions()
+        self._decompression_options = DecompressionOptions()
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._download_options = DownloadOptions.from_binding(binding.content)
+            self._decompression_options = DecompressionOptions.from_binding(
+                binding.content
+            )
+
+    def get_sdk_type(self):
+        """
+        Returns a DecompressingStreamDownloader, which decompresses the blob
+        while it is downloaded.
+
+        Nothing is downloaded while decoding the binding. The codec is the
+        binding's Compression property, or else is picked from the
+        Content-Encoding or the extension of the blob. The binding's
+        DownloadOptions configure the ranged GETs, and its read-ahead depth,
+        0 by default, the number of chunks downloaded and decompressed ahead
+        of the function.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            downloader = LazyStorageStreamDownloader(
+                self._download_options.configure_client(blob_client),
+                decompress=False,
+                **self._download_options.get_download_kwargs(),
+            )
+            return DecompressingStreamDownloader(
+                downloader,
+                self._decompression_options,
+                read_ahead=self._download_options.read_ahead or DEFAULT_READ_AHEAD,
+            )
+        else:
+            return None
@@ -0,0 +1,174 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+from typing import Any, Iterator, List, Optional
+
+from azure.storage.blob import BlobClient, BlobProperties
+
+from .decompression import DecompressionOptions, decompress, detect_codec
+from .lazyDownloader import LazyStorageStreamDownloader
+from .readAhead import ReadAheadIterator
+
+# Chunks are downloaded and decompressed on the function's thread unless the
+# binding asks for a read-ahead depth
+DEFAULT_READ_AHEAD = 0
+
+
+class _ByteCounter:
+    def __init__(self) -> None:
+        self.bytes = 0
+
+
+def _count(chunks: Iterator[bytes], counter: _ByteCounter) -> Iterator[bytes]:
+    # Counts the bytes of the chunks without referencing the stream, so that
+    # a stream dropped by the function is collected and closed
+    for chunk in chunks:
+        counter.bytes += len(chunk)
+        yield chunk
+
+
+class DecompressingStreamDownloader(io.RawIOBase):
+    """
+    A read-only stream of the decompressed content of a blob, decompressed
+    while it is downloaded.
+
+    The codec is the one of the options, or else is picked from the
+    Content-Encoding of the blob, or else from the extension of its name.
+    The blob is downloaded with decompress=False, so that a blob stored with
+    Content-Encoding: gzip is not decoded range by range by the transport.
+
+    With a read_ahead depth of N, two background threads form a pipeline:
+    one downloads up to N compressed chunks ahead, the other decompresses up
+    to N chunks ahead, so that the network, decompression and the function's
+    processing overlap. Memory stays bounded by N compressed chunks and N
+    decompressed chunks of at most options.chunk_size bytes. Close the
+    stream, or use it as a context manager, when the function doesn't read
+    it to the end; a stream that is dropped is closed when it is collected.
+
+    The content can be read once, either as chunks() or with read().
+    """
+
+    def __init__(
+        self,
+        downloader: LazyStorageStreamDownloader,
+        options: Optional[DecompressionOptions] = None,
+        *,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+    ) -> None:
+        super().__init__()
+        self._downloader = downloader
+        self._options = options or DecompressionOptions()
+        self._read_ahead = read_ahead
+        self._codec = self._options.codec
+        self._iterators: List[Any] = []
+        self._chunks: Optional[Iterator[bytes]] = None
+        self._pending = memoryview(b"")
+        self._compressed = _ByteCounter()
+        self._decompressed = _ByteCounter()
+
+    @property
+    def compressed_bytes(self) -> int:
+        return self._compressed.bytes
+
+    @property
+    def decompressed_bytes(self) -> int:
+        return self._decompressed.bytes
+
+    @property
+    def downloader(self) -> LazyStorageStreamDownloader:
+        return self._downloader
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._downloader.blob_client
+
+    @property
+    def name(self) -> str:
+        return self._downloader.name
+
+    @property
+    def container(self) -> str:
+        return self._downloader.container
+
+    @property
+    def properties(self) -> BlobProperties:
+        return self._downloader.properties
+
+    @property
+    def codec(self) -> str:
+        """
+        The codec the blob is decompressed with. Reading it starts the
+        download when the codec is picked from the Content-Encoding.
+        """
+        if self._codec is None:
+            self._codec = detect_codec(
+                self.properties.content_settings.content_encoding, self.name
+            )
+        return self._codec
+
+    def chunks(self, *, read_ahead: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Iterates over the decompressed content in chunks of at most
+        options.chunk_size bytes. Defaults to the read-ahead depth of the
+        binding; 0 downloads and decompresses on the function's thread.
+        """
+        self._check_closed()
+        if self._chunks is not None:
+            raise ValueError("The decompressed content can only be read once.")
+        if read_ahead is None:
+            read_ahead = self._read_ahead
+        codec = self.codec
+        compressed = self._downloader.chunks(read_ahead=read_ahead)
+        if isinstance(compressed, ReadAheadIterator):
+            self._iterators.append(compressed)
+        compressed = _count(compressed, self._compressed)
+        chunks = _count(
+            decompress(compressed, codec, self._options.chunk_size),
+            self._decompressed,
+        )
+        if read_ahead:
+            chunks = ReadAheadIterator(chunks, read_ahead)
+            self._iterators.append(chunks)
+        self._chunks = chunks
+        return chunks
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        self._check_closed()
+        if self._chunks is None:
+            self.chunks()
+        view = memoryview(buffer).cast("B")
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(view), len(self._pending))
+        view[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def readall(self) -> bytes:
+        self._check_closed()
+        parts = [bytes(self._pending)]
+        self._pending = memoryview(b"")
+        if self._chunks is None:
+            self.chunks()
+        parts.extend(self._chunks)
+        return b"".join(parts)
+
+    def _check_closed(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed blob stream.")
+
+    def close(self) -> None:
+        # The decompressing thread reads from the downloading thread, so it
+        # is stopped first
+        for iterator in reversed(self._iterators):
+            iterator.close()
+        self._iterators.clear()
+        self._pending = memoryview(b"")
+        super().close()
@@ -0,0 +1,307 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import bz2
+import zlib
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from .utils import get_app_setting_int
+
+# App Setting used as the default for every DecompressedBlob binding
+CHUNK_SIZE_SETTING = "PYTHON_BLOB_DECOMPRESSION_CHUNK_SIZE"
+
+# model_binding_data content fields that override the defaults for a single
+# binding
+CODEC_PROPERTY = "Compression"
+CHUNK_SIZE_PROPERTY = "DecompressedChunkSize"
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+GZIP = "gzip"
+DEFLATE = "deflate"
+BZ2 = "bz2"
+ZSTD = "zstd"
+IDENTITY = "identity"
+CODECS = (GZIP, DEFLATE, BZ2, ZSTD, IDENTITY)
+
+# Content-Encoding values, and their aliases, of each codec
+_CONTENT_ENCODINGS = {
+    "gzip": GZIP,
+    "x-gzip": GZIP,
+    "deflate": DEFLATE,
+    "bzip2": BZ2,
+    "x-bzip2": BZ2,
+    "zstd": ZSTD,
+    "identity": IDENTITY,
+}
+_EXTENSIONS = {
+    ".gz": GZIP,
+    ".gzip": GZIP,
+    ".tgz": GZIP,
+    ".bz2": BZ2,
+    ".zst": ZSTD,
+    ".zstd": ZSTD,
+}
+# Magic numbers of zstd frames, and of skippable frames in their high 28 bits
+_ZSTD_MAGIC = 0xFD2FB528
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+# Sizes of the Dictionary_ID and Frame_Content_Size fields of a zstd frame
+# header, by the value of their flag
+_ZSTD_DICTIONARY_ID_SIZES = (0, 1, 2, 4)
+_ZSTD_CONTENT_SIZE_SIZES = (0, 2, 4, 8)
+
+
+class DecompressionOptions:
+    """
+    Options for decompressing a blob while it is downloaded.
+
+    codec is one of gzip, deflate, bz2, zstd or identity. When it is None,
+    the codec is picked from the Content-Encoding of the blob, then from the
+    extension of its name. chunk_size is the largest size of a decompressed
+    chunk.
+    """
+
+    def __init__(
+        self, *, codec: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        if codec is not None:
+            codec = get_codec(codec)
+        if chunk_size < 1:
+            raise ValueError(
+                f"chunk_size must be a positive integer, got {chunk_size}."
+            )
+        self.codec = codec
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_binding(cls, content: Mapping[str, Any]) -> "DecompressionOptions":
+        """
+        Builds the options of a binding. Values in the model_binding_data
+        content take precedence over the App Settings.
+        """
+        chunk_size = content.get(CHUNK_SIZE_PROPERTY)
+        if chunk_size is None:
+            chunk_size = get_app_setting_int(CHUNK_SIZE_SETTING, 0) or (
+                DEFAULT_CHUNK_SIZE
+            )
+        return cls(codec=content.get(CODEC_PROPERTY), chunk_size=int(chunk_size))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DecompressionOptions):
+            return False
+        return self.codec == other.codec and self.chunk_size == other.chunk_size
+
+    def __repr__(self) -> str:
+        return (
+            f"DecompressionOptions(codec={self.codec!r}, "
+            f"chunk_size={self.chunk_size})"
+        )
+
+
+def get_codec(name: str) -> str:
+    """
+    Returns the codec of a codec name or Content-Encoding value.
+    """
+    codec = _CONTENT_ENCODINGS.get(name.strip().lower(), name.strip().lower())
+    if codec not in CODECS:
+        raise ValueError(
+            f"Unsupported compression '{name}'. Supported: {', '.join(CODECS)}."
+        )
+    return codec
+
+
+def detect_codec(content_encoding: Optional[str], blob_name: str) -> str:
+    """
+    Picks the codec of a blob from its Content-Encoding, or else from the
+    extension of its name. Blobs with neither are not decompressed.
+    """
+    if content_encoding:
+        return get_codec(content_encoding)
+    name = blob_name.lower()
+    for extension, codec in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return codec
+    return IDENTITY
+
+
+def decompress(
+    chunks: Iterable[bytes], codec: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Decompresses a stream of compressed chunks, yielding decompressed chunks
+    of at most chunk_size bytes.
+
+    Only one compressed chunk and one decompressed chunk are held at a time,
+    so memory stays bounded whatever the compression ratio. Concatenated
+    gzip members and bz2 or zstd streams are decompressed one after the
+    other, as written by appending to a compressed file, and zero padding
+    after a gzip member is skipped.
+    """
+    if codec == IDENTITY:
+        yield from chunks
+    elif codec == ZSTD:
+        yield from _decompress_zstd(chunks, chunk_size)
+    else:
+        yield from _decompress_stream(chunks, codec, chunk_size)
+
+
+def _new_decompressor(codec: str) -> Any:
+    if codec == GZIP:
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if codec == DEFLATE:
+        # Content-Encoding: deflate is the zlib format. Headers are detected,
+        # so gzip data sent as deflate is decompressed too
+        return zlib.decompressobj(zlib.MAX_WBITS | 32)
+    return bz2.BZ2Decompressor()
+
+
+def _decompress_stream(
+    chunks: Iterable[bytes], codec: str, chunk_size: int
+) -> Iterator[bytes]:
+    decompressor = _new_decompressor(codec)
+    started = False
+    for data in chunks:
+        started = started or bool(data)
+        while True:
+            if decompressor.eof:
+                if codec == GZIP:
+                    # Like gzip files, gzip streams can be padded with zeros
+                    # after a member
+                    data = data.lstrip(b"\0")
+                    if not data:
+                        break
+                # The next member of the stream
+                decompressor = _new_decompressor(codec)
+            output = decompressor.decompress(data, chunk_size)
+            if output:
+                yield output
+            if decompressor.eof:
+                data = decompressor.unused_data
+                if not data:
+                    break
+            elif codec == BZ2:
+                # bz2 keeps the input it didn't consume
+                data = b""
+                if decompressor.needs_input:
+                    break
+            else:
+                data = decompressor.unconsumed_tail
+                if not data and len(output) < chunk_size:
+                    break
+    if started and not decompressor.eof:
+        raise EOFError(f"The {codec} stream ended before the end-of-stream marker.")
+
+
+class _ZstdFrames:
+    """
+    Follows the frames of a zstd stream through their headers and block
+    headers, without decompressing them, to tell whether the stream ended
+    within a frame. zstandard's stream reader, which bounds the size of each
+    output, doesn't report truncated streams.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._needed = 4
+        self._parse = self._parse_magic
+        self._skip = 0
+        self._checksum = 0
+
+    @property
+    def truncated(self) -> bool:
+        if self._parse is None:
+            return False
+        return bool(self._skip or self._buffer or self._parse != self._parse_magic)
+
+    def feed(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view and self._parse is not None:
+            if self._skip:
+                skipped = min(self._skip, len(view))
+                self._skip -= skipped
+                view = view[skipped:]
+                continue
+            size = self._needed - len(self._buffer)
+            self._buffer += view[:size]
+            view = view[size:]
+            if len(self._buffer) == self._needed:
+                field = int.from_bytes(self._buffer, "little")
+                self._buffer.clear()
+                self._parse(field)
+
+    def _expect(self, size: int, parse: Optional[Callable[[int], None]]) -> None:
+        self._needed = size
+        self._parse = parse
+
+    def _parse_magic(self, magic: int) -> None:
+        if magic == _ZSTD_MAGIC:
+            self._expect(1, self._parse_descriptor)
+        elif magic & 0xFFFFFFF0 == _ZSTD_SKIPPABLE_MAGIC:
+            self._expect(4, self._parse_skippable_size)
+        else:
+            # Not zstd data, which the decompressor raises its own error for
+            self._expect(0, None)
+
+    def _parse_skippable_size(self, size: int) -> None:
+        self._skip = size
+        self._expect(4, self._parse_magic)
+
+    def _parse_descriptor(self, descriptor: int) -> None:
+        single_segment = descriptor >> 5 & 1
+        self._checksum = 4 if descriptor >> 2 & 1 else 0
+        size = (
+            (1 - single_segment)
+            + _ZSTD_DICTIONARY_ID_SIZES[descriptor & 3]
+            + (_ZSTD_CONTENT_SIZE_SIZES[descriptor >> 6] or single_segment)
+        )
+        if size:
+            self._expect(size, self._parse_header)
+        else:
+            self._expect(3, self._parse_block)
+
+    def _parse_header(self, header: int) -> None:
+        self._expect(3, self._parse_block)
+
+    def _parse_block(self, block: int) -> None:
+        # A RLE block holds a single byte
+        self._skip = 1 if block >> 1 & 3 == 1 else block >> 3
+        if block & 1:
+            # The last block of the frame, followed by its checksum
+            self._skip += self._checksum
+            self._expect(4, self._parse_magic)
+
+
+class _ChunkReader:
+    # The read() interface zstandard's stream reader reads its input from
+    def __init__(self, chunks: Iterable[bytes], frames: _ZstdFrames) -> None:
+        self._chunks = iter(chunks)
+        self._frames = frames
+
+    def read(self, size: int = -1) -> bytes:
+        for chunk in self._chunks:
+            if chunk:
+                self._frames.feed(chunk)
+                return chunk
+        return b""
+
+
+def _decompress_zstd(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Decompressing zstd blobs requires zstandard. Install it with "
+            "'pip install azurefunctions-extensions-bindings-blob[zstd]'."
+        ) from e
+    frames = _ZstdFrames()
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        _ChunkReader(chunks, frames), read_across_frames=True
+    )
+    with reader:
+        while True:
+            output = reader.read(chunk_size)
+            if not output:
+                break
+            yield output
+    if frames.truncated:
+        raise EOFError(f"The {ZSTD} stream ended before the end-of-stream marker.")
@@ -0,0 +1,125 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import copy
+from typing import Any, Dict, Mapping, Optional
+
+from .utils import get_app_setting_int
+
+# App Settings used as the defaults for every StorageStreamDownloader binding
+MAX_CONCURRENCY_SETTING = "PYTHON_BLOB_DOWNLOAD_MAX_CONCURRENCY"
+CHUNK_SIZE_SETTING = "PYTHON_BLOB_DOWNLOAD_CHUNK_SIZE"
+INITIAL_RANGE_SIZE_SETTING = "PYTHON_BLOB_DOWNLOAD_INITIAL_RANGE_SIZE"
+READ_AHEAD_SETTING = "PYTHON_BLOB_DOWNLOAD_READ_AHEAD"
+
+# model_binding_data content fields that override the App Settings for a
+# single binding
+MAX_CONCURRENCY_PROPERTY = "MaxConcurrency"
+CHUNK_SIZE_PROPERTY = "MaxChunkGetSize"
+INITIAL_RANGE_SIZE_PROPERTY = "MaxSingleGetSize"
+READ_AHEAD_PROPERTY = "ReadAhead"
+
+
+class DownloadOptions:
+    """
+    Options for parallel ranged downloads of a blob.
+
+    max_concurrency is the number of ranged GETs issued in parallel by
+    readall() and readinto(). chunk_size is the size of each ranged GET after
+    the first one, and initial_range_size is the size of the first GET.
+    read_ahead is the number of chunks prefetched in the background by
+    chunks(). Any option left as None keeps the Azure Storage Blob SDK
+    default.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        initial_range_size: Optional[int] = None,
+        read_ahead: Optional[int] = None,
+    ) -> None:
+        for name, value in (
+            ("max_concurrency", max_concurrency),
+            ("chunk_size", chunk_size),
+            ("initial_range_size", initial_range_size),
+            ("read_ahead", read_ahead),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value}.")
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.initial_range_size = initial_range_size
+        self.read_ahead = read_ahead
+
+    @classmethod
+    def from_binding(cls, content: Mapping[str, Any]) -> "DownloadOptions":
+        """
+        Builds the options of a binding. Values in the model_binding_data
+        content take precedence over the App Settings.
+        """
+
+        def get_option(prop: str, setting: str) -> Optional[int]:
+            value = content.get(prop)
+            if value is None:
+                value = get_app_setting_int(setting, 0) or None
+            return int(value) if value is not None else None
+
+        return cls(
+            max_concurrency=get_option(
+                MAX_CONCURRENCY_PROPERTY, MAX_CONCURRENCY_SETTING
+            ),
+            chunk_size=get_option(CHUNK_SIZE_PROPERTY, CHUNK_SIZE_SETTING),
+            initial_range_size=get_option(
+                INITIAL_RANGE_SIZE_PROPERTY, INITIAL_RANGE_SIZE_SETTING
+            ),
+            read_ahead=get_option(READ_AHEAD_PROPERTY, READ_AHEAD_SETTING),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DownloadOptions):
+            return False
+        return (
+            self.max_concurrency == other.max_concurrency
+            and self.chunk_size == other.chunk_size
+            and self.initial_range_size == other.initial_range_size
+            and self.read_ahead == other.read_ahead
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"DownloadOptions(max_concurrency={self.max_concurrency}, "
+            f"chunk_size={self.chunk_size}, "
+            f"initial_range_size={self.initial_range_size}, "
+            f"read_ahead={self.read_ahead})"
+        )
+
+    def configure_client(self, blob_client: Any) -> Any:
+        """
+        Returns a blob client that downloads with the configured range sizes.
+
+        The range sizes are part of the client configuration, which is shared
+        by every client created from the same BlobServiceClient. Instead of
+        changing the shared configuration, the returned client is a shallow
+        copy with its own configuration. It still shares the pipeline and
+        connections of the original client.
+        """
+        if self.chunk_size is None and self.initial_range_size is None:
+            return blob_client
+        config = copy.copy(blob_client._config)
+        if self.chunk_size is not None:
+            config.max_chunk_get_size = self.chunk_size
+        if self.initial_range_size is not None:
+            config.max_single_get_size = self.initial_range_size
+        blob_client = copy.copy(blob_client)
+        blob_client._config = config
+        return blob_client
+
+    def get_download_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments for blob_client.download_blob().
+        """
+        if self.max_concurrency is None:
+            return {}
+        return {"max_concurrency": self.max_concurrency}
@@ -0,0 +1,211 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+import threading
+from typing import IO, Any, Iterator, Optional, Union
+
+from azure.storage.blob import BlobClient, BlobProperties
+from azure.storage.blob import StorageStreamDownloader as SdkStorageStreamDownloader
+
+from .readAhead import ReadAheadIterator
+
+
+class BufferWriter(io.RawIOBase):
+    """
+    A seekable, writable stream over a caller-provided buffer.
+
+    The StorageStreamDownloader writes every downloaded range to the stream,
+    and the range is copied straight into the buffer. Seeking lets parallel
+    downloads write their ranges out of order.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        super().__init__()
+        view = memoryview(buffer)
+        if view.readonly:
+            raise TypeError("The buffer to download the blob into must be writable.")
+        if view.ndim != 1 or view.format != "B":
+            # Multi-byte and multi-dimensional buffers are filled byte by byte
+            view = view.cast("B")
+        self._view = view
+        self._position = 0
+
+    def check_size(self, size: int) -> None:
+        if size > len(self._view):
+            raise ValueError(
+                f"The buffer is too small for the blob: the blob has {size} "
+                f"bytes, but the buffer has {len(self._view)} bytes."
+            )
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def write(self, data: Any) -> int:
+        size = memoryview(data).nbytes
+        end = self._position + size
+        if end > len(self._view):
+            raise ValueError("The buffer is too small for the blob.")
+        self._view[self._position : end] = data
+        self._position = end
+        return size
+
+
+class LazyStorageStreamDownloader:
+    """
+    A proxy for an azure.storage.blob.StorageStreamDownloader that defers
+    download_blob() until the content or properties are first accessed.
+
+    Calling download_blob() issues the first ranged GET, so starting it while
+    decoding the binding pays for the request even when the function returns
+    early. Instead, the download starts on the first call to read(),
+    readall(), readinto(), chunks() or an access to properties.
+
+    To download only part of the blob, or to tune the download, call
+    download() with the same arguments as BlobClient.download_blob() before
+    reading. The blob client is available through blob_client without
+    starting a download.
+
+    When read_ahead is set, chunks() prefetches that many chunks in the
+    background while the function processes the current one.
+    """
+
+    def __init__(
+        self, blob_client: BlobClient, *, read_ahead: int = 0, **download_options: Any
+    ) -> None:
+        self._blob_client = blob_client
+        self._read_ahead = read_ahead
+        self._download_options = download_options
+        self._downloader: Optional[SdkStorageStreamDownloader] = None
+        self._lock = threading.Lock()
+
+    @property
+    def blob_client(self) -> BlobClient:
+        return self._blob_client
+
+    @property
+    def started(self) -> bool:
+        return self._downloader is not None
+
+    def download(
+        self,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        **kwargs: Any,
+    ) -> SdkStorageStreamDownloader:
+        """
+        Starts the download and returns the underlying
+        StorageStreamDownloader. The arguments are passed to
+        BlobClient.download_blob(), e.g. offset, length and max_concurrency.
+
+        This can only be called before the download has started.
+        """
+        with self._lock:
+            if self._downloader is not None:
+                raise ValueError(
+                    "The blob download has already started. Call download() "
+                    "before reading the blob or accessing its properties."
+                )
+            options = dict(self._download_options, **kwargs)
+            self._downloader = self._blob_client.download_blob(
+                offset=offset, length=length, **options
+            )
+            return self._downloader
+
+    def start(self) -> SdkStorageStreamDownloader:
+        """
+        Starts the download with the options of the binding, unless it has
+        already started, and returns the underlying StorageStreamDownloader.
+        """
+        return self._get_downloader()
+
+    def _get_downloader(self) -> SdkStorageStreamDownloader:
+        downloader = self._downloader
+        if downloader is None:
+            with self._lock:
+                if self._downloader is None:
+                    self._downloader = self._blob_client.download_blob(
+                        **self._download_options
+                    )
+                downloader = self._downloader
+        return downloader
+
+    @property
+    def name(self) -> str:
+        return self._blob_client.blob_name
+
+    @property
+    def container(self) -> str:
+        return self._blob_client.container_name
+
+    @property
+    def properties(self) -> BlobProperties:
+        return self._get_downloader().properties
+
+    @property
+    def size(self) -> int:
+        return self._get_downloader().size
+
+    def read(self, size: int = -1, *, chars: Optional[int] = None) -> Any:
+        return self._get_downloader().read(size, chars=chars)
+
+    def readall(self) -> Any:
+        return self._get_downloader().readall()
+
+    def readinto(self, target: Union[IO[bytes], Any]) -> int:
+        """
+        Downloads the blob into a writable stream or a writable buffer and
+        returns the number of bytes written.
+
+        A buffer, e.g. a bytearray, memoryview or NumPy array, is filled in
+        place range by range, without joining the ranges into a single bytes
+        object first. It must be large enough for the whole blob.
+        """
+        downloader = self._get_downloader()
+        if hasattr(target, "write"):
+            return downloader.readinto(target)
+        writer = BufferWriter(target)
+        writer.check_size(downloader.size)
+        return downloader.readinto(writer)
+
+    def chunks(self, *, read_ahead: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Iterates over the chunks of the blob.
+
+        With a read_ahead depth of N, a background thread downloads up to N
+        chunks ahead of the function, so that network I/O overlaps with the
+        processing of each chunk. The returned ReadAheadIterator exposes its
+        queue depth and stall times through stats. Defaults to the read-ahead
+        depth of the binding; 0 disables it.
+        """
+        if read_ahead is None:
+            read_ahead = self._read_ahead
+        chunks = self._get_downloader().chunks()
+        if not read_ahead:
+            return chunks
+        return ReadAheadIterator(chunks, read_ahead)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else, e.g. content_as_text(), is served by the downloader
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._get_downloader(), name)
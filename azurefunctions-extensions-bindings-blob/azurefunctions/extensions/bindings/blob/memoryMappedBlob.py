@@ -0,0 +1,177 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import mmap
+import os
+import tempfile
+import weakref
+from typing import Optional, Union
+
+from azure.storage.blob import BlobProperties
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .clientPool import get_blob_service_client
+from .downloadOptions import DownloadOptions
+
+# App Setting for the directory the blobs are downloaded to. Defaults to the
+# system temporary directory.
+SPILL_DIRECTORY_SETTING = "PYTHON_BLOB_SPILL_DIRECTORY"
+
+
+class BlobMapping:
+    """
+    A read-only memory map of a blob downloaded to a local file.
+
+    The content is paged in from the file by the operating system, so the
+    memory used by the function does not grow with the blob size. The map and
+    the file are released by close(), when used as a context manager, or when
+    the object is garbage collected at the end of the invocation.
+    """
+
+    def __init__(self, path: str, properties: BlobProperties) -> None:
+        self._properties = properties
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # mmap cannot map an empty file
+            self._mmap: Optional[mmap.mmap] = (
+                mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                if size
+                else None
+            )
+        except BaseException:
+            self._file.close()
+            _remove(path)
+            raise
+        self._view = memoryview(self._mmap if self._mmap is not None else b"")
+        self._finalizer = weakref.finalize(
+            self, _release, self._view, self._mmap, self._file, path
+        )
+        if os.name != "nt":
+            # The mapping keeps the content alive, so the file can be unlinked
+            # right away. It's never left behind even if the worker crashes.
+            _remove(path)
+
+    @property
+    def properties(self) -> BlobProperties:
+        return self._properties
+
+    @property
+    def size(self) -> int:
+        return len(self._view)
+
+    @property
+    def mmap(self) -> Optional[mmap.mmap]:
+        """
+        The read-only mmap of the blob, or None for an empty blob.
+        """
+        return self._mmap
+
+    @property
+    def view(self) -> memoryview:
+        """
+        A read-only memoryview of the blob content, e.g. for numpy.frombuffer.
+        """
+        if not self._finalizer.alive:
+            raise ValueError("The blob mapping is closed.")
+        return self._view
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> "BlobMapping":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _release(view: memoryview, mapping: Optional[mmap.mmap], file, path: str):
+    try:
+        view.release()
+        if mapping is not None:
+            mapping.close()
+    except BufferError:
+        # The function still holds a view of the map. It's released when the
+        # last view goes away.
+        pass
+    file.close()
+    _remove(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class MemoryMappedBlob(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        self._download_options = DownloadOptions()
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._download_options = DownloadOptions.from_binding(binding.content)
+
+    def get_sdk_type(self):
+        """
+        Streams the blob into a file and returns a BlobMapping of it.
+
+        The blob is written to the file range by range, so memory use stays
+        flat regardless of the blob size. The file is created in the
+        directory set by the PYTHON_BLOB_SPILL_DIRECTORY App Setting, or in
+        the system temporary directory.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = self._download_options.configure_client(
+                blob_service_client.get_blob_client(
+                    container=self._containerName,
+                    blob=self._blobName,
+                )
+            )
+            fd, path = tempfile.mkstemp(
+                prefix="blob-", dir=os.getenv(SPILL_DIRECTORY_SETTING) or None
+            )
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    downloader = blob_client.download_blob(
+                        **self._download_options.get_download_kwargs()
+                    )
+                    downloader.readinto(file)
+            except BaseException:
+                _remove(path)
+                raise
+            return BlobMapping(path, downloader.properties)
+        else:
+            return None
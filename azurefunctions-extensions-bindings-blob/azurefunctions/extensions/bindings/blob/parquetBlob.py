@@ -0,0 +1,70 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .blobRawIO import BlobRawIO
+from .clientPool import get_blob_service_client
+from .downloadOptions import DownloadOptions
+from .parquetReader import DEFAULT_MAX_CONCURRENCY, ParquetBlobReader
+from .seekableOptions import SeekableOptions
+
+
+class ParquetBlob(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        self._seekable_options = SeekableOptions()
+        self._max_concurrency = DEFAULT_MAX_CONCURRENCY
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._seekable_options = SeekableOptions.from_binding(binding.content)
+            self._max_concurrency = (
+                DownloadOptions.from_binding(binding.content).max_concurrency
+                or DEFAULT_MAX_CONCURRENCY
+            )
+
+    def get_sdk_type(self):
+        """
+        Returns a ParquetBlobReader, which reads the selected columns of the
+        Parquet blob as Arrow record batches.
+
+        Nothing is downloaded while decoding the binding. The footer and the
+        column chunks of the selected columns are downloaded when they are
+        read, with up to MaxConcurrency ranged GETs in parallel.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            return ParquetBlobReader(
+                BlobRawIO(blob_client, self._seekable_options),
+                max_concurrency=self._max_concurrency,
+            )
+        else:
+            return None
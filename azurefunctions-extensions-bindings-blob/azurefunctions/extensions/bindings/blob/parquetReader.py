@@ -0,0 +1,154 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from .blobRawIO import BlobRawIO
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _import_pyarrow() -> Tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet blobs requires pyarrow. Install it with "
+            "'pip install azurefunctions-extensions-bindings-blob[parquet]'."
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+class ParquetBlobReader:
+    """
+    Reads the columns of a Parquet blob as Arrow record batches.
+
+    Only the footer of the file and the column chunks of the selected columns
+    and row groups are downloaded. The footer is read with ranged GETs on
+    first use. Before a row group is decoded, the byte ranges of its selected
+    column chunks are downloaded into the block cache of the BlobRawIO, with
+    up to max_concurrency GETs in parallel, so decoding sends no request.
+
+    The cache of the BlobRawIO should hold the selected column chunks of a
+    row group, or they are downloaded again while decoding.
+    """
+
+    def __init__(
+        self, raw: BlobRawIO, *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be a positive integer, got {max_concurrency}."
+            )
+        self._raw = raw
+        self._max_concurrency = max_concurrency
+        self._file: Optional[Any] = None
+
+    @property
+    def raw(self) -> BlobRawIO:
+        return self._raw
+
+    @property
+    def parquet_file(self) -> Any:
+        """
+        The pyarrow.parquet.ParquetFile over the blob.
+        """
+        if self._file is None:
+            _, pq = _import_pyarrow()
+            self._file = pq.ParquetFile(self._raw)
+        return self._file
+
+    @property
+    def metadata(self) -> Any:
+        return self.parquet_file.metadata
+
+    @property
+    def schema_arrow(self) -> Any:
+        return self.parquet_file.schema_arrow
+
+    @property
+    def num_row_groups(self) -> int:
+        return self.metadata.num_row_groups
+
+    @property
+    def requests(self) -> int:
+        return self._raw.requests
+
+    @property
+    def bytes_downloaded(self) -> int:
+        return self._raw.bytes_downloaded
+
+    def column_chunk_ranges(
+        self, row_group: int, columns: Optional[Sequence[str]] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Returns the (offset, length) byte ranges of the column chunks of a
+        row group. With columns, only the chunks of these top-level columns
+        are returned; nested columns have one chunk per leaf.
+        """
+        metadata = self.metadata.row_group(row_group)
+        selected = set(columns) if columns is not None else None
+        ranges = []
+        for i in range(metadata.num_columns):
+            chunk = metadata.column(i)
+            column = chunk.path_in_schema.split(".")[0]
+            if selected is not None and column not in selected:
+                continue
+            # The dictionary page, when there is one, comes before the data
+            # pages of the chunk
+            offset = chunk.data_page_offset
+            if chunk.has_dictionary_page and chunk.dictionary_page_offset:
+                offset = min(offset, chunk.dictionary_page_offset)
+            ranges.append((offset, chunk.total_compressed_size))
+        return ranges
+
+    def iter_batches(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        row_groups: Optional[Sequence[int]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[Any]:
+        """
+        Yields the row groups as pyarrow.RecordBatch of at most batch_size
+        rows, with the given columns, or every column.
+        """
+        parquet_file = self.parquet_file
+        if row_groups is None:
+            row_groups = range(self.num_row_groups)
+        columns = list(columns) if columns is not None else None
+        for row_group in row_groups:
+            self._raw.prefetch(
+                self.column_chunk_ranges(row_group, columns), self._max_concurrency
+            )
+            table = parquet_file.read_row_group(row_group, columns=columns)
+            yield from table.to_batches(max_chunksize=batch_size)
+
+    def read(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        row_groups: Optional[Sequence[int]] = None,
+    ) -> Any:
+        """
+        Returns the given columns and row groups as a pyarrow.Table.
+        """
+        pa, _ = _import_pyarrow()
+        schema = self.schema_arrow
+        if columns is not None:
+            schema = pa.schema([schema.field(name) for name in columns])
+        return pa.Table.from_batches(
+            self.iter_batches(columns, row_groups), schema=schema
+        )
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._raw.close()
+
+    def __enter__(self) -> "ParquetBlobReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
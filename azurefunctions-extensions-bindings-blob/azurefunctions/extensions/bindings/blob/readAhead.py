@@ -0,0 +1,236 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import queue
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Iterator, Optional
+
+# Marks the end of the source in the queue
+_END = object()
+# How often a blocked producer checks whether the consumer went away
+_POLL_INTERVAL = 0.1
+
+
+class ReadAheadStats:
+    """
+    Counters of a read-ahead pipeline, used to tune its depth.
+
+    consumer_stall_time is the total time in seconds the function waited for
+    the next chunk: the network is slower than the processing. When it stays
+    high, a deeper queue does not help. producer_stall_time is the total time
+    the background reader waited for room in the queue: the processing is
+    slower than the network. max_queue_depth is the largest number of chunks
+    that were prefetched at once.
+    """
+
+    def __init__(self, depth: int) -> None:
+        self.depth = depth
+        self.chunks = 0
+        self.bytes = 0
+        self.max_queue_depth = 0
+        self.consumer_stall_time = 0.0
+        self.producer_stall_time = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ReadAheadStats(depth={self.depth}, chunks={self.chunks}, "
+            f"bytes={self.bytes}, max_queue_depth={self.max_queue_depth}, "
+            f"consumer_stall_time={self.consumer_stall_time:.3f}, "
+            f"producer_stall_time={self.producer_stall_time:.3f})"
+        )
+
+
+def _check_depth(depth: int) -> None:
+    if depth < 1:
+        raise ValueError(f"The read-ahead depth must be at least 1, got {depth}.")
+
+
+def _put(
+    items: "queue.Queue", item, closed: threading.Event, stats: ReadAheadStats
+) -> bool:
+    started = time.perf_counter()
+    try:
+        while not closed.is_set():
+            try:
+                items.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+    finally:
+        stats.producer_stall_time += time.perf_counter() - started
+
+
+def _read(
+    source: Iterator[bytes],
+    items: "queue.Queue",
+    closed: threading.Event,
+    stats: ReadAheadStats,
+) -> None:
+    # Runs in the background thread. It doesn't reference the iterator, so
+    # an iterator dropped by the function is collected and its finalizer
+    # stops the thread.
+    try:
+        for chunk in source:
+            if not _put(items, chunk, closed, stats):
+                break
+            stats.max_queue_depth = max(stats.max_queue_depth, items.qsize())
+        else:
+            _put(items, _END, closed, stats)
+    except BaseException as e:
+        _put(items, e, closed, stats)
+    finally:
+        if closed.is_set():
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+
+class ReadAheadIterator:
+    """
+    Iterates over the chunks of a download while a background thread
+    prefetches up to depth chunks into a bounded queue.
+
+    Network I/O for the next chunks overlaps with the processing of the
+    current one. Errors raised while reading are raised by the iterator.
+    Call close(), or use the iterator as a context manager, to stop reading
+    when the function does not consume every chunk. An iterator that is
+    dropped without being closed stops its thread when it is collected.
+    """
+
+    def __init__(self, source: Iterator[bytes], depth: int) -> None:
+        _check_depth(depth)
+        self.stats = ReadAheadStats(depth)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=depth)
+        self._closed = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(
+            target=_read,
+            args=(source, self._queue, self._closed, self.stats),
+            name="blob-read-ahead",
+            daemon=True,
+        )
+        self._thread.start()
+        weakref.finalize(self, self._closed.set)
+
+    def __iter__(self) -> "ReadAheadIterator":
+        return self
+
+    def __next__(self) -> bytes:
+        if self._done:
+            raise StopIteration
+        started = time.perf_counter()
+        item = self._queue.get()
+        self.stats.consumer_stall_time += time.perf_counter() - started
+        if item is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+        self.stats.chunks += 1
+        self.stats.bytes += len(item)
+        return item
+
+    def close(self) -> None:
+        self._done = True
+        self._closed.set()
+        self._thread.join()
+
+    def __enter__(self) -> "ReadAheadIterator":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+async def _read_async(
+    source: AsyncIterator[bytes], items: asyncio.Queue, stats: ReadAheadStats
+) -> None:
+    async def put(item) -> None:
+        started = time.perf_counter()
+        try:
+            await items.put(item)
+        finally:
+            stats.producer_stall_time += time.perf_counter() - started
+
+    try:
+        async for chunk in source:
+            await put(chunk)
+            stats.max_queue_depth = max(stats.max_queue_depth, items.qsize())
+        await put(_END)
+    except asyncio.CancelledError:
+        raise
+    except BaseException as e:
+        await put(e)
+
+
+def _cancel(loop: asyncio.AbstractEventLoop, task: asyncio.Task) -> None:
+    # Finalizer of a dropped AsyncReadAheadIterator, which may run outside
+    # of the event loop
+    if not task.done() and not loop.is_closed():
+        loop.call_soon_threadsafe(task.cancel)
+
+
+class AsyncReadAheadIterator:
+    """
+    Iterates over the chunks of an async download while a background task
+    prefetches up to depth chunks into a bounded queue.
+
+    The task is started on first iteration, on the function's event loop.
+    Call aclose(), or use the iterator as an async context manager, to stop
+    reading when the function does not consume every chunk. The task of an
+    iterator dropped without being closed is cancelled when it is collected.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], depth: int) -> None:
+        _check_depth(depth)
+        self.stats = ReadAheadStats(depth)
+        self._source = source
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._done = False
+
+    def __aiter__(self) -> "AsyncReadAheadIterator":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._done:
+            raise StopAsyncIteration
+        if self._task is None:
+            loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(maxsize=self.stats.depth)
+            self._task = loop.create_task(
+                _read_async(self._source, self._queue, self.stats)
+            )
+            weakref.finalize(self, _cancel, loop, self._task)
+        started = time.perf_counter()
+        item = await self._queue.get()
+        self.stats.consumer_stall_time += time.perf_counter() - started
+        if item is _END:
+            self._done = True
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+        self.stats.chunks += 1
+        self.stats.bytes += len(item)
+        return item
+
+    async def aclose(self) -> None:
+        self._done = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "AsyncReadAheadIterator":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
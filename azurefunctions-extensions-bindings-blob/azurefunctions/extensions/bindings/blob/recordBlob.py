@@ -0,0 +1,34 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum
+
+from .bindingContent import get_binding_content
+from .decompressedBlob import DecompressedBlob
+from .recordReader import RecordOptions, RecordReader
+
+
+class RecordBlob(DecompressedBlob):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        super().__init__(data=data)
+        self._record_options = RecordOptions()
+        if self._data:
+            binding = get_binding_content(data.content)
+            self._record_options = RecordOptions.from_binding(binding.content)
+
+    def get_sdk_type(self):
+        """
+        Returns a RecordReader over the NDJSON or CSV records of the blob.
+
+        The blob is read through a DecompressingStreamDownloader, so
+        compressed blobs are decompressed while they are downloaded, and
+        records are parsed as chunks arrive. The format is the binding's
+        RecordFormat property, or else is picked from the extension of the
+        blob.
+        """
+        stream = super().get_sdk_type()
+        if stream is None:
+            return None
+        return RecordReader(stream, self._record_options, name=self._blobName)
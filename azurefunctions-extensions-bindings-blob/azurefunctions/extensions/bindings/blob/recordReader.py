@@ -0,0 +1,371 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .utils import get_app_setting_int
+
+# App Setting used as the default for every RecordBlob binding
+BATCH_SIZE_SETTING = "PYTHON_BLOB_RECORD_BATCH_SIZE"
+
+# model_binding_data content fields that override the defaults for a single
+# binding
+FORMAT_PROPERTY = "RecordFormat"
+BATCH_SIZE_PROPERTY = "RecordBatchSize"
+DELIMITER_PROPERTY = "CsvDelimiter"
+
+DEFAULT_BATCH_SIZE = 10000
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+
+_EXTENSIONS = {
+    ".jsonl": NDJSON,
+    ".ndjson": NDJSON,
+    ".csv": CSV,
+    ".tsv": CSV,
+}
+# Suffixes of compressed blobs, removed before picking the format
+_COMPRESSION_EXTENSIONS = (".gz", ".gzip", ".bz2", ".zst", ".zstd")
+# Size of the blocks parsed at once by pyarrow. The schema of NDJSON
+# records is inferred from the first block.
+_ARROW_BLOCK_SIZE = 1024 * 1024
+_BOM = b"\xef\xbb\xbf"
+
+
+class RecordOptions:
+    """
+    Options for reading the records of a blob.
+
+    format is ndjson, one JSON object per line, or csv, with a header line.
+    When it is None, the format is picked from the extension of the blob,
+    ignoring a compression extension such as .gz. A .json blob needs an
+    explicit format. batch_size is the number
+    of records of each batch, and delimiter the field delimiter of CSV
+    records, a tab for .tsv blobs by default.
+    """
+
+    def __init__(
+        self,
+        *,
+        format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        delimiter: Optional[str] = None,
+    ) -> None:
+        if format is not None:
+            format = format.lower()
+            if format not in FORMATS:
+                raise ValueError(
+                    f"Unsupported record format '{format}'. "
+                    f"Supported: {', '.join(FORMATS)}."
+                )
+        if batch_size < 1:
+            raise ValueError(
+                f"batch_size must be a positive integer, got {batch_size}."
+            )
+        if delimiter is not None and len(delimiter) != 1:
+            raise ValueError(
+                f"delimiter must be a single character, got {delimiter!r}."
+            )
+        self.format = format
+        self.batch_size = batch_size
+        self.delimiter = delimiter
+
+    @classmethod
+    def from_binding(cls, content: Mapping[str, Any]) -> "RecordOptions":
+        """
+        Builds the options of a binding. Values in the model_binding_data
+        content take precedence over the App Settings.
+        """
+        batch_size = content.get(BATCH_SIZE_PROPERTY)
+        if batch_size is None:
+            batch_size = get_app_setting_int(BATCH_SIZE_SETTING, 0) or (
+                DEFAULT_BATCH_SIZE
+            )
+        return cls(
+            format=content.get(FORMAT_PROPERTY),
+            batch_size=int(batch_size),
+            delimiter=content.get(DELIMITER_PROPERTY),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RecordOptions):
+            return False
+        return vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"RecordOptions(format={self.format!r}, "
+            f"batch_size={self.batch_size}, delimiter={self.delimiter!r})"
+        )
+
+
+def detect_format(blob_name: str) -> str:
+    """
+    Picks the record format of a blob from the extension of its name.
+    """
+    name = _strip_compression(blob_name)
+    for extension, format in _EXTENSIONS.items():
+        if name.endswith(extension):
+            return format
+    if name.endswith(".json"):
+        # A .json blob is usually a single document, such as an array,
+        # which can't be read line by line
+        raise ValueError(
+            f"'{blob_name}' may hold a single JSON document rather than one "
+            f"record per line. Set the {FORMAT_PROPERTY} property of the "
+            f"binding, or the format of RecordOptions, to '{NDJSON}' to read "
+            f"it as NDJSON."
+        )
+    raise ValueError(
+        f"Can't pick the record format of '{blob_name}' from its extension. "
+        f"Set the {FORMAT_PROPERTY} property of the binding."
+    )
+
+
+def _strip_compression(blob_name: str) -> str:
+    name = blob_name.lower()
+    for extension in _COMPRESSION_EXTENSIONS:
+        if name.endswith(extension):
+            return name[: -len(extension)]
+    return name
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.json
+    except ImportError as e:
+        raise ImportError(
+            "Columnar record batches require pyarrow. Install it with "
+            "'pip install azurefunctions-extensions-bindings-blob[records]'."
+        ) from e
+    return pyarrow
+
+
+class RecordReader:
+    """
+    Reads the NDJSON or CSV records of a blob stream, as dicts or as
+    columnar batches, while the stream is downloaded.
+
+    Records that span two chunks of the stream are joined before they are
+    parsed. The NDJSON lines of a batch are parsed by a single json.loads()
+    call and CSV records by the csv module, which also handles quoted fields
+    spanning lines. arrow_batches() and numpy_batches() parse whole blocks
+    with the multithreaded pyarrow readers instead, without creating a
+    Python object per value.
+
+    The stream can be read once, with one of the iteration methods.
+    """
+
+    def __init__(
+        self,
+        stream: Any,
+        options: Optional[RecordOptions] = None,
+        *,
+        name: str = "",
+    ) -> None:
+        self._stream = stream
+        self._options = options or RecordOptions()
+        self._name = name or getattr(stream, "name", "")
+        self._format = self._options.format
+        self._started = False
+        self.records_read = 0
+
+    @property
+    def stream(self) -> Any:
+        return self._stream
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def format(self) -> str:
+        if self._format is None:
+            self._format = detect_format(self._name)
+        return self._format
+
+    @property
+    def batch_size(self) -> int:
+        return self._options.batch_size
+
+    @property
+    def delimiter(self) -> str:
+        if self._options.delimiter is not None:
+            return self._options.delimiter
+        return "\t" if _strip_compression(self._name).endswith(".tsv") else ","
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over the records as dicts.
+        """
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self, batch_size: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Iterates over lists of at most batch_size records, as dicts.
+        """
+        batch_size = batch_size or self.batch_size
+        self._start()
+        if self.format == NDJSON:
+            batches = self._ndjson_batches(batch_size)
+        else:
+            batches = self._csv_batches(batch_size)
+        for batch in batches:
+            self.records_read += len(batch)
+            yield batch
+
+    def arrow_batches(self, batch_size: Optional[int] = None) -> Iterator[Any]:
+        """
+        Iterates over pyarrow.RecordBatch of batch_size records, but the last
+        one.
+        """
+        pa = _import_pyarrow()
+        batch_size = batch_size or self.batch_size
+        self._start()
+        stream = self._buffered()
+        if self.format == NDJSON:
+            reader = pa.json.open_json(
+                stream, read_options=pa.json.ReadOptions(block_size=_ARROW_BLOCK_SIZE)
+            )
+        else:
+            reader = pa.csv.open_csv(
+                stream,
+                read_options=pa.csv.ReadOptions(block_size=_ARROW_BLOCK_SIZE),
+                parse_options=pa.csv.ParseOptions(
+                    delimiter=self.delimiter, newlines_in_values=True
+                ),
+            )
+        for batch in _rebatch(pa, reader, batch_size):
+            self.records_read += batch.num_rows
+            yield batch
+
+    def numpy_batches(
+        self, batch_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over batches of batch_size records as dicts of NumPy arrays,
+        one per column.
+        """
+        for batch in self.arrow_batches(batch_size):
+            yield {
+                name: column.to_numpy(zero_copy_only=False)
+                for name, column in zip(batch.schema.names, batch.columns)
+            }
+
+    def _start(self) -> None:
+        if self._started:
+            raise ValueError("The records of the blob can only be read once.")
+        self._started = True
+
+    def _buffered(self) -> Any:
+        # A raw stream may return fewer bytes than requested, which pyarrow
+        # and TextIOWrapper would take for the end of the stream
+        if isinstance(self._stream, io.RawIOBase):
+            return io.BufferedReader(self._stream, _ARROW_BLOCK_SIZE)
+        return self._stream
+
+    def _chunks(self) -> Iterator[bytes]:
+        chunks = getattr(self._stream, "chunks", None)
+        if chunks is not None:
+            return iter(chunks())
+        return iter(lambda: self._stream.read(_ARROW_BLOCK_SIZE), b"")
+
+    def _lines(self) -> Iterator[List[bytes]]:
+        # Yields the complete lines of each chunk. The partial line at the
+        # end of a chunk is kept and completed by the next one.
+        partial = b""
+        first = True
+        for chunk in self._chunks():
+            lines = (partial + chunk).split(b"\n") if partial else chunk.split(b"\n")
+            partial = lines.pop()
+            if first and lines:
+                # The BOM may span chunks, so it is removed from the first line
+                first = False
+                lines[0] = _strip_bom(lines[0])
+            yield lines
+        if partial:
+            yield [_strip_bom(partial) if first else partial]
+
+    def _ndjson_batches(self, batch_size: int) -> Iterator[List[Dict]]:
+        pending: List[bytes] = []
+        for lines in self._lines():
+            pending.extend(line for line in lines if line.strip())
+            while len(pending) >= batch_size:
+                yield _parse_ndjson(pending[:batch_size])
+                del pending[:batch_size]
+        if pending:
+            yield _parse_ndjson(pending)
+
+    def _csv_batches(self, batch_size: int) -> Iterator[List[Dict]]:
+        text = io.TextIOWrapper(self._buffered(), encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text, delimiter=self.delimiter)
+        batch: List[Dict] = []
+        for record in reader:
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _strip_bom(line: bytes) -> bytes:
+    return line[len(_BOM) :] if line.startswith(_BOM) else line
+
+
+def _parse_ndjson(lines: List[bytes]) -> List[Dict]:
+    # One call to the C parser for the whole batch
+    try:
+        return json.loads(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        # Report the line that is not valid JSON
+        for line in lines:
+            try:
+                json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON record {line[:100]!r}: {e}") from e
+        raise
+
+
+def _rebatch(pa: Any, batches: Any, batch_size: int) -> Iterator[Any]:
+    # The pyarrow readers yield one batch per block, whatever its number of
+    # records
+    pending = []
+    rows = 0
+    for batch in batches:
+        while batch.num_rows:
+            size = min(batch_size - rows, batch.num_rows)
+            pending.append(batch.slice(0, size))
+            rows += size
+            batch = batch.slice(size)
+            if rows == batch_size:
+                yield _concat(pa, pending)
+                pending = []
+                rows = 0
+    if rows:
+        yield _concat(pa, pending)
+
+
+def _concat(pa: Any, batches: List[Any]) -> Any:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
@@ -0,0 +1,59 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Union
+
+from azurefunctions.extensions.base import Datum, SdkType
+
+from .bindingContent import get_binding_content
+from .blobRawIO import BlobRawIO
+from .clientPool import get_blob_service_client
+from .seekableOptions import SeekableOptions
+
+
+class SeekableBlob(SdkType):
+    def __init__(self, *, data: Union[bytes, Datum]) -> None:
+        # model_binding_data properties
+        self._data = data
+        self._using_managed_identity = False
+        self._managed_identity = None
+        self._version = ""
+        self._source = ""
+        self._content_type = ""
+        self._connection = ""
+        self._containerName = ""
+        self._blobName = ""
+        self._seekable_options = SeekableOptions()
+        if self._data:
+            self._version = data.version
+            self._source = data.source
+            self._content_type = data.content_type
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._seekable_options = SeekableOptions.from_binding(binding.content)
+
+    def get_sdk_type(self):
+        """
+        Returns a BlobRawIO, a read-only seekable file over the blob.
+
+        Nothing is downloaded while decoding the binding. Reads download the
+        blocks they need with ranged GETs, and the blocks are cached for the
+        rest of the invocation.
+        """
+        if self._data:
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
+            )
+            blob_client = blob_service_client.get_blob_client(
+                container=self._containerName,
+                blob=self._blobName,
+            )
+            return BlobRawIO(blob_client, self._seekable_options)
+        else:
+            return None
@@ -0,0 +1,87 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Any, Mapping
+
+from .utils import get_app_setting_int
+
+# App Settings used as the defaults for every SeekableBlob binding
+BLOCK_SIZE_SETTING = "PYTHON_BLOB_SEEKABLE_BLOCK_SIZE"
+CACHE_SIZE_SETTING = "PYTHON_BLOB_SEEKABLE_CACHE_SIZE"
+
+# model_binding_data content fields that override the App Settings for a
+# single binding
+BLOCK_SIZE_PROPERTY = "SeekableBlockSize"
+CACHE_SIZE_PROPERTY = "SeekableCacheSize"
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class SeekableOptions:
+    """
+    Options for random access to a blob.
+
+    Reads are served from blocks of block_size bytes, and up to cache_size
+    bytes of blocks are kept, least recently used first out. Small blocks
+    make small reads cheap, e.g. the directory of a zip file or the footer
+    of a Parquet file, while large blocks need fewer requests to read a
+    range.
+    """
+
+    def __init__(
+        self,
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError(
+                f"block_size must be a positive integer, got {block_size}."
+            )
+        if cache_size < block_size:
+            raise ValueError(
+                f"cache_size must be at least block_size ({block_size}), "
+                f"got {cache_size}."
+            )
+        self.block_size = block_size
+        self.cache_size = cache_size
+
+    @property
+    def cache_blocks(self) -> int:
+        return self.cache_size // self.block_size
+
+    @classmethod
+    def from_binding(cls, content: Mapping[str, Any]) -> "SeekableOptions":
+        """
+        Builds the options of a binding. Values in the model_binding_data
+        content take precedence over the App Settings.
+        """
+
+        def get_option(prop: str, setting: str, default: int) -> int:
+            value = content.get(prop)
+            if value is None:
+                value = get_app_setting_int(setting, 0) or default
+            return int(value)
+
+        return cls(
+            block_size=get_option(
+                BLOCK_SIZE_PROPERTY, BLOCK_SIZE_SETTING, DEFAULT_BLOCK_SIZE
+            ),
+            cache_size=get_option(
+                CACHE_SIZE_PROPERTY, CACHE_SIZE_SETTING, DEFAULT_CACHE_SIZE
+            ),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SeekableOptions):
+            return False
+        return (
+            self.block_size == other.block_size and self.cache_size == other.cache_size
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"SeekableOptions(block_size={self.block_size}, "
+            f"cache_size={self.cache_size})"
+        )
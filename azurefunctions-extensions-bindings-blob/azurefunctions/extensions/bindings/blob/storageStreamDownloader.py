@@ -1,12 +1,14 @@
 #  Copyright (c) Microsoft Corporation. All rights reserved.
 #  Licensed under the MIT License.
 
-import json
 from typing import Union
 
-from azure.storage.blob import BlobServiceClient
 from azurefunctions.extensions.base import Datum, SdkType
-from .utils import get_connection_string, using_managed_identity
+
+from .bindingContent import get_binding_content
+from .clientPool import get_blob_service_client
+from .downloadOptions import DownloadOptions
+from .lazyDownloader import LazyStorageStreamDownloader
 
 
 class StorageStreamDownloader(SdkType):
@@ -14,36 +16,50 @@ class StorageStreamDownloader(SdkType):
         # model_binding_data properties
         self._data = data
         self._using_managed_identity = False
+        self._managed_identity = None
         self._version = ""
         self._source = ""
         self._content_type = ""
         self._connection = ""
         self._containerName = ""
         self._blobName = ""
+        self._download_options = DownloadOptions()
         if self._data:
             self._version = data.version
             self._source = data.source
             self._content_type = data.content_type
-            content_json = json.loads(data.content)
-            self._connection = get_connection_string(content_json.get("Connection"))
-            self._using_managed_identity = using_managed_identity(
-                content_json.get("Connection")
-            )
-            self._containerName = content_json.get("ContainerName")
-            self._blobName = content_json.get("BlobName")
+            binding = get_binding_content(data.content)
+            self._connection = binding.connection
+            self._using_managed_identity = binding.using_managed_identity
+            self._managed_identity = binding.managed_identity
+            self._containerName = binding.container_name
+            self._blobName = binding.blob_name
+            self._download_options = DownloadOptions.from_binding(binding.content)
 
-    # Returns a StorageStreamDownloader
     def get_sdk_type(self):
+        """
+        Returns a LazyStorageStreamDownloader. download_blob() is called on
+        first access to the content or properties, not while decoding the
+        binding, and the function may call download() to pass its own
+        offset, length and max_concurrency.
+
+        The binding's DownloadOptions configure parallel ranged downloads:
+        the number of concurrent GETs and the size of each range.
+        """
         if self._data:
-            blob_service_client = (
-                BlobServiceClient(account_url=self._connection)
-                if self._using_managed_identity
-                else BlobServiceClient.from_connection_string(self._connection)
+            blob_service_client = get_blob_service_client(
+                self._connection,
+                self._using_managed_identity,
+                managed_identity=self._managed_identity,
             )
-            # download_blob() returns a StorageStreamDownloader object
-            return blob_service_client.get_blob_client(
+            blob_client = blob_service_client.get_blob_client(
                 container=self._containerName,
                 blob=self._blobName,
-            ).download_blob()
+            )
+            return LazyStorageStreamDownloader(
+                self._download_options.configure_client(blob_client),
+                read_ahead=self._download_options.read_ahead or 0,
+                **self._download_options.get_download_kwargs(),
+            )
         else:
             return None
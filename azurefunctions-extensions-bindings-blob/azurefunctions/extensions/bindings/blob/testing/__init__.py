@@ -0,0 +1,11 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+"""
+Local stand-ins for the Azure services used by the blob SDK types, so that
+tests and benchmarks can run offline.
+"""
+
+from .blobStorage import FakeBlobStorage, StoredBlob
+from .tokenEndpoint import FakeTokenEndpoint
+
+__all__ = ["FakeBlobStorage", "FakeTokenEndpoint", "StoredBlob"]
@@ -0,0 +1,534 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+ACCOUNT_NAME = "devstoreaccount1"
+# The well-known key of the storage emulator. Requests are not authenticated.
+ACCOUNT_KEY = (
+    "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsu"
+    "Fq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+)
+# Bodies are sent and received in slices, so that the bandwidth is applied
+# while they are transferred
+TRANSFER_SLICE = 64 * 1024
+
+
+class StoredBlob:
+    """
+    A block blob or an append blob held by FakeBlobStorage.
+    """
+
+    def __init__(
+        self,
+        content: bytes,
+        etag: str,
+        *,
+        content_type: str = "application/octet-stream",
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        blocks: Optional[Dict[str, bytes]] = None,
+        blob_type: str = "BlockBlob",
+        creation_time: Optional[float] = None,
+    ) -> None:
+        self.content = content
+        self.etag = etag
+        self.last_modified = time.time()
+        self.creation_time = creation_time or self.last_modified
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.metadata = metadata or {}
+        # The committed blocks, which a later block list can reuse
+        self.blocks = blocks or {}
+        self.blob_type = blob_type
+
+
+class FakeBlobStorage:
+    """
+    A local stand-in for Azure Blob Storage, speaking the subset of the Blob
+    REST API used by the blob SDK types: Get Blob (ranged and conditional),
+    Get Blob Properties, Put Blob, Put Block, Put Block List, Append Block,
+    List Blobs, Delete Blob and Create Container. Blobs are kept in memory.
+
+    Every request waits for latency seconds, and every request and response
+    body is transferred at bandwidth bytes per second on each connection. A
+    bandwidth of 0 transfers bodies as fast as possible. operations counts
+    the requests served by operation name, e.g. "GetBlob" or "PutBlock".
+    Point the SDK types at the server by setting the variables returned by
+    environ().
+
+        with FakeBlobStorage(latency=0.005) as storage:
+            storage.add_blob("container", "blob.bin", b"content")
+            with patch.dict(os.environ, storage.environ("AzureWebJobsStorage")):
+                ...
+    """
+
+    def __init__(self, *, latency: float = 0.0, bandwidth: float = 0.0) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.containers = set()
+        self.blobs: Dict[Tuple[str, str], StoredBlob] = {}
+        self.operations = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._uncommitted: Dict[Tuple[str, str], Dict[str, bytes]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        return sum(self.operations.values())
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/{ACCOUNT_NAME}"
+
+    @property
+    def connection_string(self) -> str:
+        return (
+            f"DefaultEndpointsProtocol=http;AccountName={ACCOUNT_NAME};"
+            f"AccountKey={ACCOUNT_KEY};BlobEndpoint={self.url};"
+        )
+
+    def environ(self, connection: str = "AzureWebJobsStorage") -> Dict[str, str]:
+        return {connection: self.connection_string}
+
+    def add_blob(
+        self,
+        container: str,
+        blob: str,
+        content: bytes,
+        *,
+        content_type: str = "application/octet-stream",
+        content_encoding: Optional[str] = None,
+        blob_type: str = "BlockBlob",
+    ) -> StoredBlob:
+        """
+        Creates or replaces a blob, creating its container if needed.
+        """
+        with self._lock:
+            self.containers.add(container)
+            stored = StoredBlob(
+                bytes(content),
+                self._next_etag(),
+                content_type=content_type,
+                content_encoding=content_encoding,
+                blob_type=blob_type,
+            )
+            self.blobs[(container, blob)] = stored
+            return stored
+
+    def append_blob(self, container: str, blob: str, content: bytes) -> StoredBlob:
+        """
+        Appends to an append blob, creating the blob and its container if
+        needed.
+        """
+        with self._lock:
+            existing = self.blobs.get((container, blob))
+            if existing is None or existing.blob_type != "AppendBlob":
+                self.containers.add(container)
+                existing = StoredBlob(b"", "", blob_type="AppendBlob")
+            stored = StoredBlob(
+                existing.content + bytes(content),
+                self._next_etag(),
+                content_type=existing.content_type,
+                content_encoding=existing.content_encoding,
+                metadata=existing.metadata,
+                blob_type="AppendBlob",
+                creation_time=existing.creation_time,
+            )
+            self.blobs[(container, blob)] = stored
+            return stored
+
+    def get_blob(self, container: str, blob: str) -> bytes:
+        return self.blobs[(container, blob)].content
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.operations.clear()
+            self.bytes_sent = 0
+            self.bytes_received = 0
+
+    def _next_etag(self) -> str:
+        self._version += 1
+        return f'"0x8D{self._version:013X}"'
+
+    def __enter__(self) -> "FakeBlobStorage":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _StorageError(Exception):
+    def __init__(self, status: int, code: str) -> None:
+        super().__init__(code)
+        self.status = status
+        self.code = code
+
+
+def _make_handler(storage: FakeBlobStorage):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_HEAD(self):
+            self._handle("HEAD")
+
+        def do_PUT(self):
+            self._handle("PUT")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+        def _handle(self, method: str):
+            url = urlparse(self.path)
+            query = {name: values[0] for name, values in parse_qs(url.query).items()}
+            path = unquote(url.path).lstrip("/").split("/", 2)
+            # Read the body first, so that the connection can be reused when
+            # the request fails
+            body = self._receive_body()
+            if storage.latency:
+                time.sleep(storage.latency)
+            try:
+                if len(path) < 2 or path[0] != ACCOUNT_NAME or not path[1]:
+                    raise _StorageError(400, "InvalidUri")
+                container = path[1]
+                if len(path) == 2:
+                    self._container_request(method, container, query)
+                else:
+                    self._blob_request(method, (container, path[2]), query, body)
+            except _StorageError as error:
+                self._send_error(error)
+
+        def _count(self, operation: str):
+            with storage._lock:
+                storage.operations[operation] += 1
+
+        def _container_request(self, method: str, container: str, query: dict):
+            if method == "PUT" and query.get("restype") == "container":
+                self._count("CreateContainer")
+                with storage._lock:
+                    if container in storage.containers:
+                        raise _StorageError(409, "ContainerAlreadyExists")
+                    storage.containers.add(container)
+                self._send(201)
+            elif method == "GET" and query.get("comp") == "list":
+                self._count("ListBlobs")
+                self._list_blobs(container, query.get("prefix", ""))
+            else:
+                raise _StorageError(400, "UnsupportedHttpVerb")
+
+        def _blob_request(self, method: str, key: tuple, query: dict, body: bytes):
+            comp = query.get("comp")
+            if method in ("GET", "HEAD") and comp is None:
+                self._count("GetBlob" if method == "GET" else "GetBlobProperties")
+                self._get_blob(method, key)
+            elif method == "PUT" and comp is None:
+                self._count("PutBlob")
+                self._put_blob(key, body)
+            elif method == "PUT" and comp == "block":
+                self._count("PutBlock")
+                self._put_block(key, query.get("blockid", ""), body)
+            elif method == "PUT" and comp == "blocklist":
+                self._count("PutBlockList")
+                self._put_block_list(key, body)
+            elif method == "PUT" and comp == "appendblock":
+                self._count("AppendBlock")
+                self._append_block(key, body)
+            elif method == "DELETE" and comp is None:
+                self._count("DeleteBlob")
+                with storage._lock:
+                    self._check_conditions(self._find_blob(key))
+                    del storage.blobs[key]
+                    storage._uncommitted.pop(key, None)
+                self._send(202)
+            else:
+                raise _StorageError(400, "UnsupportedQueryParameter")
+
+        def _find_blob(self, key: tuple) -> StoredBlob:
+            if key[0] not in storage.containers:
+                raise _StorageError(404, "ContainerNotFound")
+            if key not in storage.blobs:
+                raise _StorageError(404, "BlobNotFound")
+            return storage.blobs[key]
+
+        def _check_conditions(self, blob: Optional[StoredBlob]) -> bool:
+            """
+            Applies the If-Match and If-None-Match headers. Returns False
+            when a read is not needed because the blob is not modified.
+            """
+            if_match = self.headers.get("If-Match")
+            if if_match and (blob is None or if_match not in ("*", blob.etag)):
+                raise _StorageError(412, "ConditionNotMet")
+            if_none_match = self.headers.get("If-None-Match")
+            if if_none_match and blob is not None:
+                if if_none_match == "*":
+                    raise _StorageError(409, "BlobAlreadyExists")
+                if if_none_match == blob.etag:
+                    if self.command in ("GET", "HEAD"):
+                        return False
+                    raise _StorageError(412, "ConditionNotMet")
+            return True
+
+        def _get_blob(self, method: str, key: tuple):
+            blob = self._find_blob(key)
+            if not self._check_conditions(blob):
+                self._send(304, headers={"ETag": blob.etag})
+                return
+            content = blob.content
+            headers = self._blob_headers(blob)
+            requested = self.headers.get("x-ms-range") or self.headers.get("Range")
+            if method == "HEAD" or not requested:
+                self._send(200, content, headers, head=method == "HEAD")
+                return
+            first, _, last = requested.split("=", 1)[1].partition("-")
+            start = int(first)
+            if start >= len(content):
+                raise _StorageError(416, "InvalidRange")
+            end = min(int(last), len(content) - 1) if last else len(content) - 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            self._send(206, memoryview(content)[start : end + 1], headers)
+
+        def _put_blob(self, key: tuple, body: bytes):
+            with storage._lock:
+                if key[0] not in storage.containers:
+                    raise _StorageError(404, "ContainerNotFound")
+                self._check_conditions(storage.blobs.get(key))
+                blob_type = self.headers.get("x-ms-blob-type", "BlockBlob")
+                if blob_type == "AppendBlob" and body:
+                    raise _StorageError(400, "InvalidHeaderValue")
+                blob = self._store(key, body, {}, blob_type)
+            self._send(201, headers=self._write_headers(blob))
+
+        def _put_block(self, key: tuple, block_id: str, body: bytes):
+            if not block_id:
+                raise _StorageError(400, "InvalidQueryParameterValue")
+            with storage._lock:
+                if key[0] not in storage.containers:
+                    raise _StorageError(404, "ContainerNotFound")
+                storage._uncommitted.setdefault(key, {})[block_id] = body
+            self._send(201)
+
+        def _put_block_list(self, key: tuple, body: bytes):
+            try:
+                block_list = ElementTree.fromstring(body)
+            except ElementTree.ParseError:
+                raise _StorageError(400, "InvalidXmlDocument")
+            with storage._lock:
+                if key[0] not in storage.containers:
+                    raise _StorageError(404, "ContainerNotFound")
+                existing = storage.blobs.get(key)
+                self._check_conditions(existing)
+                committed = existing.blocks if existing else {}
+                uncommitted = storage._uncommitted.get(key, {})
+                blocks = {}
+                for element in block_list:
+                    block_id = element.text or ""
+                    sources = {
+                        "Committed": (committed,),
+                        "Uncommitted": (uncommitted,),
+                        "Latest": (uncommitted, committed),
+                    }.get(element.tag, ())
+                    for source in sources:
+                        if block_id in source:
+                            blocks[block_id] = source[block_id]
+                            break
+                    else:
+                        raise _StorageError(400, "InvalidBlockList")
+                content = b"".join(blocks.values())
+                blob = self._store(key, content, blocks)
+                storage._uncommitted.pop(key, None)
+            self._send(201, headers=self._write_headers(blob))
+
+        def _append_block(self, key: tuple, body: bytes):
+            with storage._lock:
+                existing = self._find_blob(key)
+                if existing.blob_type != "AppendBlob":
+                    raise _StorageError(409, "InvalidBlobType")
+                self._check_conditions(existing)
+                position = self.headers.get("x-ms-blob-condition-appendpos")
+                if position is not None and int(position) != len(existing.content):
+                    raise _StorageError(412, "AppendPositionConditionNotMet")
+                blob = StoredBlob(
+                    existing.content + body,
+                    storage._next_etag(),
+                    content_type=existing.content_type,
+                    content_encoding=existing.content_encoding,
+                    metadata=existing.metadata,
+                    blob_type="AppendBlob",
+                    creation_time=existing.creation_time,
+                )
+                storage.blobs[key] = blob
+            headers = self._write_headers(blob)
+            headers["x-ms-blob-append-offset"] = str(len(existing.content))
+            self._send(201, headers=headers)
+
+        def _store(
+            self, key: tuple, content: bytes, blocks: dict, blob_type="BlockBlob"
+        ) -> StoredBlob:
+            metadata = {
+                name[len("x-ms-meta-") :]: value
+                for name, value in self.headers.items()
+                if name.lower().startswith("x-ms-meta-")
+            }
+            blob = StoredBlob(
+                content,
+                storage._next_etag(),
+                content_type=self.headers.get(
+                    "x-ms-blob-content-type", "application/octet-stream"
+                ),
+                content_encoding=self.headers.get("x-ms-blob-content-encoding"),
+                metadata=metadata,
+                blocks=blocks,
+                blob_type=blob_type,
+            )
+            storage.blobs[key] = blob
+            return blob
+
+        def _list_blobs(self, container: str, prefix: str):
+            if container not in storage.containers:
+                raise _StorageError(404, "ContainerNotFound")
+            entries = []
+            for (blob_container, name), blob in sorted(storage.blobs.items()):
+                if blob_container != container or not name.startswith(prefix):
+                    continue
+                entries.append(
+                    f"<Blob><Name>{escape(name)}</Name><Properties>"
+                    f"<Last-Modified>{formatdate(blob.last_modified, usegmt=True)}"
+                    f"</Last-Modified><Etag>{escape(blob.etag)}</Etag>"
+                    f"<Content-Length>{len(blob.content)}</Content-Length>"
+                    f"<Content-Type>{escape(blob.content_type)}</Content-Type>"
+                    f"<BlobType>{blob.blob_type}</BlobType></Properties></Blob>"
+                )
+            content = (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                f'<EnumerationResults ServiceEndpoint="{storage.url}/" '
+                f'ContainerName="{escape(container)}">'
+                f"<Prefix>{escape(prefix)}</Prefix><Blobs>{''.join(entries)}</Blobs>"
+                "<NextMarker /></EnumerationResults>"
+            ).encode("utf-8")
+            self._send(200, content, {"Content-Type": "application/xml"})
+
+        def _blob_headers(self, blob: StoredBlob) -> Dict[str, str]:
+            headers = {
+                "Content-Type": blob.content_type,
+                "Accept-Ranges": "bytes",
+                "x-ms-blob-type": blob.blob_type,
+                "x-ms-creation-time": formatdate(blob.creation_time, usegmt=True),
+                "x-ms-server-encrypted": "true",
+            }
+            if blob.content_encoding:
+                headers["Content-Encoding"] = blob.content_encoding
+            headers.update(self._write_headers(blob))
+            for name, value in blob.metadata.items():
+                headers[f"x-ms-meta-{name}"] = value
+            return headers
+
+        def _write_headers(self, blob: StoredBlob) -> Dict[str, str]:
+            return {
+                "ETag": blob.etag,
+                "Last-Modified": formatdate(blob.last_modified, usegmt=True),
+                "x-ms-request-server-encrypted": "true",
+            }
+
+        def _send_error(self, error: _StorageError):
+            content = (
+                '<?xml version="1.0" encoding="utf-8"?>'
+                f"<Error><Code>{error.code}</Code><Message>{error.code}</Message>"
+                "</Error>"
+            ).encode("utf-8")
+            self._send(
+                error.status,
+                content,
+                {"Content-Type": "application/xml", "x-ms-error-code": error.code},
+                head=self.command == "HEAD",
+            )
+
+        def _send(
+            self,
+            status: int,
+            content: bytes = b"",
+            headers: Optional[Dict[str, str]] = None,
+            head: bool = False,
+        ):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("x-ms-version", self.headers.get("x-ms-version", ""))
+            self.end_headers()
+            if not head and status != 304:
+                self._send_body(content)
+
+        def _send_body(self, content: bytes):
+            view = memoryview(content)
+            started = time.perf_counter()
+            for sent in range(0, len(view), TRANSFER_SLICE):
+                piece = view[sent : sent + TRANSFER_SLICE]
+                # Hold the slice back until it is fully due, so that the
+                # client can't read it before the configured rate allows
+                self._throttle(sent + len(piece), started)
+                self.wfile.write(piece)
+            with storage._lock:
+                storage.bytes_sent += len(view)
+
+        def _receive_body(self) -> bytes:
+            slices: List[bytes] = []
+            started = time.perf_counter()
+            received = 0
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                while True:
+                    size = int(self.rfile.readline().split(b";", 1)[0], 16)
+                    if size == 0:
+                        # Trailers end with an empty line
+                        while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                            pass
+                        break
+                    slices.append(self.rfile.read(size))
+                    self.rfile.readline()
+                    received += size
+                    self._throttle(received, started)
+            else:
+                remaining = int(self.headers.get("Content-Length") or 0)
+                while remaining:
+                    data = self.rfile.read(min(remaining, TRANSFER_SLICE))
+                    if not data:
+                        break
+                    slices.append(data)
+                    remaining -= len(data)
+                    received += len(data)
+                    self._throttle(received, started)
+            with storage._lock:
+                storage.bytes_received += received
+            return b"".join(slices)
+
+        def _throttle(self, transferred: int, started: float):
+            if storage.bandwidth:
+                # Sleep until the transferred bytes are due at the configured
+                # rate
+                due = transferred / storage.bandwidth
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+
+    return Handler
@@ -0,0 +1,107 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeTokenEndpoint:
+    """
+    A local Managed Identity token endpoint, speaking the protocol used by
+    App Service and Azure Functions (IDENTITY_ENDPOINT and IDENTITY_HEADER).
+
+    Every token is valid for lifetime seconds from the time given by clock.
+    requests counts the token requests served, and fail_requests makes the
+    next requests fail with a 500 response. Point ManagedIdentityCredential
+    at the endpoint by setting the variables returned by environ().
+
+        with FakeTokenEndpoint(lifetime=3600) as endpoint:
+            with patch.dict(os.environ, endpoint.environ()):
+                ...
+    """
+
+    def __init__(
+        self,
+        *,
+        lifetime: float = 3600,
+        latency: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.lifetime = lifetime
+        self.latency = latency
+        self.clock = clock
+        self.requests = 0
+        self.fail_requests = 0
+        self.secret = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/msi/token"
+
+    def environ(self) -> Dict[str, str]:
+        return {"IDENTITY_ENDPOINT": self.url, "IDENTITY_HEADER": self.secret}
+
+    def __enter__(self) -> "FakeTokenEndpoint":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _make_handler(endpoint: FakeTokenEndpoint):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if endpoint.latency:
+                time.sleep(endpoint.latency)
+            with endpoint._lock:
+                endpoint.requests += 1
+                fail = endpoint.fail_requests > 0
+                if fail:
+                    endpoint.fail_requests -= 1
+
+            url = urlparse(self.path)
+            resource = parse_qs(url.query).get("resource", [""])[0]
+            if self.headers.get("X-IDENTITY-HEADER") != endpoint.secret:
+                self._send_json(401, {"error": "invalid_identity_header"})
+            elif url.path != "/msi/token" or not resource:
+                self._send_json(400, {"error": "invalid_request"})
+            elif fail:
+                self._send_json(500, {"error": "unavailable"})
+            else:
+                self._send_json(
+                    200,
+                    {
+                        "access_token": f"token-{endpoint.requests}",
+                        "expires_on": str(int(endpoint.clock() + endpoint.lifetime)),
+                        "resource": resource,
+                        "token_type": "Bearer",
+                        "client_id": "00000000-0000-0000-0000-000000000000",
+                    },
+                )
+
+        def _send_json(self, status: int, body: dict):
+            content = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+    return Handler
@@ -0,0 +1,273 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Optional
+
+import requests
+from azure.core.pipeline.transport import AsyncHttpTransport, RequestsTransport
+from requests.adapters import HTTPAdapter
+
+from .utils import get_app_setting_int
+
+# App Settings used to configure the HTTP transport shared by every blob
+# client of the worker
+POOL_CONNECTIONS_SETTING = "PYTHON_BLOB_HTTP_POOL_CONNECTIONS"
+POOL_MAXSIZE_SETTING = "PYTHON_BLOB_HTTP_POOL_MAXSIZE"
+CONNECTION_TIMEOUT_SETTING = "PYTHON_BLOB_HTTP_CONNECTION_TIMEOUT"
+READ_TIMEOUT_SETTING = "PYTHON_BLOB_HTTP_READ_TIMEOUT"
+KEEP_ALIVE_SETTING = "PYTHON_BLOB_HTTP_KEEP_ALIVE"
+
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 64
+# The defaults of the Azure Storage Blob SDK
+DEFAULT_CONNECTION_TIMEOUT = 20
+DEFAULT_READ_TIMEOUT = 60
+DEFAULT_KEEP_ALIVE = 15
+
+
+class TransportOptions:
+    """
+    Options of the HTTP transport shared by the blob clients.
+
+    pool_connections is the number of hosts, i.e. storage accounts, whose
+    connections are kept, and pool_maxsize the number of connections kept
+    per host. It should be at least the number of requests the function app
+    sends in parallel, or connections are discarded and opened again.
+    connection_timeout and read_timeout are in seconds. keep_alive is the
+    number of seconds an idle connection is kept open by the async transport;
+    0 closes every connection after its request. The sync transport keeps
+    connections open until the service closes them, unless keep_alive is 0.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connection_timeout: int = DEFAULT_CONNECTION_TIMEOUT,
+        read_timeout: int = DEFAULT_READ_TIMEOUT,
+        keep_alive: int = DEFAULT_KEEP_ALIVE,
+    ) -> None:
+        for name, value in (
+            ("pool_connections", pool_connections),
+            ("pool_maxsize", pool_maxsize),
+            ("connection_timeout", connection_timeout),
+            ("read_timeout", read_timeout),
+        ):
+            if value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value}.")
+        if keep_alive < 0:
+            raise ValueError(
+                f"keep_alive must be a non-negative integer, got {keep_alive}."
+            )
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connection_timeout = connection_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+
+    @classmethod
+    def from_settings(cls) -> "TransportOptions":
+        """
+        Builds the options from the App Settings.
+        """
+
+        def get_option(setting: str, default: int) -> int:
+            return get_app_setting_int(setting, 0) or default
+
+        return cls(
+            pool_connections=get_option(
+                POOL_CONNECTIONS_SETTING, DEFAULT_POOL_CONNECTIONS
+            ),
+            pool_maxsize=get_option(POOL_MAXSIZE_SETTING, DEFAULT_POOL_MAXSIZE),
+            connection_timeout=get_option(
+                CONNECTION_TIMEOUT_SETTING, DEFAULT_CONNECTION_TIMEOUT
+            ),
+            read_timeout=get_option(READ_TIMEOUT_SETTING, DEFAULT_READ_TIMEOUT),
+            # 0 is a valid value, which disables keep-alive
+            keep_alive=get_app_setting_int(KEEP_ALIVE_SETTING, DEFAULT_KEEP_ALIVE),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TransportOptions):
+            return False
+        return vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"TransportOptions(pool_connections={self.pool_connections}, "
+            f"pool_maxsize={self.pool_maxsize}, "
+            f"connection_timeout={self.connection_timeout}, "
+            f"read_timeout={self.read_timeout}, "
+            f"keep_alive={self.keep_alive})"
+        )
+
+
+def create_transport(options: TransportOptions) -> RequestsTransport:
+    """
+    Returns a transport over a requests Session with a connection pool sized
+    by the options.
+
+    The transport doesn't own its session, so closing a client that uses it
+    keeps the session open for the other clients.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=options.pool_connections,
+        pool_maxsize=options.pool_maxsize,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not options.keep_alive:
+        session.headers["Connection"] = "close"
+    return RequestsTransport(
+        session=session,
+        session_owner=False,
+        connection_timeout=options.connection_timeout,
+        read_timeout=options.read_timeout,
+    )
+
+
+class SharedAsyncTransport(AsyncHttpTransport):
+    """
+    An aiohttp transport shared by the async blob clients of an event loop.
+
+    An aiohttp session must be created on the event loop it is used on, so
+    the session is created on the first request. Closing a client that uses
+    the transport does nothing; aclose() closes the session.
+    """
+
+    def __init__(self, options: TransportOptions) -> None:
+        self._options = options
+        self._transport: Optional[Any] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _get_transport(self) -> Any:
+        if self._transport is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._transport is None:
+                    self._transport = await self._create_transport()
+        return self._transport
+
+    async def _create_transport(self) -> Any:
+        import aiohttp
+        from azure.core.pipeline.transport import AioHttpTransport
+
+        options = self._options
+        connector = aiohttp.TCPConnector(
+            limit=options.pool_connections * options.pool_maxsize,
+            limit_per_host=options.pool_maxsize,
+            keepalive_timeout=options.keep_alive or None,
+            force_close=not options.keep_alive,
+        )
+        session = aiohttp.ClientSession(connector=connector, trust_env=True)
+        transport = AioHttpTransport(
+            session=session,
+            session_owner=False,
+            connection_timeout=options.connection_timeout,
+            read_timeout=options.read_timeout,
+        )
+        await transport.open()
+        return transport
+
+    async def send(self, request, **kwargs):
+        transport = await self._get_transport()
+        return await transport.send(request, **kwargs)
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def aclose(self) -> None:
+        """
+        Closes the aiohttp session of the transport.
+        """
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            await transport.session.close()
+
+
+_options: Optional[TransportOptions] = None
+_transport: Optional[RequestsTransport] = None
+_async_transports: "weakref.WeakKeyDictionary[Any, SharedAsyncTransport]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def get_transport_options() -> TransportOptions:
+    global _options
+    if _options is None:
+        _options = TransportOptions.from_settings()
+    return _options
+
+
+def get_transport() -> RequestsTransport:
+    """
+    Returns the transport shared by every sync blob client of the worker,
+    creating it on first use.
+    """
+    global _transport
+    if _transport is None:
+        with _lock:
+            if _transport is None:
+                _transport = create_transport(get_transport_options())
+    return _transport
+
+
+def get_async_transport() -> SharedAsyncTransport:
+    """
+    Returns the transport shared by every async blob client of the running
+    event loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Without a running loop, e.g. when a client is created outside of
+        # the function, the client gets its own transport
+        return SharedAsyncTransport(get_transport_options())
+    with _lock:
+        transport = _async_transports.get(loop)
+        if transport is None:
+            transport = SharedAsyncTransport(get_transport_options())
+            _async_transports[loop] = transport
+        return transport
+
+
+def close_transports() -> None:
+    """
+    Closes the shared transports and forgets their options, so that they are
+    created again from the App Settings on next use.
+    """
+    global _options, _transport
+    with _lock:
+        transport, _transport = _transport, None
+        async_transports = list(_async_transports.items())
+        _async_transports.clear()
+        _options = None
+    if transport is not None:
+        transport.session.close()
+    for loop, async_transport in async_transports:
+        if loop.is_closed():
+            continue
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.create_task(async_transport.aclose())
+        elif not loop.is_running():
+            loop.run_until_complete(async_transport.aclose())
@@ -0,0 +1,86 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+from typing import Any, Mapping, Optional
+
+from .utils import get_app_setting_int
+
+# App Settings used as the defaults for every BlobWriter binding
+BLOCK_SIZE_SETTING = "PYTHON_BLOB_UPLOAD_BLOCK_SIZE"
+MAX_CONCURRENCY_SETTING = "PYTHON_BLOB_UPLOAD_MAX_CONCURRENCY"
+
+# model_binding_data content fields that override the App Settings for a
+# single binding
+BLOCK_SIZE_PROPERTY = "MaxBlockSize"
+MAX_CONCURRENCY_PROPERTY = "MaxUploadConcurrency"
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+# Limits of the Put Block operation
+MAX_BLOCK_SIZE = 4000 * 1024 * 1024
+MAX_BLOCK_COUNT = 50000
+
+
+class UploadOptions:
+    """
+    Options for block uploads of a blob.
+
+    block_size is the size of every staged block, and max_concurrency is the
+    number of blocks staged in parallel. At most block_size bytes are
+    buffered for every block in flight, plus the block being filled.
+    """
+
+    def __init__(
+        self,
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        if not 1 <= block_size <= MAX_BLOCK_SIZE:
+            raise ValueError(
+                f"block_size must be between 1 and {MAX_BLOCK_SIZE}, got {block_size}."
+            )
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be a positive integer, got {max_concurrency}."
+            )
+        self.block_size = block_size
+        self.max_concurrency = max_concurrency
+
+    @classmethod
+    def from_binding(cls, content: Mapping[str, Any]) -> "UploadOptions":
+        """
+        Builds the options of a binding. Values in the model_binding_data
+        content take precedence over the App Settings.
+        """
+
+        def get_option(prop: str, setting: str, default: int) -> int:
+            value: Optional[Any] = content.get(prop)
+            if value is None:
+                value = get_app_setting_int(setting, 0) or default
+            return int(value)
+
+        return cls(
+            block_size=get_option(
+                BLOCK_SIZE_PROPERTY, BLOCK_SIZE_SETTING, DEFAULT_BLOCK_SIZE
+            ),
+            max_concurrency=get_option(
+                MAX_CONCURRENCY_PROPERTY,
+                MAX_CONCURRENCY_SETTING,
+                DEFAULT_MAX_CONCURRENCY,
+            ),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, UploadOptions):
+            return False
+        return (
+            self.block_size == other.block_size
+            and self.max_concurrency == other.max_concurrency
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"UploadOptions(block_size={self.block_size}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
@@ -47,3 +47,25 @@ def using_managed_identity(connection_name: str) -> bool:
     return (os.getenv(connection_name + "__serviceUri") is not None) or (
         os.getenv(connection_name + "__blobServiceUri") is not None
     )
+
+
+def get_app_setting_int(setting: str, default: int) -> int:
+    """
+    Returns the integer value of an App Setting, or the default if the
+    setting is not defined. An error is thrown if the setting is defined
+    but is not a valid non-negative integer.
+    """
+    value = os.getenv(setting)
+    if value is None or value == "":
+        return default
+    try:
+        result = int(value)
+    except ValueError:
+        raise ValueError(
+            f"App Setting {setting} must be an integer, but was {value!r}."
+        ) from None
+    if result < 0:
+        raise ValueError(
+            f"App Setting {setting} must not be negative, but was {value!r}."
+        )
+    return result
@@ -0,0 +1,111 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+"""
+Measures the time of a blob triggered invocation, split into the decode of
+the binding by BlobClientConverter, the download of the blob and its
+processing, for each SDK type.
+
+Every download is served by FakeBlobStorage with the given latency and
+bandwidth, so the results are repeatable and need no storage account.
+
+Usage:
+    python benchmarks/decode_download.py [--size-kb 1024] [--latency-ms 5]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import time
+
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClient,
+    BlobClientConverter,
+    StorageStreamDownloader,
+)
+from azurefunctions.extensions.bindings.blob.clientPool import close_client_pool
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+
+KB = 1024
+MB = 1024 * 1024
+
+
+class ModelBindingData:
+    def __init__(self, content: dict):
+        self.version = "1.0"
+        self.source = "AzureStorageBlobs"
+        self.content_type = "application/json"
+        self.content = json.dumps(content)
+
+
+DATUM = Datum(
+    value=ModelBindingData(
+        {
+            "Connection": "BenchmarkStorage",
+            "ContainerName": "bench",
+            "BlobName": "input.bin",
+        }
+    ),
+    type="model_binding_data",
+)
+
+
+def download(pytype, value) -> bytes:
+    if pytype is BlobClient:
+        return value.download_blob().readall()
+    return value.readall()
+
+
+def invoke(pytype):
+    started = time.perf_counter()
+    value = BlobClientConverter.decode(data=DATUM, trigger_metadata=None, pytype=pytype)
+    decoded = time.perf_counter()
+    content = download(pytype, value)
+    downloaded = time.perf_counter()
+    hashlib.sha256(content).digest()
+    processed = time.perf_counter()
+    return decoded - started, downloaded - decoded, processed - downloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--bandwidth-mb", type=float, default=0)
+    parser.add_argument("--invocations", type=int, default=50)
+    args = parser.parse_args()
+
+    with FakeBlobStorage(
+        latency=args.latency_ms / 1000, bandwidth=args.bandwidth_mb * MB
+    ) as storage:
+        storage.add_blob("bench", "input.bin", os.urandom(args.size_kb * KB))
+        os.environ.update(storage.environ("BenchmarkStorage"))
+
+        print(
+            f"{args.size_kb} KB blob, {args.latency_ms} ms latency, "
+            f"{args.invocations} invocations, median ms"
+        )
+        print(f"{'sdk type':>24} {'decode':>8} {'download':>9} {'process':>8}")
+        for pytype in (BlobClient, StorageStreamDownloader):
+            # The first invocation creates the shared client
+            invoke(pytype)
+            storage.reset_counters()
+            timings = [invoke(pytype) for _ in range(args.invocations)]
+            decode, download_time, process = (
+                statistics.median(column) * 1000 for column in zip(*timings)
+            )
+            print(
+                f"{pytype.__name__:>24} {decode:>8.3f} {download_time:>9.3f} "
+                f"{process:>8.3f}"
+            )
+            print(
+                f"{'':>24} {storage.requests / args.invocations:.1f} "
+                f"requests per invocation"
+            )
+        close_client_pool()
+
+
+if __name__ == "__main__":
+    main()
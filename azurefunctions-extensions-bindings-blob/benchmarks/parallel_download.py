@@ -0,0 +1,82 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+"""
+Measures StorageStreamDownloader throughput with parallel ranged downloads.
+
+Each connection to the local stand-in server is limited to the same
+bandwidth, so throughput should grow with max_concurrency until the number
+of ranges runs out.
+
+Usage:
+    python benchmarks/parallel_download.py [--size-mb 64] [--bandwidth-mb 16]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from azurefunctions.extensions.bindings.blob import StorageStreamDownloader
+from azurefunctions.extensions.bindings.blob.clientPool import close_client_pool
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+
+MB = 1024 * 1024
+
+
+class ModelBindingData:
+    def __init__(self, content: dict):
+        self.version = "1.0"
+        self.source = "AzureStorageBlobs"
+        self.content_type = "application/json"
+        self.content = json.dumps(content)
+
+
+def download(concurrency: int, chunk_size: int) -> float:
+    data = ModelBindingData(
+        {
+            "Connection": "BenchmarkStorage",
+            "ContainerName": "bench",
+            "BlobName": "large.bin",
+            "MaxConcurrency": concurrency,
+            "MaxChunkGetSize": chunk_size,
+            "MaxSingleGetSize": chunk_size,
+        }
+    )
+    started = time.perf_counter()
+    stream = StorageStreamDownloader(data=data).get_sdk_type()
+    size = len(stream.readall())
+    elapsed = time.perf_counter() - started
+    return size / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--chunk-mb", type=int, default=4)
+    parser.add_argument("--bandwidth-mb", type=float, default=16)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    with FakeBlobStorage(
+        latency=args.latency_ms / 1000, bandwidth=args.bandwidth_mb * MB
+    ) as storage:
+        storage.add_blob("bench", "large.bin", os.urandom(args.size_mb * MB))
+        os.environ["BenchmarkStorage"] = storage.connection_string
+
+        print(
+            f"{args.size_mb} MB blob, {args.chunk_mb} MB ranges, "
+            f"{args.bandwidth_mb} MB/s per connection"
+        )
+        print(f"{'max_concurrency':>16} {'MB/s':>10} {'speedup':>8}")
+        baseline = None
+        for concurrency in (1, 2, 4, 8):
+            throughput = download(concurrency, args.chunk_mb * MB) / MB
+            baseline = baseline or throughput
+            print(
+                f"{concurrency:>16} {throughput:>10.1f} {throughput / baseline:>7.1f}x"
+            )
+        close_client_pool()
+
+
+if __name__ == "__main__":
+    main()
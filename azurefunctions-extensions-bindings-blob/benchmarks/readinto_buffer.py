@@ -0,0 +1,128 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+"""
+Compares reading a blob into a typed buffer through chunks() with reading it
+through readinto() on a caller-provided buffer.
+
+The chunks() path is the one used in blob_samples_storagestreamdownloader:
+the chunks are joined into a single bytes object, which is then viewed as an
+array. The readinto() path fills a preallocated array in place. Each path
+runs in its own process so that its peak RSS can be measured.
+
+Usage:
+    python benchmarks/readinto_buffer.py [--size-mb 128]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+
+MB = 1024 * 1024
+
+
+class ModelBindingData:
+    def __init__(self, content: dict):
+        self.version = "1.0"
+        self.source = "AzureStorageBlobs"
+        self.content_type = "application/json"
+        self.content = json.dumps(content)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (MB if sys.platform == "darwin" else 1024)
+
+
+def run(mode: str) -> None:
+    from azurefunctions.extensions.bindings.blob import StorageStreamDownloader
+
+    data = ModelBindingData(
+        {
+            "Connection": "BenchmarkStorage",
+            "ContainerName": "bench",
+            "BlobName": "values.bin",
+        }
+    )
+    stream = StorageStreamDownloader(data=data).get_sdk_type()
+    baseline = peak_rss_mb()
+
+    started = time.perf_counter()
+    size = stream.size
+    if mode == "chunks":
+        content = b"".join(stream.chunks())
+        values = memoryview(content).cast("d")
+    else:
+        buffer = bytearray(size)
+        stream.readinto(buffer)
+        values = memoryview(buffer).cast("d")
+    elapsed = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "throughput": size / elapsed / MB,
+                "peak_rss": peak_rss_mb() - baseline,
+                "count": len(values),
+            }
+        )
+    )
+
+
+def serve(size: int, connection_strings, stop) -> None:
+    # The server runs in its own process, so the blob it holds in memory does
+    # not count towards the peak RSS of the processes that download it.
+    with FakeBlobStorage() as storage:
+        storage.add_blob("bench", "values.bin", os.urandom(size))
+        connection_strings.put(storage.connection_string)
+        stop.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--mode", choices=("chunks", "readinto"))
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    connection_strings, stop = context.Queue(), context.Event()
+    server = context.Process(
+        target=serve, args=(args.size_mb * MB, connection_strings, stop)
+    )
+    server.start()
+    try:
+        env = dict(os.environ, BenchmarkStorage=connection_strings.get())
+
+        print(f"{args.size_mb} MB blob of float64 values")
+        print(f"{'path':>10} {'MB/s':>10} {'peak RSS growth (MB)':>22}")
+        for mode in ("chunks", "readinto"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode],
+                env=env,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{mode:>10} {result['throughput']:>10.1f} "
+                f"{result['peak_rss']:>22.1f}"
+            )
+    finally:
+        stop.set()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
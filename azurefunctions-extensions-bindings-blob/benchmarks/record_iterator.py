@@ -0,0 +1,131 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+"""
+Compares iterating over the records of an NDJSON or CSV blob line by line in
+Python with the batches of RecordBlob.
+
+The line by line path is the usual one in a function: the chunks of a
+StorageStreamDownloader are split into lines, keeping the partial line of
+each chunk, and every line is parsed on its own. RecordBlob parses a batch
+of lines at once, or whole blocks with pyarrow for arrow and numpy batches.
+
+Usage:
+    python benchmarks/record_iterator.py [--records 200000] [--format ndjson]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import time
+
+from azurefunctions.extensions.bindings.blob import RecordBlob, StorageStreamDownloader
+from azurefunctions.extensions.bindings.blob.clientPool import close_client_pool
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+
+MB = 1024 * 1024
+
+
+class ModelBindingData:
+    def __init__(self, content: dict):
+        self.version = "1.0"
+        self.source = "AzureStorageBlobs"
+        self.content_type = "application/json"
+        self.content = json.dumps(content)
+
+
+def create_content(records: int, format: str) -> bytes:
+    rows = (
+        {"id": i, "user": f"user-{i % 997}", "amount": i * 0.25, "ok": i % 2 == 0}
+        for i in range(records)
+    )
+    if format == "ndjson":
+        return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+    text = io.StringIO(newline="")
+    writer = csv.DictWriter(text, ["id", "user", "amount", "ok"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return text.getvalue().encode()
+
+
+def data(blob: str, batch_size: int) -> ModelBindingData:
+    return ModelBindingData(
+        {
+            "Connection": "BenchmarkStorage",
+            "ContainerName": "bench",
+            "BlobName": blob,
+            "RecordBatchSize": batch_size,
+        }
+    )
+
+
+def per_line(blob: str, batch_size: int) -> int:
+    stream = StorageStreamDownloader(data=data(blob, batch_size)).get_sdk_type()
+    if blob.endswith(".csv"):
+        text = io.TextIOWrapper(io.BytesIO(stream.readall()), newline="")
+        return sum(1 for _ in csv.DictReader(text))
+    count = 0
+    partial = b""
+    for chunk in stream.chunks():
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                json.loads(line)
+                count += 1
+    if partial.strip():
+        json.loads(partial)
+        count += 1
+    return count
+
+
+def dict_batches(blob: str, batch_size: int) -> int:
+    with RecordBlob(data=data(blob, batch_size)).get_sdk_type() as reader:
+        return sum(len(batch) for batch in reader.batches())
+
+
+def arrow_batches(blob: str, batch_size: int) -> int:
+    with RecordBlob(data=data(blob, batch_size)).get_sdk_type() as reader:
+        return sum(batch.num_rows for batch in reader.arrow_batches())
+
+
+def numpy_batches(blob: str, batch_size: int) -> int:
+    with RecordBlob(data=data(blob, batch_size)).get_sdk_type() as reader:
+        return sum(len(batch["id"]) for batch in reader.numpy_batches())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content = create_content(args.records, args.format)
+    blob = "records.jsonl" if args.format == "ndjson" else "records.csv"
+    with FakeBlobStorage(latency=args.latency_ms / 1000) as storage:
+        storage.add_blob("bench", blob, content)
+        os.environ.update(storage.environ("BenchmarkStorage"))
+
+        print(
+            f"{args.records} {args.format} records, {len(content) / MB:.1f} MB, "
+            f"batches of {args.batch_size}, best of {args.repeat}"
+        )
+        print(f"{'path':>14} {'seconds':>8} {'records/s':>11}")
+        for read in (per_line, dict_batches, arrow_batches, numpy_batches):
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                count = read(blob, args.batch_size)
+                timings.append(time.perf_counter() - started)
+                assert count == args.records, count
+            best = min(timings)
+            print(f"{read.__name__:>14} {best:>8.3f} " f"{args.records / best:>11,.0f}")
+        close_client_pool()
+
+
+if __name__ == "__main__":
+    main()
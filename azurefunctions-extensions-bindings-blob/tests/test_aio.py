@@ -0,0 +1,104 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from azure.storage.blob.aio import BlobClient as AsyncBlobClientSdk
+from azure.storage.blob.aio import ContainerClient as AsyncContainerClientSdk
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import BlobClientConverter, aio
+from tests.utils import make_datum
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=fakeaccount;"
+    "AccountKey=ZmFrZWtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+def get_datum(connection="FakeStorage"):
+    return make_datum("text.txt", connection=connection)
+
+
+@patch.dict(
+    os.environ,
+    {
+        "FakeStorage": CONNECTION_STRING,
+        "FakeIdentity__serviceUri": "https://fakeaccount.blob.core.windows.net",
+    },
+)
+class TestAsyncSdkTypes(unittest.TestCase):
+    def test_input_type(self):
+        check_input_type = BlobClientConverter.check_input_type_annotation
+        self.assertTrue(check_input_type(aio.BlobClient))
+        self.assertTrue(check_input_type(aio.ContainerClient))
+        self.assertTrue(check_input_type(aio.StorageStreamDownloader))
+
+    def test_input_empty(self):
+        datum: Datum = Datum(value={}, type="model_binding_data")
+        for pytype in (
+            aio.BlobClient,
+            aio.ContainerClient,
+            aio.StorageStreamDownloader,
+        ):
+            result = BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=pytype
+            )
+            self.assertIsNone(result)
+
+    def test_blob_client(self):
+        result = BlobClientConverter.decode(
+            data=get_datum(), trigger_metadata=None, pytype=aio.BlobClient
+        )
+        self.assertIsInstance(result, AsyncBlobClientSdk)
+        self.assertEqual(result.container_name, "test-blob")
+        self.assertEqual(result.blob_name, "text.txt")
+
+    def test_container_client(self):
+        result = BlobClientConverter.decode(
+            data=get_datum(), trigger_metadata=None, pytype=aio.ContainerClient
+        )
+        self.assertIsInstance(result, AsyncContainerClientSdk)
+        self.assertEqual(result.container_name, "test-blob")
+
+    def test_managed_identity(self):
+        result = BlobClientConverter.decode(
+            data=get_datum("FakeIdentity"),
+            trigger_metadata=None,
+            pytype=aio.BlobClient,
+        )
+        self.assertIsInstance(result, AsyncBlobClientSdk)
+        self.assertEqual(result.account_name, "fakeaccount")
+
+    def test_storage_stream_downloader_is_lazy(self):
+        result = BlobClientConverter.decode(
+            data=get_datum(),
+            trigger_metadata=None,
+            pytype=aio.StorageStreamDownloader,
+        )
+        # The download has not started, the function awaits it
+        self.assertIsInstance(result, aio.LazyStorageStreamDownloader)
+        self.assertFalse(result.started)
+        self.assertIsInstance(result.blob_client, AsyncBlobClientSdk)
+
+    def test_clients_shared_per_event_loop(self):
+        async def decode():
+            return BlobClientConverter.decode(
+                data=get_datum(), trigger_metadata=None, pytype=aio.BlobClient
+            )
+
+        async def decode_twice():
+            return await decode(), await decode()
+
+        first, second = asyncio.run(decode_twice())
+        self.assertIs(
+            first._pipeline._transport._transport,
+            second._pipeline._transport._transport,
+        )
+
+        third = asyncio.run(decode())
+        self.assertIsNot(
+            first._pipeline._transport._transport, third._pipeline._transport._transport
+        )
@@ -0,0 +1,94 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from azurefunctions.extensions.bindings.blob.bindingContent import BindingContentCache
+
+CONTENT = json.dumps(
+    {
+        "Connection": "FakeStorage",
+        "ContainerName": "test-blob",
+        "BlobName": "text.txt",
+        "MaxConcurrency": 4,
+    }
+)
+
+
+class TestBindingContentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = BindingContentCache(max_size=2)
+
+    @patch.dict(os.environ, {"FakeStorage": "connection-string"})
+    def test_parsed_once(self):
+        with patch("json.loads", wraps=json.loads) as loads:
+            first = self.cache.get(CONTENT)
+            second = self.cache.get(CONTENT.encode("utf-8"))
+            third = self.cache.get(CONTENT)
+
+        self.assertEqual(loads.call_count, 2)
+        self.assertIs(first.content, third.content)
+        self.assertEqual(first, second)
+        self.assertEqual(first.connection, "connection-string")
+        self.assertFalse(first.using_managed_identity)
+        self.assertEqual(first.container_name, "test-blob")
+        self.assertEqual(first.blob_name, "text.txt")
+        self.assertEqual(first.content["MaxConcurrency"], 4)
+
+    @patch.dict(os.environ, {"FakeStorage": "connection-string"})
+    def test_content_is_read_only(self):
+        binding = self.cache.get(CONTENT)
+        with self.assertRaises(TypeError):
+            binding.content["BlobName"] = "other.txt"
+
+    @patch.dict(os.environ, {"FakeStorage": "connection-string"})
+    def test_connection_resolved_once(self):
+        module = "azurefunctions.extensions.bindings.blob.bindingContent"
+        with patch(f"{module}.using_managed_identity", return_value=False) as mi:
+            for _ in range(5):
+                self.cache.get(CONTENT)
+        mi.assert_called_once_with("FakeStorage")
+
+    def test_invalidated_when_app_settings_change(self):
+        with patch.dict(os.environ, {"FakeStorage": "first"}):
+            self.assertEqual(self.cache.get(CONTENT).connection, "first")
+        with patch.dict(os.environ, {"FakeStorage": "second"}):
+            self.assertEqual(self.cache.get(CONTENT).connection, "second")
+        with patch.dict(
+            os.environ, {"FakeStorage__serviceUri": "https://fake.blob.core"}
+        ):
+            binding = self.cache.get(CONTENT)
+            self.assertEqual(binding.connection, "https://fake.blob.core")
+            self.assertTrue(binding.using_managed_identity)
+        with self.assertRaises(ValueError):
+            self.cache.get(CONTENT)
+
+    def test_invalidated_when_identity_changes(self):
+        service_uri = {"FakeStorage__serviceUri": "https://fake.blob.core"}
+        with patch.dict(os.environ, {**service_uri, "FakeStorage__clientId": "a"}):
+            first = self.cache.get(CONTENT)
+        with patch.dict(os.environ, {**service_uri, "FakeStorage__clientId": "b"}):
+            second = self.cache.get(CONTENT)
+        with patch.dict(
+            os.environ,
+            {**service_uri, "FakeStorage__managedIdentityResourceId": "/identity"},
+        ):
+            third = self.cache.get(CONTENT)
+
+        self.assertEqual(first.managed_identity.client_id, "a")
+        self.assertEqual(second.managed_identity.client_id, "b")
+        self.assertIsNone(third.managed_identity.client_id)
+        self.assertEqual(third.managed_identity.resource_id, "/identity")
+
+    def test_missing_connection(self):
+        with self.assertRaises(ValueError):
+            self.cache.get(json.dumps({"ContainerName": "test-blob"}))
+
+    @patch.dict(os.environ, {"FakeStorage": "connection-string"})
+    def test_bounded(self):
+        for name in ("a", "b", "c"):
+            self.cache.get(json.dumps({"Connection": "FakeStorage", "BlobName": name}))
+        self.assertEqual(len(self.cache), 2)
@@ -0,0 +1,244 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobCache,
+    BlobClientConverter,
+    CachedBlob,
+    CachedBlobFile,
+    blobCache,
+)
+from tests.utils import MockMBD
+
+
+class FakeBlob:
+    """
+    A blob client that answers conditional downloads like the service.
+    """
+
+    def __init__(self, name: str, content: bytes, etag: str = '"0x1"'):
+        self.scheme = "https"
+        self.primary_hostname = "fakeaccount.blob.core.windows.net"
+        self.account_name = "fakeaccount"
+        self.container_name = "test-blob"
+        self.blob_name = name
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def download_blob(self, **kwargs):
+        self.requests.append(kwargs)
+        if (
+            kwargs.get("match_condition") == MatchConditions.IfModified
+            and kwargs.get("etag") == self.etag
+        ):
+            error = HttpResponseError("The condition specified was not met.")
+            error.status_code = 304
+            raise error
+
+        def readinto(stream):
+            stream.write(self.content)
+            return len(self.content)
+
+        downloader = MagicMock()
+        downloader.size = len(self.content)
+        downloader.properties.etag = self.etag
+        downloader.readinto.side_effect = readinto
+        return downloader
+
+
+class TestBlobCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = BlobCache(self.directory.name, max_size=100)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_miss_then_hit(self):
+        blob = FakeBlob("model.bin", b"weights")
+
+        with self.cache.open(blob) as first:
+            self.assertFalse(first.from_cache)
+            self.assertEqual(first.readall(), b"weights")
+        with self.cache.open(blob) as second:
+            self.assertTrue(second.from_cache)
+            self.assertEqual(second.read(), b"weights")
+            self.assertEqual(second.etag, '"0x1"')
+            self.assertEqual(len(second), 7)
+
+        self.assertEqual(blob.requests[0], {})
+        self.assertEqual(
+            blob.requests[1],
+            {"etag": '"0x1"', "match_condition": MatchConditions.IfModified},
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_modified_blob_replaces_entry(self):
+        blob = FakeBlob("model.bin", b"old")
+        self.cache.open(blob).close()
+
+        blob.content, blob.etag = b"new content", '"0x2"'
+        with self.cache.open(blob) as modified:
+            self.assertFalse(modified.from_cache)
+            self.assertEqual(modified.read(), b"new content")
+        with self.cache.open(blob) as cached:
+            self.assertTrue(cached.from_cache)
+            self.assertEqual(cached.read(), b"new content")
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 11)
+
+    def test_concurrent_statistics(self):
+        blob = FakeBlob("model.bin", b"weights")
+        self.cache.open(blob).close()
+
+        def read():
+            for _ in range(50):
+                self.cache.open(blob).close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(8):
+                executor.submit(read)
+        self.assertEqual((self.cache.hits, self.cache.misses), (400, 1))
+
+    def test_errors_are_raised(self):
+        blob = FakeBlob("model.bin", b"weights")
+        self.cache.open(blob).close()
+
+        blob.download_blob = MagicMock(side_effect=ResourceNotFoundError("gone"))
+        with self.assertRaises(ResourceNotFoundError):
+            self.cache.open(blob)
+
+    def test_lru_eviction(self):
+        blobs = [FakeBlob(f"blob{i}", bytes([i]) * 40) for i in range(3)]
+        self.cache.open(blobs[0]).close()
+        self.cache.open(blobs[1]).close()
+        # Using blob0 makes blob1 the least recently used entry
+        self.assertTrue(self.cache.open(blobs[0]).from_cache)
+        self.cache.open(blobs[2]).close()
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.size, 80)
+        self.assertTrue(self.cache.open(blobs[0]).from_cache)
+        self.assertFalse(self.cache.open(blobs[1]).from_cache)
+
+    def test_large_blob_is_not_cached(self):
+        blob = FakeBlob("large.bin", b"x" * 101)
+
+        with self.cache.open(blob) as file:
+            self.assertEqual(file.read(), b"x" * 101)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_index_survives_restart(self):
+        blob = FakeBlob("model.bin", b"weights")
+        self.cache.open(blob).close()
+        # Leftover from an interrupted download
+        open(os.path.join(self.directory.name, ".tmp-partial"), "wb").close()
+
+        restarted = BlobCache(self.directory.name, max_size=100)
+        self.assertEqual(len(restarted), 1)
+        self.assertTrue(restarted.open(blob).from_cache)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory.name, ".tmp-partial"))
+        )
+
+    def test_keyed_by_account(self):
+        blob = FakeBlob("model.bin", b"weights")
+        other = FakeBlob("model.bin", b"weights")
+        other.account_name = "otheraccount"
+        self.cache.open(blob).close()
+
+        self.assertFalse(self.cache.open(other).from_cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_clear(self):
+        self.cache.open(FakeBlob("model.bin", b"weights")).close()
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class TestProcessWideCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.environ = {blobCache.CACHE_DIRECTORY_SETTING: directory.name}
+        patcher = patch.object(blobCache, "_cache", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_zero_size_is_default(self):
+        with patch.dict(
+            os.environ, {**self.environ, blobCache.CACHE_MAX_SIZE_SETTING: "0"}
+        ):
+            cache = blobCache.get_blob_cache()
+        self.assertEqual(cache.max_size, blobCache.DEFAULT_CACHE_MAX_SIZE)
+        self.assertIs(blobCache.get_blob_cache(), cache)
+
+    def test_negative_size(self):
+        with patch.dict(
+            os.environ, {**self.environ, blobCache.CACHE_MAX_SIZE_SETTING: "-1"}
+        ):
+            with self.assertRaisesRegex(ValueError, blobCache.CACHE_MAX_SIZE_SETTING):
+                blobCache.get_blob_cache()
+
+
+class TestCachedBlob(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.datum = Datum(
+            value=MockMBD(
+                {
+                    "Connection": "FakeStorage",
+                    "ContainerName": "test-blob",
+                    "BlobName": "model.bin",
+                }
+            ),
+            type="model_binding_data",
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(CachedBlob))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        result = BlobClientConverter.decode(
+            data=datum, trigger_metadata=None, pytype=CachedBlob
+        )
+        self.assertIsNone(result)
+
+    @patch.dict(os.environ, {"FakeStorage": "fake"})
+    def test_input_populated(self):
+        blob = FakeBlob("model.bin", b"weights")
+        service_client = MagicMock()
+        service_client.get_blob_client.return_value = blob
+        cache = BlobCache(self.directory.name)
+
+        module = "azurefunctions.extensions.bindings.blob.cachedBlob"
+        with patch(f"{module}.get_blob_service_client", return_value=service_client):
+            with patch(f"{module}.get_blob_cache", return_value=cache):
+                results = [
+                    BlobClientConverter.decode(
+                        data=self.datum, trigger_metadata=None, pytype=CachedBlob
+                    )
+                    for _ in range(2)
+                ]
+
+        self.assertIsInstance(results[0], CachedBlobFile)
+        self.assertEqual([r.from_cache for r in results], [False, True])
+        self.assertEqual([r.read() for r in results], [b"weights", b"weights"])
+        for result in results:
+            result.close()
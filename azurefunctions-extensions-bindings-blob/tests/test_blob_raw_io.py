@@ -0,0 +1,161 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+import os
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from azure.core.exceptions import ResourceModifiedError
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    BlobRawIO,
+    SeekableBlob,
+)
+from azurefunctions.extensions.bindings.blob.clientPool import (
+    create_blob_service_client,
+)
+from azurefunctions.extensions.bindings.blob.seekableOptions import (
+    BLOCK_SIZE_SETTING,
+    SeekableOptions,
+)
+from tests.utils import decode_blob, start_fake_storage
+
+
+class TestSeekableOptions(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SeekableOptions(block_size=0)
+        with self.assertRaises(ValueError):
+            SeekableOptions(block_size=1024, cache_size=100)
+
+    @patch.dict(os.environ, {BLOCK_SIZE_SETTING: "1024"})
+    def test_from_binding(self):
+        self.assertEqual(
+            SeekableOptions.from_binding({"SeekableCacheSize": 4096}),
+            SeekableOptions(block_size=1024, cache_size=4096),
+        )
+        self.assertEqual(
+            SeekableOptions(block_size=1024, cache_size=4096).cache_blocks, 4
+        )
+
+
+class TestBlobRawIO(unittest.TestCase):
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+        self.content = os.urandom(10000)
+        self.storage.add_blob("test-blob", "data.bin", self.content)
+        self.service_client = create_blob_service_client(
+            self.storage.connection_string, False
+        )
+
+    def open(self, name="data.bin", block_size=1000, cache_size=4000):
+        return BlobRawIO(
+            self.service_client.get_blob_client("test-blob", name),
+            SeekableOptions(block_size=block_size, cache_size=cache_size),
+        )
+
+    def test_file_semantics(self):
+        expected = io.BytesIO(self.content)
+        with self.open() as raw:
+            for offset, whence, size in (
+                (0, io.SEEK_SET, 10),
+                (2500, io.SEEK_SET, 1200),
+                (-20, io.SEEK_END, 100),
+                (-5000, io.SEEK_CUR, 3),
+                (20000, io.SEEK_SET, 10),
+            ):
+                self.assertEqual(
+                    raw.seek(offset, whence), expected.seek(offset, whence)
+                )
+                self.assertEqual(raw.read(size), expected.read(size))
+                self.assertEqual(raw.tell(), expected.tell())
+            raw.seek(9000)
+            self.assertEqual(raw.read(), self.content[9000:])
+            self.assertTrue(raw.seekable())
+        with self.assertRaises(ValueError):
+            raw.read(1)
+
+    def test_adjacent_blocks_are_one_request(self):
+        raw = self.open()
+        raw.seek(1500)
+        self.assertEqual(raw.read(2000), self.content[1500:3500])
+        # One HEAD for the properties and one GET for blocks 1 to 3
+        self.assertEqual(self.storage.operations["GetBlobProperties"], 1)
+        self.assertEqual(self.storage.operations["GetBlob"], 1)
+        self.assertEqual(raw.bytes_downloaded, 3000)
+
+        raw.seek(1200)
+        self.assertEqual(raw.read(2000), self.content[1200:3200])
+        self.assertEqual(self.storage.operations["GetBlob"], 1)
+        self.assertEqual(raw.hits, 3)
+
+        # Blocks 0 and 4 are missing, on each side of the cached blocks
+        raw.seek(0)
+        self.assertEqual(raw.read(5000), self.content[:5000])
+        self.assertEqual(self.storage.operations["GetBlob"], 3)
+
+    def test_cache_is_bounded(self):
+        raw = self.open(cache_size=3000)
+        self.assertEqual(raw.readall(), self.content)
+        self.assertEqual(len(raw._blocks), 3)
+        self.assertEqual(sorted(raw._blocks), [7, 8, 9])
+
+        raw.seek(0)
+        raw.read(1000)
+        self.assertEqual(sorted(raw._blocks), [0, 8, 9])
+
+    def test_read_at(self):
+        raw = self.open()
+        buffer = bytearray(100)
+        self.assertEqual(raw.read_at(9950, buffer), 50)
+        self.assertEqual(buffer[:50], self.content[9950:])
+        self.assertEqual(raw.tell(), 0)
+
+    def test_blob_changed_while_reading(self):
+        raw = self.open()
+        raw.read(10)
+        self.storage.add_blob("test-blob", "data.bin", b"changed")
+        with self.assertRaises(ResourceModifiedError):
+            raw.read(5000)
+
+    def test_zip_member_costs_kilobytes(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            for i in range(20):
+                zip_file.writestr(f"member-{i}.bin", os.urandom(100000))
+        self.storage.add_blob("test-blob", "archive.zip", archive.getvalue())
+
+        raw = self.open("archive.zip", block_size=16384, cache_size=1048576)
+        with zipfile.ZipFile(raw) as zip_file:
+            self.assertEqual(len(zip_file.namelist()), 20)
+            with zip_file.open("member-7.bin") as member:
+                self.assertEqual(len(member.read()), 100000)
+
+        # The central directory and one member, out of 2 MB
+        self.assertLess(raw.bytes_downloaded, 200000)
+
+
+class TestSeekableBlob(unittest.TestCase):
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(SeekableBlob))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=SeekableBlob
+            )
+        )
+
+    def test_input_populated(self):
+        storage = start_fake_storage(self)
+        storage.add_blob("test-blob", "data.bin", b"0123456789")
+        raw = decode_blob(SeekableBlob, "data.bin", SeekableBlockSize=4)
+        self.assertEqual(storage.requests, 0)
+        self.assertIsInstance(raw, BlobRawIO)
+        self.assertEqual(raw.block_size, 4)
+        raw.seek(-3, io.SEEK_END)
+        self.assertEqual(raw.read(), b"789")
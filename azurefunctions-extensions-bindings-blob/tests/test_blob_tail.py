@@ -0,0 +1,207 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    AppendBlobTail,
+    BlobClientConverter,
+    BlobTail,
+    Checkpoint,
+    FileCheckpointStore,
+    set_checkpoint_store,
+)
+from azurefunctions.extensions.bindings.blob.blobTail import read_tail
+from azurefunctions.extensions.bindings.blob.checkpointStore import (
+    CHECKPOINT_DIRECTORY_SETTING,
+    get_checkpoint_store,
+)
+from azurefunctions.extensions.bindings.blob.clientPool import (
+    create_blob_service_client,
+)
+from tests.utils import decode_blob, start_fake_storage
+
+
+class TestFileCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_round_trip(self):
+        store = FileCheckpointStore(self.directory)
+        self.assertIsNone(store.get("account/container/blob"))
+        checkpoint = Checkpoint(42, etag='"0x1"', fingerprint="abc")
+        store.set("account/container/blob", checkpoint)
+
+        # A new store, as after a restart of the worker
+        store = FileCheckpointStore(self.directory)
+        self.assertEqual(store.get("account/container/blob"), checkpoint)
+        store.delete("account/container/blob")
+        self.assertIsNone(store.get("account/container/blob"))
+        store.delete("account/container/blob")
+
+    def test_unreadable_checkpoint(self):
+        store = FileCheckpointStore(self.directory)
+        store.set("key", Checkpoint(1))
+        with open(store._path("key"), "w") as file:
+            file.write("{")
+        self.assertIsNone(store.get("key"))
+
+    def test_default_store(self):
+        set_checkpoint_store(None)
+        self.addCleanup(set_checkpoint_store, None)
+        with patch.dict(os.environ, {CHECKPOINT_DIRECTORY_SETTING: self.directory}):
+            store = get_checkpoint_store()
+        self.assertIsInstance(store, FileCheckpointStore)
+        self.assertEqual(store.directory, self.directory)
+        self.assertIs(get_checkpoint_store(), store)
+
+
+class TestReadTail(unittest.TestCase):
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = FileCheckpointStore(directory.name)
+        self.blob_client = create_blob_service_client(
+            self.storage.connection_string, False
+        ).get_blob_client("logs", "app.log")
+
+    def read(self) -> BlobTail:
+        self.storage.reset_counters()
+        return read_tail(self.blob_client, self.store)
+
+    def test_reads_appended_bytes(self):
+        self.storage.append_blob("logs", "app.log", b"line 1\nline 2\n")
+        with self.read() as tail:
+            self.assertEqual(tail.read(), b"line 1\nline 2\n")
+            self.assertEqual((tail.start, tail.end), (0, 14))
+            self.assertFalse(tail.reset)
+
+        self.storage.append_blob("logs", "app.log", b"line 3\n")
+        with self.read() as tail:
+            self.assertEqual(tail.read(), b"line 3\n")
+            self.assertEqual((tail.start, tail.end), (14, 21))
+            self.assertFalse(tail.reset)
+        # The properties, and one GET for the tail and the fingerprint
+        self.assertEqual(self.storage.operations["GetBlob"], 1)
+
+        with self.read() as tail:
+            self.assertEqual(len(tail), 0)
+        # Nothing appended, nothing downloaded
+        self.assertEqual(self.storage.requests, 1)
+        with self.read() as tail:
+            self.assertEqual(tail.read(), b"")
+
+    def test_download_is_bounded_by_the_tail(self):
+        self.storage.append_blob("logs", "app.log", os.urandom(1000000))
+        self.read().commit()
+        self.storage.append_blob("logs", "app.log", b"new")
+
+        tail = self.read()
+        self.assertEqual(tail.read(), b"new")
+        self.assertLess(self.storage.bytes_sent, 2000)
+
+    def test_uncommitted_tail_is_read_again(self):
+        self.storage.append_blob("logs", "app.log", b"first\n")
+        with self.assertRaises(RuntimeError):
+            with self.read():
+                raise RuntimeError("processing failed")
+        self.storage.append_blob("logs", "app.log", b"second\n")
+        self.assertEqual(self.read().read(), b"first\nsecond\n")
+
+    def test_commit_inside_the_tail(self):
+        self.storage.append_blob("logs", "app.log", b"complete\nparti")
+        tail = self.read()
+        tail.commit(tail.content.rindex(b"\n") + 1)
+        self.storage.append_blob("logs", "app.log", b"al\n")
+        with self.read() as tail:
+            self.assertEqual(tail.read(), b"partial\n")
+            self.assertFalse(tail.reset)
+        with self.assertRaises(ValueError):
+            tail.commit(tail.start - 1)
+
+    def test_overwritten_blob_is_read_again(self):
+        self.storage.append_blob("logs", "app.log", b"a" * 5000)
+        self.read().commit()
+        creation_time = self.storage.blobs[("logs", "app.log")].creation_time
+        stored = self.storage.add_blob(
+            "logs", "app.log", b"b" * 6000, blob_type="AppendBlob"
+        )
+        # Recreated with the same creation time, so only the fingerprint
+        # tells the blobs apart
+        stored.creation_time = creation_time
+
+        with self.read() as tail:
+            self.assertTrue(tail.reset)
+            self.assertEqual(tail.read(), b"b" * 6000)
+        self.storage.append_blob("logs", "app.log", b"c")
+        self.assertEqual(self.read().read(), b"c")
+
+    def test_truncated_blob_is_read_again(self):
+        self.storage.append_blob("logs", "app.log", b"0123456789")
+        self.read().commit()
+        # Deleted, and created again shorter than the checkpoint
+        self.storage.blobs.pop(("logs", "app.log"))
+        self.storage.append_blob("logs", "app.log", b"new")
+
+        tail = self.read()
+        self.assertTrue(tail.reset)
+        self.assertEqual(tail.read(), b"new")
+
+    def test_block_blob_is_read_whole(self):
+        self.storage.add_blob("logs", "app.log", b"version 1")
+        self.read().commit()
+        self.storage.add_blob("logs", "app.log", b"version 1, version 2")
+
+        tail = self.read()
+        self.assertTrue(tail.reset)
+        self.assertEqual(tail.read(), b"version 1, version 2")
+
+    def test_blob_appended_while_reading(self):
+        self.storage.append_blob("logs", "app.log", b"first\n")
+        get_blob_properties = self.blob_client.get_blob_properties
+
+        def append_after_properties(**kwargs):
+            properties = get_blob_properties(**kwargs)
+            if self.storage.operations["GetBlobProperties"] == 1:
+                self.storage.append_blob("logs", "app.log", b"second\n")
+            return properties
+
+        with patch.object(
+            self.blob_client, "get_blob_properties", append_after_properties
+        ):
+            tail = self.read()
+        self.assertEqual(tail.read(), b"first\nsecond\n")
+        self.assertEqual(self.storage.operations["GetBlobProperties"], 2)
+
+
+class TestAppendBlobTail(unittest.TestCase):
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(AppendBlobTail))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=AppendBlobTail
+            )
+        )
+
+    def test_input_populated(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        set_checkpoint_store(FileCheckpointStore(directory.name))
+        self.addCleanup(set_checkpoint_store, None)
+        storage = start_fake_storage(self)
+        contents = []
+        for line in (b"one\n", b"two\n"):
+            storage.append_blob("logs", "app.log", line)
+            with decode_blob(AppendBlobTail, "app.log", container="logs") as tail:
+                contents.append(tail.read())
+        self.assertEqual(contents, [b"one\n", b"two\n"])
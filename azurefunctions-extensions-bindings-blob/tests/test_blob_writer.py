@@ -0,0 +1,371 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import array
+import asyncio
+import gc
+import os
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from azure.core.exceptions import HttpResponseError
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    BlobWriter,
+    BlockBlobWriter,
+    aio,
+)
+from azurefunctions.extensions.bindings.blob.uploadOptions import (
+    BLOCK_SIZE_SETTING,
+    UploadOptions,
+)
+from tests.utils import MockMBD
+
+
+class FakeBlockBlob:
+    """
+    Records staged blocks and commits them like the service.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.blob_name = "output.bin"
+        self.container_name = "test-blob"
+        self.delay = delay
+        self.blocks = {}
+        self.content = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.upload_blob = MagicMock(side_effect=self._upload_blob)
+        self.commit_kwargs = None
+        self.fail_block = None
+        self._lock = threading.Lock()
+
+    def stage_block(self, block_id, data, length=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if block_id == self.fail_block:
+                raise HttpResponseError("stage failed")
+            self.blocks[block_id] = bytes(data[:length])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def commit_block_list(self, block_ids, **kwargs):
+        self.commit_kwargs = kwargs
+        self.content = b"".join(self.blocks[block_id] for block_id in block_ids)
+        return {"etag": '"0x1"'}
+
+    def _upload_blob(self, data, overwrite=False, **kwargs):
+        self.content = data
+        return {"etag": '"0x1"'}
+
+
+class TestBlockBlobWriter(unittest.TestCase):
+    def test_small_upload_is_single_put(self):
+        blob = FakeBlockBlob()
+        with BlockBlobWriter(blob, UploadOptions(block_size=10)) as writer:
+            writer.write(b"hello")
+
+        self.assertEqual(blob.content, b"hello")
+        self.assertEqual(blob.blocks, {})
+        blob.upload_blob.assert_called_once_with(b"hello", overwrite=True)
+        self.assertTrue(writer.committed)
+        self.assertTrue(writer.closed)
+
+    def test_blocks_staged_in_order(self):
+        blob = FakeBlockBlob()
+        content = bytes(range(256)) * 10
+        writer = BlockBlobWriter(
+            blob, UploadOptions(block_size=100, max_concurrency=3), metadata={"a": "b"}
+        )
+        for start in range(0, len(content), 37):
+            writer.write(content[start : start + 37])
+        result = writer.commit()
+
+        self.assertEqual(result, {"etag": '"0x1"'})
+        self.assertEqual(blob.content, content)
+        self.assertEqual(len(blob.blocks), 26)
+        self.assertEqual(blob.commit_kwargs, {"metadata": {"a": "b"}})
+        self.assertEqual(writer.size, len(content))
+        blob.upload_blob.assert_not_called()
+
+    def test_in_flight_blocks_are_bounded(self):
+        blob = FakeBlockBlob(delay=0.02)
+        writer = BlockBlobWriter(blob, UploadOptions(block_size=10, max_concurrency=2))
+        for _ in range(10):
+            writer.write(b"x" * 10)
+            # The writer never buffers more than the blocks in flight
+            self.assertLessEqual(writer._slots._value, 2)
+        writer.close()
+
+        self.assertEqual(blob.content, b"x" * 100)
+        self.assertEqual(blob.max_in_flight, 2)
+
+    def test_typed_buffer(self):
+        blob = FakeBlockBlob()
+        values = array.array("d", [1.5, 2.5])
+        with BlockBlobWriter(blob, UploadOptions(block_size=4)) as writer:
+            writer.write(values)
+        self.assertEqual(blob.content, values.tobytes())
+
+    def test_stage_error_aborts(self):
+        blob = FakeBlockBlob()
+        blob.fail_block = "00000001"
+        writer = BlockBlobWriter(blob, UploadOptions(block_size=10))
+
+        with self.assertRaises(HttpResponseError):
+            for _ in range(5):
+                writer.write(b"y" * 10)
+            writer.commit()
+        self.assertIsNone(blob.content)
+        self.assertTrue(writer.closed)
+        self.assertFalse(writer.committed)
+
+    def test_exception_in_context_aborts(self):
+        blob = FakeBlockBlob()
+        with self.assertRaises(RuntimeError):
+            with BlockBlobWriter(blob, UploadOptions(block_size=10)) as writer:
+                writer.write(b"z" * 25)
+                raise RuntimeError("function failed")
+
+        self.assertIsNone(blob.content)
+        with self.assertRaises(ValueError):
+            writer.commit()
+        with self.assertRaises(ValueError):
+            writer.write(b"more")
+
+    def test_unclosed_writer_is_aborted(self):
+        blob = FakeBlockBlob()
+        writer = BlockBlobWriter(blob, UploadOptions(block_size=10))
+        writer.write(b"w" * 15)
+
+        with self.assertLogs(
+            "azurefunctions.extensions.bindings.blob.blockWriter", "WARNING"
+        ) as logs:
+            del writer
+            gc.collect()
+
+        self.assertIn("output.bin", logs.output[0])
+        self.assertIn("15 bytes", logs.output[0])
+        self.assertIsNone(blob.content)
+
+
+class FakeAsyncBlockBlob(FakeBlockBlob):
+    """
+    The async variant of FakeBlockBlob.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(delay)
+        self.upload_blob = AsyncMock(side_effect=self._upload_blob)
+
+    async def stage_block(self, block_id, data, length=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if block_id == self.fail_block:
+                raise HttpResponseError("stage failed")
+            self.blocks[block_id] = bytes(data[:length])
+        finally:
+            self.in_flight -= 1
+
+    async def commit_block_list(self, block_ids, **kwargs):
+        return super().commit_block_list(block_ids, **kwargs)
+
+
+async def request_body(chunks, received):
+    # Stands in for Request.stream(), recording how far the body was read
+    for chunk in chunks:
+        received.append(len(chunk))
+        yield chunk
+
+
+class TestAsyncBlockBlobWriter(unittest.TestCase):
+    def test_small_upload_is_single_put(self):
+        blob = FakeAsyncBlockBlob()
+
+        async def run():
+            async with aio.BlockBlobWriter(blob) as writer:
+                await writer.write(b"hello")
+            return writer
+
+        writer = asyncio.run(run())
+        self.assertEqual(blob.content, b"hello")
+        self.assertEqual(blob.blocks, {})
+        self.assertTrue(writer.committed)
+        self.assertTrue(writer.closed)
+
+    def test_upload_stream(self):
+        blob = FakeAsyncBlockBlob(delay=0.01)
+        content = bytes(range(256)) * 10
+        chunks = [content[start : start + 37] for start in range(0, len(content), 37)]
+        received = []
+
+        result = asyncio.run(
+            aio.upload_stream(
+                request_body(chunks, received),
+                blob,
+                UploadOptions(block_size=100, max_concurrency=3),
+                metadata={"a": "b"},
+            )
+        )
+
+        self.assertEqual(result, {"etag": '"0x1"'})
+        self.assertEqual(blob.content, content)
+        self.assertEqual(len(blob.blocks), 26)
+        self.assertEqual(blob.max_in_flight, 3)
+        self.assertEqual(blob.commit_kwargs, {"metadata": {"a": "b"}})
+
+    def test_backpressure(self):
+        blob = FakeAsyncBlockBlob(delay=0.05)
+        received = []
+
+        async def run():
+            writer = aio.BlockBlobWriter(
+                blob, UploadOptions(block_size=10, max_concurrency=2)
+            )
+            task = asyncio.ensure_future(
+                aio.upload_stream(request_body([b"x" * 10] * 10, received), writer)
+            )
+            await asyncio.sleep(0.02)
+            # Two blocks in flight and one waiting for a slot
+            in_flight = len(received)
+            await task
+            return in_flight
+
+        self.assertEqual(asyncio.run(run()), 3)
+        self.assertEqual(len(received), 10)
+        self.assertEqual(blob.content, b"x" * 100)
+        self.assertEqual(blob.max_in_flight, 2)
+
+    def test_stage_error_aborts(self):
+        blob = FakeAsyncBlockBlob()
+        blob.fail_block = "00000001"
+        writer = aio.BlockBlobWriter(blob, UploadOptions(block_size=10))
+
+        with self.assertRaises(HttpResponseError):
+            asyncio.run(aio.upload_stream(request_body([b"y" * 10] * 5, []), writer))
+        self.assertIsNone(blob.content)
+        self.assertTrue(writer.closed)
+        self.assertFalse(writer.committed)
+
+    def test_body_error_aborts(self):
+        blob = FakeAsyncBlockBlob()
+
+        async def broken_body():
+            yield b"z" * 25
+            raise ConnectionResetError("client disconnected")
+
+        with self.assertRaises(ConnectionResetError):
+            asyncio.run(
+                aio.upload_stream(broken_body(), blob, UploadOptions(block_size=10))
+            )
+        self.assertIsNone(blob.content)
+
+
+class TestUploadOptions(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            UploadOptions(block_size=0)
+        with self.assertRaises(ValueError):
+            UploadOptions(max_concurrency=0)
+
+    @patch.dict(os.environ, {BLOCK_SIZE_SETTING: "1024"})
+    def test_from_binding(self):
+        self.assertEqual(UploadOptions.from_binding({}), UploadOptions(block_size=1024))
+        self.assertEqual(
+            UploadOptions.from_binding({"MaxUploadConcurrency": 8}),
+            UploadOptions(block_size=1024, max_concurrency=8),
+        )
+
+
+class TestBlobWriter(unittest.TestCase):
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(BlobWriter))
+
+    def test_output_type(self):
+        # Writers are bound as inputs and committed by the function
+        self.assertFalse(BlobClientConverter.check_output_type_annotation(BlobWriter))
+        self.assertFalse(
+            BlobClientConverter.check_output_type_annotation(BlockBlobWriter)
+        )
+        self.assertFalse(
+            BlobClientConverter.check_output_type_annotation(aio.BlobWriter)
+        )
+        self.assertFalse(BlobClientConverter.check_output_type_annotation(bytes))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        result = BlobClientConverter.decode(
+            data=datum, trigger_metadata=None, pytype=BlobWriter
+        )
+        self.assertIsNone(result)
+
+    @patch.dict(os.environ, {"FakeStorage": "fake"})
+    def test_input_populated(self):
+        datum = Datum(
+            value=MockMBD(
+                {
+                    "Connection": "FakeStorage",
+                    "ContainerName": "test-blob",
+                    "BlobName": "output.bin",
+                    "MaxBlockSize": 1024,
+                }
+            ),
+            type="model_binding_data",
+        )
+        service_client = MagicMock()
+        with patch(
+            "azurefunctions.extensions.bindings.blob.blobWriter."
+            "get_blob_service_client",
+            return_value=service_client,
+        ):
+            writer = BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=BlobWriter
+            )
+
+        self.assertIsInstance(writer, BlockBlobWriter)
+        self.assertIs(writer.blob_client, service_client.get_blob_client.return_value)
+        self.assertEqual(writer._options.block_size, 1024)
+        service_client.get_blob_client.assert_called_once_with(
+            container="test-blob", blob="output.bin"
+        )
+        writer.abort()
+
+    @patch.dict(os.environ, {"FakeStorage": "fake"})
+    def test_async_input_populated(self):
+        datum = Datum(
+            value=MockMBD(
+                {
+                    "Connection": "FakeStorage",
+                    "ContainerName": "test-blob",
+                    "BlobName": "output.bin",
+                }
+            ),
+            type="model_binding_data",
+        )
+        service_client = MagicMock()
+        with patch(
+            "azurefunctions.extensions.bindings.blob.aio.blobWriter."
+            "get_async_blob_service_client",
+            return_value=service_client,
+        ):
+            writer = BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=aio.BlobWriter
+            )
+
+        self.assertIsInstance(writer, aio.BlockBlobWriter)
+        self.assertIs(writer.blob_client, service_client.get_blob_client.return_value)
+
+    def test_encode_not_supported(self):
+        writer = BlockBlobWriter(FakeBlockBlob())
+        with self.assertRaises(NotImplementedError):
+            BlobClientConverter.encode(writer, expected_type=BlockBlobWriter)
+        writer.abort()
@@ -0,0 +1,133 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azure.storage.blob import BlobServiceClient
+from azurefunctions.extensions.bindings.blob import clientPool
+from azurefunctions.extensions.bindings.blob.clientPool import BlobServiceClientPool
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=fakeaccount;"
+    "AccountKey=ZmFrZWtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+class MockClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBlobServiceClientPool(unittest.TestCase):
+    def test_same_connection_shares_client(self):
+        pool = BlobServiceClientPool()
+        first = pool.get(CONNECTION_STRING, False)
+        second = pool.get(CONNECTION_STRING, False)
+
+        self.assertIsInstance(first, BlobServiceClient)
+        self.assertIs(first, second)
+        self.assertEqual(len(pool), 1)
+
+    def test_managed_identity_flag_is_part_of_key(self):
+        pool = BlobServiceClientPool()
+        connection = "https://fakeaccount.blob.core.windows.net"
+        with_mi = pool.get(connection, True)
+        without_mi = pool.get(connection, False, factory=MagicMock)
+
+        self.assertIsNot(with_mi, without_mi)
+        self.assertEqual(len(pool), 2)
+
+    def test_bounded_size_evicts_least_recently_used(self):
+        pool = BlobServiceClientPool(max_size=2)
+        first = pool.get("a", False, factory=MagicMock)
+        pool.get("b", False, factory=MagicMock)
+        # Touch "a" so that "b" becomes the least recently used
+        self.assertIs(pool.get("a", False, factory=MagicMock), first)
+        pool.get("c", False, factory=MagicMock)
+
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.get("a", False, factory=MagicMock), first)
+        # Dropped clients may still be in use, so they are not closed
+        first.close.assert_not_called()
+
+    def test_idle_eviction(self):
+        clock = MockClock()
+        pool = BlobServiceClientPool(idle_timeout=10, clock=clock)
+        first = pool.get("a", False, factory=MagicMock)
+
+        clock.now = 5
+        self.assertIs(pool.get("a", False, factory=MagicMock), first)
+
+        clock.now = 16
+        second = pool.get("a", False, factory=MagicMock)
+        self.assertIsNot(second, first)
+
+    def test_close(self):
+        pool = BlobServiceClientPool()
+        client = pool.get("a", False, factory=MagicMock)
+        pool.close()
+
+        client.close.assert_called_once()
+        self.assertEqual(len(pool), 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            BlobServiceClientPool(max_size=0)
+
+    def test_thread_safe_creation(self):
+        pool = BlobServiceClientPool()
+        factory = MagicMock(side_effect=lambda: object())
+        results = []
+
+        def get_client():
+            results.append(pool.get("a", False, factory=factory))
+
+        threads = [threading.Thread(target=get_client) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        factory.assert_called_once()
+        self.assertEqual(len({id(client) for client in results}), 1)
+
+
+class TestProcessWidePool(unittest.TestCase):
+    def tearDown(self):
+        clientPool.close_client_pool()
+
+    @patch.dict(os.environ, {clientPool.POOL_MAX_SIZE_SETTING: "4"})
+    def test_pool_settings(self):
+        clientPool.close_client_pool()
+        self.assertEqual(clientPool.get_client_pool()._max_size, 4)
+
+    @patch.dict(os.environ, {clientPool.POOL_MAX_SIZE_SETTING: "0"})
+    def test_zero_pool_size_is_default(self):
+        clientPool.close_client_pool()
+        self.assertEqual(
+            clientPool.get_client_pool()._max_size, clientPool.DEFAULT_POOL_MAX_SIZE
+        )
+
+    def test_invalid_pool_settings(self):
+        for value in ("four", "-1"):
+            with patch.dict(os.environ, {clientPool.POOL_MAX_SIZE_SETTING: value}):
+                clientPool.close_client_pool()
+                with self.assertRaisesRegex(
+                    ValueError, clientPool.POOL_MAX_SIZE_SETTING
+                ):
+                    clientPool.get_client_pool()
+
+    def test_get_blob_service_client(self):
+        first = clientPool.get_blob_service_client(CONNECTION_STRING, False)
+        second = clientPool.get_blob_service_client(CONNECTION_STRING, False)
+        self.assertIs(first, second)
+
+        clientPool.close_client_pool()
+        third = clientPool.get_blob_service_client(CONNECTION_STRING, False)
+        self.assertIsNot(first, third)
@@ -0,0 +1,151 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import os
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from azurefunctions.extensions.base import Datum, get_binding_registry
+from azurefunctions.extensions.bindings.blob import (
+    BlobClient,
+    BlobClientConverter,
+    BlobWriter,
+    LazyStorageStreamDownloader,
+    StorageStreamDownloader,
+    aio,
+)
+from azurefunctions.extensions.bindings.blob.collection import (
+    PREFETCH_CONCURRENCY_SETTING,
+)
+from tests.utils import MockMBD, start_fake_storage
+
+
+class MockCollectionMBD:
+    def __init__(self, model_binding_data: list):
+        self.model_binding_data = model_binding_data
+
+
+def make_batch(names) -> Datum:
+    return Datum(
+        value=MockCollectionMBD(
+            [
+                MockMBD(
+                    {
+                        "Connection": "FakeStorage",
+                        "ContainerName": "test-blob",
+                        "BlobName": name,
+                    }
+                )
+                for name in names
+            ]
+        ),
+        type="collection_model_binding_data",
+    )
+
+
+class TestCollectionTypes(unittest.TestCase):
+    def test_input_type(self):
+        check = BlobClientConverter.check_input_type_annotation
+        self.assertTrue(check(list[BlobClient]))
+        self.assertTrue(check(List[StorageStreamDownloader]))
+        self.assertTrue(check(list[aio.BlobClient]))
+        self.assertFalse(check(list[str]))
+        self.assertFalse(check(list))
+
+    def test_supported_type(self):
+        registry = get_binding_registry()
+        self.assertTrue(BlobClientConverter.supports_collections)
+        self.assertTrue(registry.check_supported_type(list[BlobClient], "blob"))
+        self.assertTrue(registry.check_supported_type(list[BlobClient], "blobTrigger"))
+
+    def test_output_type(self):
+        self.assertFalse(
+            BlobClientConverter.check_output_type_annotation(list[BlobWriter])
+        )
+
+    def test_collection_requires_list(self):
+        with self.assertRaises(ValueError):
+            BlobClientConverter.decode(
+                data=make_batch(["a.txt"]), trigger_metadata=None, pytype=BlobClient
+            )
+
+    def test_empty_collection(self):
+        datum = Datum(value=MockCollectionMBD([]), type="collection_model_binding_data")
+        self.assertEqual(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=list[BlobClient]
+            ),
+            [],
+        )
+
+
+class TestCollectionDecode(unittest.TestCase):
+    def setUp(self):
+        self.storage = start_fake_storage(self, latency=0.05)
+        self.names = [f"blob-{i}.txt" for i in range(8)]
+        for name in self.names:
+            self.storage.add_blob("test-blob", name, name.encode())
+
+    def decode(self, pytype, names=None):
+        return BlobClientConverter.decode(
+            data=make_batch(names or self.names), trigger_metadata=None, pytype=pytype
+        )
+
+    def test_clients_share_service_client(self):
+        clients = self.decode(list[BlobClient])
+
+        self.assertEqual([client.blob_name for client in clients], self.names)
+        # Clients from the same service client wrap its transport
+        transports = {id(client._pipeline._transport._transport) for client in clients}
+        self.assertEqual(len(transports), 1)
+        self.assertEqual(self.storage.requests, 0)
+
+    def test_single_model_binding_data(self):
+        datum = make_batch(["blob-0.txt"])
+        datum = Datum(
+            value=datum.value.model_binding_data[0], type="model_binding_data"
+        )
+        clients = BlobClientConverter.decode(
+            data=datum, trigger_metadata=None, pytype=list[BlobClient]
+        )
+        self.assertEqual([client.blob_name for client in clients], ["blob-0.txt"])
+
+    def test_downloads_are_lazy_by_default(self):
+        streams = self.decode(list[StorageStreamDownloader])
+
+        self.assertTrue(
+            all(isinstance(s, LazyStorageStreamDownloader) for s in streams)
+        )
+        self.assertFalse(any(stream.started for stream in streams))
+        self.assertEqual(self.storage.requests, 0)
+
+    def test_prefetch(self):
+        with patch.dict(os.environ, {PREFETCH_CONCURRENCY_SETTING: "4"}):
+            started = time.perf_counter()
+            streams = self.decode(list[StorageStreamDownloader])
+            elapsed = time.perf_counter() - started
+
+        self.assertTrue(all(stream.started for stream in streams))
+        self.assertEqual(self.storage.operations["GetBlob"], 8)
+        # 8 downloads of 50 ms, 4 at a time
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(
+            [stream.readall() for stream in streams],
+            [name.encode() for name in self.names],
+        )
+        self.assertEqual(self.storage.operations["GetBlob"], 8)
+
+    @patch.dict(os.environ, {PREFETCH_CONCURRENCY_SETTING: "2"})
+    def test_prefetch_error_is_raised_on_read(self):
+        streams = self.decode(
+            list[StorageStreamDownloader], ["blob-0.txt", "missing.txt"]
+        )
+
+        self.assertTrue(streams[0].started)
+        self.assertFalse(streams[1].started)
+        with self.assertRaises(ResourceNotFoundError):
+            streams[1].readall()
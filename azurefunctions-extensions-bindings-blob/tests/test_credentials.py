@@ -0,0 +1,293 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ClientAuthenticationError
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import BlobClient, BlobClientConverter
+from azurefunctions.extensions.bindings.blob.bindingContent import (
+    clear_binding_content_cache,
+)
+from azurefunctions.extensions.bindings.blob.clientPool import (
+    close_client_pool,
+    create_blob_service_client,
+)
+from azurefunctions.extensions.bindings.blob.credentials import (
+    AsyncCachedTokenCredential,
+    CachedTokenCredential,
+    ManagedIdentity,
+    close_credentials,
+    get_managed_identity_credential,
+)
+from azurefunctions.extensions.bindings.blob.testing import FakeTokenEndpoint
+from tests.utils import MockMBD
+
+try:
+    import azure.identity  # noqa: F401
+
+    HAS_AZURE_IDENTITY = True
+except ImportError:
+    HAS_AZURE_IDENTITY = False
+
+SCOPE = "https://storage.azure.com/.default"
+ACCOUNT_URL = "https://fakeaccount.blob.core.windows.net"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCredential:
+    def __init__(self, clock, lifetime=3600):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.calls = 0
+        self.error = None
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return AccessToken(f"token-{self.calls}", int(self.clock() + self.lifetime))
+
+
+class TestCachedTokenCredential(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.inner = FakeCredential(self.clock)
+        self.credential = CachedTokenCredential(
+            self.inner, refresh_margin=300, retry_delay=30, clock=self.clock
+        )
+
+    def test_token_is_reused(self):
+        tokens = {self.credential.get_token(SCOPE).token for _ in range(10)}
+
+        self.assertEqual(tokens, {"token-1"})
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(self.credential.hit_rate, 0.9)
+
+    def test_tokens_are_cached_per_scope(self):
+        self.credential.get_token(SCOPE)
+        self.credential.get_token("https://vault.azure.net/.default")
+        self.credential.get_token(SCOPE, tenant_id="other")
+        self.assertEqual(self.inner.calls, 3)
+
+    def test_refreshed_before_expiry(self):
+        self.credential.get_token(SCOPE)
+        self.clock.now += 3600 - 301
+        self.assertEqual(self.credential.get_token(SCOPE).token, "token-1")
+        self.clock.now += 1
+        self.assertEqual(self.credential.get_token(SCOPE).token, "token-2")
+        self.assertEqual(self.credential.refreshes, 2)
+
+    def test_failed_refresh_keeps_valid_token(self):
+        self.credential.get_token(SCOPE)
+        self.clock.now += 3600 - 100
+        self.inner.error = ClientAuthenticationError("throttled")
+
+        with self.assertLogs(
+            "azurefunctions.extensions.bindings.blob.credentials", "WARNING"
+        ):
+            self.assertEqual(self.credential.get_token(SCOPE).token, "token-1")
+        # The next attempt waits for the retry delay
+        self.assertEqual(self.credential.get_token(SCOPE).token, "token-1")
+        self.assertEqual(self.inner.calls, 2)
+
+        self.inner.error = None
+        self.clock.now += 30
+        self.assertEqual(self.credential.get_token(SCOPE).token, "token-3")
+        self.assertEqual(self.credential.failures, 1)
+
+    def test_failure_without_valid_token_is_raised(self):
+        self.inner.error = ClientAuthenticationError("no identity")
+        with self.assertRaises(ClientAuthenticationError):
+            self.credential.get_token(SCOPE)
+
+        self.inner.error = None
+        self.assertEqual(self.credential.get_token(SCOPE).token, "token-2")
+
+    def test_claims_bypass_cache(self):
+        self.credential.get_token(SCOPE)
+        self.credential.get_token(SCOPE, claims='{"access_token": {}}')
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_single_refresh_for_concurrent_callers(self):
+        started = threading.Event()
+        release = threading.Event()
+        inner = self.inner
+
+        class SlowCredential:
+            def get_token(self, *scopes, **kwargs):
+                started.set()
+                release.wait()
+                return inner.get_token(*scopes, **kwargs)
+
+        credential = CachedTokenCredential(SlowCredential(), clock=self.clock)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(credential.get_token(SCOPE)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(inner.calls, 1)
+        self.assertEqual({token.token for token in results}, {"token-1"})
+
+    def test_async_credential(self):
+        credential = AsyncCachedTokenCredential(self.credential)
+
+        async def run():
+            return [(await credential.get_token(SCOPE)).token for _ in range(3)]
+
+        self.assertEqual(asyncio.run(run()), ["token-1"] * 3)
+        self.assertEqual(self.inner.calls, 1)
+
+
+class TestSharedCredential(unittest.TestCase):
+    def tearDown(self):
+        close_credentials()
+
+    def test_clients_share_credential(self):
+        inner = FakeCredential(time.time)
+        with patch(
+            "azurefunctions.extensions.bindings.blob.credentials."
+            "_create_managed_identity_credential",
+            return_value=inner,
+        ):
+            first = create_blob_service_client(ACCOUNT_URL, True)
+            second = create_blob_service_client(ACCOUNT_URL + "/", True)
+            async_client = create_blob_service_client(
+                ACCOUNT_URL, True, AsyncBlobServiceClient
+            )
+            other = get_managed_identity_credential(
+                "https://otheraccount.blob.core.windows.net"
+            )
+
+        self.assertIsInstance(first.credential, CachedTokenCredential)
+        self.assertIs(first.credential, second.credential)
+        self.assertIs(first.credential.credential, inner)
+        self.assertIsInstance(async_client.credential, AsyncCachedTokenCredential)
+        self.assertIsNot(other, first.credential)
+
+    def test_user_assigned_identities(self):
+        created = []
+
+        def create(identity):
+            created.append(identity)
+            return FakeCredential(time.time)
+
+        first = ManagedIdentity(client_id="first-client-id")
+        second = ManagedIdentity(client_id="second-client-id")
+        with patch(
+            "azurefunctions.extensions.bindings.blob.credentials."
+            "_create_managed_identity_credential",
+            side_effect=create,
+        ):
+            system = create_blob_service_client(ACCOUNT_URL, True)
+            clients = [
+                create_blob_service_client(ACCOUNT_URL, True, managed_identity=identity)
+                for identity in (first, second, first)
+            ]
+
+        # Connections to the same account with other identities don't share
+        # their credential
+        self.assertEqual(created, [ManagedIdentity(), first, second])
+        self.assertIsNot(system.credential, clients[0].credential)
+        self.assertIsNot(clients[0].credential, clients[1].credential)
+        self.assertIs(clients[0].credential, clients[2].credential)
+
+    def test_without_azure_identity(self):
+        with patch(
+            "azurefunctions.extensions.bindings.blob.credentials."
+            "_create_managed_identity_credential",
+            return_value=None,
+        ):
+            client = create_blob_service_client(ACCOUNT_URL, True)
+        self.assertIsNone(client.credential)
+
+
+@unittest.skipUnless(HAS_AZURE_IDENTITY, "azure-identity is not installed")
+class TestManagedIdentityTokens(unittest.TestCase):
+    def setUp(self):
+        self.endpoint = FakeTokenEndpoint(lifetime=3600)
+        self.endpoint.__enter__()
+        self.env = patch.dict(os.environ, self.endpoint.environ())
+        self.env.start()
+
+    def tearDown(self):
+        close_credentials()
+        self.env.stop()
+        self.endpoint.__exit__(None, None, None)
+
+    def test_token_acquired_once_for_many_clients(self):
+        for _ in range(20):
+            client = create_blob_service_client(ACCOUNT_URL, True)
+            token = client.credential.get_token(SCOPE)
+
+        self.assertEqual(token.token, "token-1")
+        self.assertEqual(self.endpoint.requests, 1)
+        self.assertEqual(client.credential.hit_rate, 19 / 20)
+
+
+@unittest.skipUnless(HAS_AZURE_IDENTITY, "azure-identity is not installed")
+class TestConnectionIdentity(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(close_credentials)
+        self.addCleanup(close_client_pool)
+        self.addCleanup(clear_binding_content_cache)
+
+    def decode(self, connection: str) -> BlobClient:
+        datum = Datum(
+            value=MockMBD(
+                {"Connection": connection, "ContainerName": "c", "BlobName": "b"}
+            ),
+            type="model_binding_data",
+        )
+        return BlobClientConverter.decode(
+            data=datum, trigger_metadata=None, pytype=BlobClient
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "UserAssigned__serviceUri": ACCOUNT_URL,
+            "UserAssigned__credential": "managedidentity",
+            "UserAssigned__clientId": "user-client-id",
+            "ResourceId__blobServiceUri": ACCOUNT_URL,
+            "ResourceId__managedIdentityResourceId": "/subscriptions/s/identity",
+            "SystemAssigned__serviceUri": ACCOUNT_URL,
+        },
+    )
+    def test_identity_of_connection(self):
+        with patch("azure.identity.ManagedIdentityCredential") as credential_type:
+            user = self.decode("UserAssigned")
+            resource = self.decode("ResourceId")
+            system = self.decode("SystemAssigned")
+
+        self.assertEqual(
+            credential_type.call_args_list,
+            [
+                ((), {"client_id": "user-client-id"}),
+                ((), {"identity_config": {"mi_res_id": "/subscriptions/s/identity"}}),
+                ((), {}),
+            ],
+        )
+        self.assertEqual(len({id(c.credential) for c in (user, resource, system)}), 3)
@@ -0,0 +1,255 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import bz2
+import gc
+import gzip
+import io
+import os
+import threading
+import time
+import tracemalloc
+import unittest
+import zlib
+from unittest.mock import patch
+
+import zstandard
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    DecompressedBlob,
+    DecompressingStreamDownloader,
+)
+from azurefunctions.extensions.bindings.blob.decompression import (
+    CHUNK_SIZE_SETTING,
+    DecompressionOptions,
+    decompress,
+    detect_codec,
+)
+from azurefunctions.extensions.bindings.blob.readAhead import ReadAheadIterator
+from tests.utils import decode_blob, start_fake_storage
+
+CONTENT = b"".join(
+    b"%d,%s\n" % (i, os.urandom(8).hex().encode()) for i in range(20000)
+) + (b"\0" * 500000)
+
+COMPRESSORS = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress,
+    "bz2": bz2.compress,
+    "zstd": zstandard.ZstdCompressor().compress,
+}
+
+
+def read_ahead_threads() -> int:
+    return sum(thread.name == "blob-read-ahead" for thread in threading.enumerate())
+
+
+def split(content: bytes, size: int):
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+class TestDecompressionOptions(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DecompressionOptions(codec="lzma")
+        with self.assertRaises(ValueError):
+            DecompressionOptions(chunk_size=0)
+
+    @patch.dict(os.environ, {CHUNK_SIZE_SETTING: "4096"})
+    def test_from_binding(self):
+        self.assertEqual(
+            DecompressionOptions.from_binding({"Compression": "x-gzip"}),
+            DecompressionOptions(codec="gzip", chunk_size=4096),
+        )
+        self.assertEqual(
+            DecompressionOptions.from_binding({"DecompressedChunkSize": 10}),
+            DecompressionOptions(chunk_size=10),
+        )
+
+    def test_detect_codec(self):
+        self.assertEqual(detect_codec("GZIP", "data.bin"), "gzip")
+        self.assertEqual(detect_codec(None, "logs/2024.json.zst"), "zstd")
+        self.assertEqual(detect_codec("", "archive.tar.bz2"), "bz2")
+        self.assertEqual(detect_codec(None, "data.json"), "identity")
+        # The Content-Encoding wins over the extension
+        self.assertEqual(detect_codec("identity", "data.gz"), "identity")
+        with self.assertRaises(ValueError):
+            detect_codec("br", "data.json")
+
+
+class TestDecompress(unittest.TestCase):
+    def test_codecs(self):
+        for codec, compress in COMPRESSORS.items():
+            compressed = compress(CONTENT)
+            for size in (7, 65536, len(compressed)):
+                with self.subTest(codec=codec, size=size):
+                    chunks = list(decompress(split(compressed, size), codec, 100000))
+                    self.assertEqual(b"".join(chunks), CONTENT)
+                    # Highly compressed input is still split into small chunks
+                    self.assertLessEqual(max(map(len, chunks)), 100000)
+
+    def test_concatenated_streams(self):
+        for codec in ("gzip", "bz2", "zstd"):
+            compress = COMPRESSORS[codec]
+            compressed = compress(b"first\n") + compress(b"second\n")
+            with self.subTest(codec=codec):
+                self.assertEqual(
+                    b"".join(decompress(split(compressed, 5), codec)),
+                    b"first\nsecond\n",
+                )
+
+    def test_gzip_zero_padding(self):
+        compressed = gzip.compress(b"first\n") + b"\0" * 100
+        compressed += gzip.compress(b"second\n") + b"\0" * 10
+        for size in (3, len(compressed)):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    b"".join(decompress(split(compressed, size), "gzip")),
+                    b"first\nsecond\n",
+                )
+
+    def test_zstd_output_is_bounded(self):
+        # Less than 2 KB of input decompressing to 64 MiB
+        compressed = COMPRESSORS["zstd"](b"\0" * (64 * 1024 * 1024))
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        size = 0
+        for chunk in decompress([compressed], "zstd", 65536):
+            self.assertLessEqual(len(chunk), 65536)
+            size += len(chunk)
+        self.assertEqual(size, 64 * 1024 * 1024)
+        self.assertLess(tracemalloc.get_traced_memory()[1], 4 * 1024 * 1024)
+
+    def test_zstd_frames(self):
+        compress = zstandard.ZstdCompressor(
+            write_checksum=True, write_content_size=False
+        ).compress
+        # A skippable frame, then a frame without content size
+        compressed = b"\x50\x2a\x4d\x18\x02\x00\x00\x00ab" + compress(CONTENT)
+        self.assertEqual(b"".join(decompress(split(compressed, 7), "zstd")), CONTENT)
+        with self.assertRaises(EOFError):
+            list(decompress([compressed[:-4]], "zstd"))
+
+    def test_truncated_stream(self):
+        for codec, compress in COMPRESSORS.items():
+            with self.subTest(codec=codec):
+                with self.assertRaises(EOFError):
+                    list(decompress([compress(CONTENT)[:-20]], codec))
+
+    def test_identity(self):
+        self.assertEqual(list(decompress([b"a", b"b"], "identity")), [b"a", b"b"])
+        self.assertEqual(list(decompress([], "gzip")), [])
+
+
+class TestDecompressingStreamDownloader(unittest.TestCase):
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+
+    def decode(self, blob: str, **properties) -> DecompressingStreamDownloader:
+        downloader = decode_blob(
+            DecompressedBlob,
+            blob,
+            MaxSingleGetSize=65536,
+            MaxChunkGetSize=65536,
+            **properties,
+        )
+        self.addCleanup(downloader.close)
+        return downloader
+
+    def test_codec_from_extension(self):
+        self.storage.add_blob("test-blob", "data.csv.gz", gzip.compress(CONTENT))
+        downloader = self.decode(
+            "data.csv.gz", DecompressedChunkSize=65536, ReadAhead=2
+        )
+        self.assertEqual(self.storage.requests, 0)
+
+        chunks = downloader.chunks()
+        self.assertIsInstance(chunks, ReadAheadIterator)
+        self.assertEqual(b"".join(chunks), CONTENT)
+        self.assertEqual(downloader.codec, "gzip")
+        self.assertEqual(downloader.decompressed_bytes, len(CONTENT))
+        self.assertEqual(downloader.compressed_bytes, self.storage.bytes_sent)
+        self.assertGreater(self.storage.operations["GetBlob"], 1)
+        with self.assertRaises(ValueError):
+            downloader.chunks()
+
+    def test_codec_from_content_encoding(self):
+        # Without decompress=False, the transport would decode every range
+        # of the blob as a separate gzip stream
+        self.storage.add_blob(
+            "test-blob", "data.csv", gzip.compress(CONTENT), content_encoding="gzip"
+        )
+        downloader = self.decode("data.csv")
+        self.assertEqual(downloader.codec, "gzip")
+        self.assertEqual(downloader.readall(), CONTENT)
+
+    def test_explicit_codec(self):
+        self.storage.add_blob("test-blob", "data", bz2.compress(CONTENT))
+        downloader = self.decode("data", Compression="bz2", ReadAhead=1)
+        self.assertEqual(downloader.codec, "bz2")
+        self.assertEqual(self.storage.requests, 0)
+        self.assertEqual(
+            b"".join(downloader.chunks(read_ahead=0)),
+            CONTENT,
+        )
+
+    def test_file_semantics(self):
+        self.storage.add_blob("test-blob", "data.zst", COMPRESSORS["zstd"](CONTENT))
+        downloader = self.decode("data.zst", DecompressedChunkSize=1000)
+        self.assertEqual(downloader.read(5), CONTENT[:5])
+        lines = io.TextIOWrapper(io.BufferedReader(downloader), encoding="utf-8")
+        self.assertEqual(list(lines), CONTENT[5:].decode().splitlines(keepends=True))
+        downloader.close()
+        with self.assertRaises(ValueError):
+            downloader.read(1)
+
+    def test_close_stops_reading(self):
+        self.storage.add_blob("test-blob", "data.gz", gzip.compress(CONTENT))
+        downloader = self.decode("data.gz", DecompressedChunkSize=1000, ReadAhead=2)
+        chunks = downloader.chunks()
+        next(chunks)
+        iterators = list(downloader._iterators)
+        self.assertEqual(len(iterators), 2)
+        downloader.close()
+        self.assertFalse(any(iterator._thread.is_alive() for iterator in iterators))
+        self.assertLess(downloader.decompressed_bytes, len(CONTENT))
+
+    def test_no_read_ahead_by_default(self):
+        self.storage.add_blob("test-blob", "data.gz", gzip.compress(CONTENT))
+        downloader = self.decode("data.gz")
+        self.assertNotIsInstance(downloader.chunks(), ReadAheadIterator)
+        self.assertEqual(downloader._iterators, [])
+
+    def test_dropped_stream_is_closed(self):
+        self.storage.add_blob("test-blob", "data.gz", gzip.compress(CONTENT))
+        for _ in range(5):
+            downloader = decode_blob(
+                DecompressedBlob,
+                "data.gz",
+                MaxChunkGetSize=65536,
+                DecompressedChunkSize=1000,
+                ReadAhead=2,
+            )
+            # The function reads the start of the blob and returns
+            self.assertEqual(downloader.read(10), CONTENT[:10])
+            del downloader
+        gc.collect()
+
+        deadline = time.monotonic() + 5
+        while read_ahead_threads() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(read_ahead_threads(), 0)
+
+    def test_input_type(self):
+        self.assertTrue(
+            BlobClientConverter.check_input_type_annotation(DecompressedBlob)
+        )
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=DecompressedBlob
+            )
+        )
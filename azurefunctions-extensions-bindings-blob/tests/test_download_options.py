@@ -0,0 +1,92 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import os
+import unittest
+from unittest.mock import patch
+
+from azure.storage.blob import BlobClient as BlobClientSdk
+from azurefunctions.extensions.bindings.blob import StorageStreamDownloader
+from azurefunctions.extensions.bindings.blob.downloadOptions import (
+    CHUNK_SIZE_SETTING,
+    MAX_CONCURRENCY_SETTING,
+    DownloadOptions,
+)
+from tests.utils import MockMBD
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=fakeaccount;"
+    "AccountKey=ZmFrZWtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+class TestDownloadOptions(unittest.TestCase):
+    def test_defaults(self):
+        options = DownloadOptions.from_binding({})
+        self.assertEqual(options, DownloadOptions())
+        self.assertEqual(options.get_download_kwargs(), {})
+
+        client = BlobClientSdk.from_connection_string(CONNECTION_STRING, "c", "b")
+        self.assertIs(options.configure_client(client), client)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DownloadOptions(max_concurrency=0)
+
+    def test_binding_properties(self):
+        options = DownloadOptions.from_binding(
+            {
+                "MaxConcurrency": 8,
+                "MaxChunkGetSize": 1024,
+                "MaxSingleGetSize": 2048,
+                "ReadAhead": 3,
+            }
+        )
+        self.assertEqual(
+            options,
+            DownloadOptions(
+                max_concurrency=8,
+                chunk_size=1024,
+                initial_range_size=2048,
+                read_ahead=3,
+            ),
+        )
+
+    @patch.dict(os.environ, {MAX_CONCURRENCY_SETTING: "4", CHUNK_SIZE_SETTING: "1024"})
+    def test_app_settings(self):
+        options = DownloadOptions.from_binding({})
+        self.assertEqual(options, DownloadOptions(max_concurrency=4, chunk_size=1024))
+
+        # Binding properties take precedence over App Settings
+        options = DownloadOptions.from_binding({"MaxConcurrency": 2})
+        self.assertEqual(options, DownloadOptions(max_concurrency=2, chunk_size=1024))
+
+    def test_configure_client_does_not_change_shared_config(self):
+        client = BlobClientSdk.from_connection_string(CONNECTION_STRING, "c", "b")
+        default_chunk_size = client._config.max_chunk_get_size
+        options = DownloadOptions(chunk_size=1024, initial_range_size=2048)
+
+        configured = options.configure_client(client)
+
+        self.assertIsNot(configured, client)
+        self.assertEqual(configured._config.max_chunk_get_size, 1024)
+        self.assertEqual(configured._config.max_single_get_size, 2048)
+        self.assertEqual(client._config.max_chunk_get_size, default_chunk_size)
+        self.assertIs(configured._pipeline, client._pipeline)
+
+    @patch.dict(os.environ, {"FakeStorage": CONNECTION_STRING})
+    def test_storage_stream_downloader(self):
+        data = MockMBD(
+            {
+                "Connection": "FakeStorage",
+                "ContainerName": "test-blob",
+                "BlobName": "text.txt",
+                "MaxConcurrency": 4,
+                "MaxChunkGetSize": 1024,
+            }
+        )
+        result = StorageStreamDownloader(data=data).get_sdk_type()
+
+        self.assertFalse(result.started)
+        self.assertEqual(result._download_options, {"max_concurrency": 4})
+        self.assertEqual(result.blob_client._config.max_chunk_get_size, 1024)
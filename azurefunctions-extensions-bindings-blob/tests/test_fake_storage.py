@@ -0,0 +1,148 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceNotFoundError,
+)
+from azurefunctions.extensions.bindings.blob import (
+    BlobCache,
+    BlobClient,
+    BlobWriter,
+    ContainerClient,
+    StorageStreamDownloader,
+    aio,
+)
+from azurefunctions.extensions.bindings.blob.transport import get_async_transport
+from tests.utils import decode_blob, start_fake_storage
+
+
+class TestFakeBlobStorage(unittest.TestCase):
+    """
+    Runs the SDK types end to end against the local stand-in.
+    """
+
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+        self.content = os.urandom(3000)
+        self.storage.add_blob("test-blob", "input.bin", self.content)
+
+    def decode(self, pytype, blob: str = "input.bin"):
+        return decode_blob(pytype, blob, MaxBlockSize=1024)
+
+    def test_download(self):
+        stream = self.decode(StorageStreamDownloader)
+        self.assertEqual(stream.readall(), self.content)
+        self.assertEqual(self.storage.operations["GetBlob"], 1)
+        self.assertEqual(self.storage.bytes_sent, len(self.content))
+
+    def test_ranged_download(self):
+        client = self.decode(BlobClient)
+        self.assertEqual(
+            client.download_blob(offset=100, length=50).readall(),
+            self.content[100:150],
+        )
+
+    def test_empty_blob(self):
+        self.storage.add_blob("test-blob", "empty.bin", b"")
+        self.assertEqual(
+            self.decode(StorageStreamDownloader, "empty.bin").readall(), b""
+        )
+
+    def test_missing_blob(self):
+        client = self.decode(BlobClient, "missing.bin")
+        with self.assertRaises(ResourceNotFoundError):
+            client.download_blob()
+
+    def test_upload_and_properties(self):
+        client = self.decode(BlobClient, "output.txt")
+        client.upload_blob(b"hello", metadata={"origin": "test"})
+
+        properties = client.get_blob_properties()
+        self.assertEqual(properties.size, 5)
+        self.assertEqual(properties.metadata, {"origin": "test"})
+        self.assertEqual(self.storage.get_blob("test-blob", "output.txt"), b"hello")
+        with self.assertRaises(ResourceExistsError):
+            client.upload_blob(b"again")
+
+    def test_blob_writer_stages_blocks(self):
+        content = os.urandom(5000)
+        with self.decode(BlobWriter, "output.bin") as writer:
+            writer.write(content)
+
+        self.assertEqual(self.storage.get_blob("test-blob", "output.bin"), content)
+        self.assertEqual(self.storage.operations["PutBlock"], 5)
+        self.assertEqual(self.storage.operations["PutBlockList"], 1)
+        # The block list is a small XML document
+        self.assertGreater(self.storage.bytes_received, len(content))
+
+    def test_append_blob(self):
+        client = self.decode(BlobClient, "app.log")
+        client.create_append_blob()
+        client.append_block(b"first\n")
+        self.storage.append_blob("test-blob", "app.log", b"second\n")
+
+        properties = client.get_blob_properties()
+        self.assertEqual(properties.blob_type, "AppendBlob")
+        self.assertIsNotNone(properties.creation_time)
+        self.assertEqual(client.download_blob().readall(), b"first\nsecond\n")
+        self.assertEqual(self.storage.operations["AppendBlock"], 1)
+        with self.assertRaises(HttpResponseError):
+            self.decode(BlobClient).append_block(b"not an append blob")
+
+    def test_list_blobs(self):
+        self.storage.add_blob("test-blob", "other/a.txt", b"a")
+        container = self.decode(ContainerClient)
+        self.assertEqual(
+            [blob.name for blob in container.list_blobs()],
+            ["input.bin", "other/a.txt"],
+        )
+        self.assertEqual(
+            [blob.size for blob in container.list_blobs(name_starts_with="other/")],
+            [1],
+        )
+
+    def test_conditional_download(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = BlobCache(directory)
+            client = self.decode(BlobClient)
+            with cache.open(client) as file:
+                self.assertFalse(file.from_cache)
+            with cache.open(client) as file:
+                self.assertTrue(file.from_cache)
+                self.assertEqual(file.read(), self.content)
+
+            self.storage.add_blob("test-blob", "input.bin", b"changed")
+            with cache.open(client) as file:
+                self.assertFalse(file.from_cache)
+                self.assertEqual(file.read(), b"changed")
+
+    def test_async_download(self):
+        async def run():
+            client = self.decode(aio.BlobClient)
+            stream = await client.download_blob()
+            try:
+                return await stream.readall()
+            finally:
+                await get_async_transport().aclose()
+
+        self.assertEqual(asyncio.run(run()), self.content)
+
+    def test_latency_and_bandwidth(self):
+        self.storage.latency = 0.05
+        self.storage.bandwidth = 20000
+        client = self.decode(BlobClient)
+
+        started = time.perf_counter()
+        client.download_blob().readall()
+        elapsed = time.perf_counter() - started
+
+        # 50 ms of latency, then 3000 bytes at 20000 bytes per second
+        self.assertGreaterEqual(elapsed, 0.05 + 0.15 * 0.9)
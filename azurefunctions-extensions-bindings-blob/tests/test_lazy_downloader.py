@@ -0,0 +1,211 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import array
+import asyncio
+import io
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from azurefunctions.extensions.bindings.blob import LazyStorageStreamDownloader, aio
+from azurefunctions.extensions.bindings.blob.lazyDownloader import BufferWriter
+
+
+def write_ranges_out_of_order(content: bytes, range_size: int):
+    # Mimics a parallel download, which seeks before writing every range
+    def readinto(stream):
+        starts = list(range(0, len(content), range_size))
+        for start in reversed(starts):
+            stream.seek(start)
+            stream.write(content[start : start + range_size])
+        return len(content)
+
+    return readinto
+
+
+class TestLazyStorageStreamDownloader(unittest.TestCase):
+    def setUp(self):
+        self.blob_client = MagicMock()
+        self.blob_client.blob_name = "text.txt"
+        self.blob_client.container_name = "test-blob"
+        self.downloader = self.blob_client.download_blob.return_value
+
+    def test_no_download_until_accessed(self):
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        self.assertFalse(lazy.started)
+        self.assertEqual(lazy.name, "text.txt")
+        self.assertEqual(lazy.container, "test-blob")
+        self.assertIs(lazy.blob_client, self.blob_client)
+        self.blob_client.download_blob.assert_not_called()
+
+    def test_download_started_once_on_first_read(self):
+        self.downloader.read.return_value = b"abc"
+        self.downloader.readall.return_value = b"def"
+        self.downloader.chunks.return_value = iter([b"g"])
+        self.downloader.readinto.return_value = 3
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        self.assertEqual(lazy.read(3), b"abc")
+        self.assertEqual(lazy.readall(), b"def")
+        self.assertEqual(list(lazy.chunks()), [b"g"])
+        self.assertEqual(lazy.readinto(io.BytesIO()), 3)
+
+        self.assertTrue(lazy.started)
+        self.blob_client.download_blob.assert_called_once_with()
+
+    def test_properties_start_download(self):
+        self.downloader.size = 10
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        self.assertIs(lazy.properties, self.downloader.properties)
+        self.assertEqual(lazy.size, 10)
+        self.assertEqual(len(lazy), 10)
+        self.blob_client.download_blob.assert_called_once_with()
+
+    def test_other_attributes_are_delegated(self):
+        self.downloader.content_as_text.return_value = "text"
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        self.assertEqual(lazy.content_as_text(), "text")
+        with self.assertRaises(AttributeError):
+            lazy._not_an_attribute
+
+    def test_download_with_options(self):
+        lazy = LazyStorageStreamDownloader(self.blob_client, max_concurrency=2)
+
+        result = lazy.download(10, 20, max_concurrency=4)
+        self.assertIs(result, self.downloader)
+        lazy.read()
+
+        self.blob_client.download_blob.assert_called_once_with(
+            offset=10, length=20, max_concurrency=4
+        )
+
+    def test_download_after_start(self):
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+        lazy.read()
+
+        with self.assertRaises(ValueError):
+            lazy.download(offset=10)
+
+    def test_readinto_buffer(self):
+        content = bytes(range(256)) * 4
+        self.downloader.size = len(content)
+        self.downloader.readinto.side_effect = write_ranges_out_of_order(content, 100)
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        buffer = bytearray(len(content) + 10)
+        self.assertEqual(lazy.readinto(buffer), len(content))
+        self.assertEqual(buffer[: len(content)], content)
+        self.assertIsInstance(self.downloader.readinto.call_args[0][0], BufferWriter)
+
+    def test_readinto_buffer_too_small(self):
+        self.downloader.size = 100
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+
+        with self.assertRaises(ValueError):
+            lazy.readinto(bytearray(10))
+        self.downloader.readinto.assert_not_called()
+
+    def test_readinto_stream(self):
+        lazy = LazyStorageStreamDownloader(self.blob_client)
+        stream = io.BytesIO()
+        lazy.readinto(stream)
+        self.downloader.readinto.assert_called_once_with(stream)
+
+
+class TestBufferWriter(unittest.TestCase):
+    def test_write_and_seek(self):
+        buffer = bytearray(8)
+        writer = BufferWriter(buffer)
+
+        self.assertTrue(writer.seekable())
+        self.assertEqual(writer.write(b"abcd"), 4)
+        self.assertEqual(writer.tell(), 4)
+        writer.seek(-2, io.SEEK_END)
+        writer.write(memoryview(b"yz"))
+        writer.seek(-6, io.SEEK_CUR)
+        writer.write(b"ef")
+        self.assertEqual(bytes(buffer), b"abef\x00\x00yz")
+
+    def test_overflow(self):
+        writer = BufferWriter(bytearray(2))
+        with self.assertRaises(ValueError):
+            writer.write(b"abc")
+        with self.assertRaises(ValueError):
+            writer.seek(-1)
+
+    def test_read_only_buffer(self):
+        with self.assertRaises(TypeError):
+            BufferWriter(b"read only")
+
+    def test_typed_buffer(self):
+        values = array.array("d", [0.0, 0.0])
+        writer = BufferWriter(values)
+        writer.write(array.array("d", [1.5, 2.5]).tobytes())
+        self.assertEqual(values.tolist(), [1.5, 2.5])
+
+
+class TestAsyncLazyStorageStreamDownloader(unittest.TestCase):
+    def setUp(self):
+        self.blob_client = MagicMock()
+        self.downloader = MagicMock()
+        self.downloader.read = AsyncMock(return_value=b"abc")
+        self.downloader.readall = AsyncMock(return_value=b"def")
+        self.downloader.readinto = AsyncMock(return_value=3)
+        self.blob_client.download_blob = AsyncMock(return_value=self.downloader)
+
+    def test_no_download_until_awaited(self):
+        lazy = aio.LazyStorageStreamDownloader(self.blob_client)
+
+        self.assertFalse(lazy.started)
+        self.blob_client.download_blob.assert_not_awaited()
+
+    def test_download_started_once(self):
+        async def chunks():
+            yield b"g"
+
+        self.downloader.chunks = chunks
+        lazy = aio.LazyStorageStreamDownloader(self.blob_client)
+
+        async def run():
+            return (
+                await lazy.read(3),
+                await lazy.readall(),
+                await lazy.readinto(io.BytesIO()),
+                [chunk async for chunk in lazy.chunks()],
+                await lazy.get_properties(),
+            )
+
+        result = asyncio.run(run())
+        self.assertEqual(
+            result, (b"abc", b"def", 3, [b"g"], self.downloader.properties)
+        )
+        self.blob_client.download_blob.assert_awaited_once_with()
+
+    def test_download_with_options(self):
+        lazy = aio.LazyStorageStreamDownloader(self.blob_client)
+
+        async def run():
+            await lazy.download(length=5, max_concurrency=3)
+            with self.assertRaises(ValueError):
+                await lazy.download()
+            return await lazy.read()
+
+        self.assertEqual(asyncio.run(run()), b"abc")
+        self.blob_client.download_blob.assert_awaited_once_with(
+            offset=None, length=5, max_concurrency=3
+        )
+
+    def test_readinto_buffer(self):
+        content = b"0123456789"
+        self.downloader.size = len(content)
+        self.downloader.readinto = AsyncMock(
+            side_effect=write_ranges_out_of_order(content, 3)
+        )
+        lazy = aio.LazyStorageStreamDownloader(self.blob_client)
+
+        buffer = bytearray(len(content))
+        self.assertEqual(asyncio.run(lazy.readinto(buffer)), len(content))
+        self.assertEqual(bytes(buffer), content)
@@ -0,0 +1,127 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import gc
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    BlobMapping,
+    MemoryMappedBlob,
+)
+from azurefunctions.extensions.bindings.blob.memoryMappedBlob import (
+    SPILL_DIRECTORY_SETTING,
+)
+from tests.utils import MockMBD
+
+CONTENT = b"0123456789" * 1000
+
+
+def mock_service_client(content: bytes):
+    def readinto(stream):
+        # Write in ranges, as the SDK does
+        for start in range(0, len(content), 4096):
+            stream.write(content[start : start + 4096])
+        return len(content)
+
+    service_client = MagicMock()
+    downloader = service_client.get_blob_client.return_value.download_blob.return_value
+    downloader.readinto.side_effect = readinto
+    return service_client
+
+
+class TestMemoryMappedBlob(unittest.TestCase):
+    def setUp(self):
+        self.spill_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(
+            os.environ,
+            {"FakeStorage": "fake", SPILL_DIRECTORY_SETTING: self.spill_dir.name},
+        )
+        self.env.start()
+        self.datum = Datum(
+            value=MockMBD(
+                {
+                    "Connection": "FakeStorage",
+                    "ContainerName": "test-blob",
+                    "BlobName": "large.bin",
+                }
+            ),
+            type="model_binding_data",
+        )
+
+    def tearDown(self):
+        self.env.stop()
+        self.spill_dir.cleanup()
+
+    def decode(self, content: bytes) -> BlobMapping:
+        with patch(
+            "azurefunctions.extensions.bindings.blob.memoryMappedBlob."
+            "get_blob_service_client",
+            return_value=mock_service_client(content),
+        ):
+            return BlobClientConverter.decode(
+                data=self.datum, trigger_metadata=None, pytype=MemoryMappedBlob
+            )
+
+    def test_input_type(self):
+        self.assertTrue(
+            BlobClientConverter.check_input_type_annotation(MemoryMappedBlob)
+        )
+
+    def test_input_empty(self):
+        datum = Datum(value={}, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=MemoryMappedBlob
+            )
+        )
+
+    def test_mapping(self):
+        mapping = self.decode(CONTENT)
+
+        self.assertIsInstance(mapping, BlobMapping)
+        self.assertEqual(len(mapping), len(CONTENT))
+        self.assertEqual(mapping.view[:10].tobytes(), b"0123456789")
+        self.assertEqual(mapping.mmap[-10:], b"0123456789")
+        self.assertTrue(mapping.view.readonly)
+        mapping.close()
+        self.assertTrue(mapping.closed)
+        with self.assertRaises(ValueError):
+            mapping.view
+
+    def test_empty_blob(self):
+        with self.decode(b"") as mapping:
+            self.assertEqual(mapping.size, 0)
+            self.assertIsNone(mapping.mmap)
+            self.assertEqual(mapping.view.tobytes(), b"")
+
+    def test_file_removed_when_released(self):
+        mapping = self.decode(CONTENT)
+        del mapping
+        gc.collect()
+        self.assertEqual(os.listdir(self.spill_dir.name), [])
+
+    def test_file_removed_on_error(self):
+        service_client = MagicMock()
+        service_client.get_blob_client.return_value.download_blob.side_effect = (
+            ValueError("download failed")
+        )
+        with patch(
+            "azurefunctions.extensions.bindings.blob.memoryMappedBlob."
+            "get_blob_service_client",
+            return_value=service_client,
+        ):
+            with self.assertRaises(ValueError):
+                MemoryMappedBlob(data=self.datum.value).get_sdk_type()
+        self.assertEqual(os.listdir(self.spill_dir.name), [])
+
+    def test_close_with_exported_view(self):
+        mapping = self.decode(CONTENT)
+        exported = memoryview(mapping.mmap)
+        mapping.close()
+        self.assertEqual(exported[:1].tobytes(), b"0")
+        exported.release()
@@ -0,0 +1,129 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import io
+import os
+import unittest
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    BlobRawIO,
+    ParquetBlob,
+    ParquetBlobReader,
+)
+from azurefunctions.extensions.bindings.blob.clientPool import (
+    create_blob_service_client,
+)
+from azurefunctions.extensions.bindings.blob.seekableOptions import SeekableOptions
+from tests.utils import decode_blob, start_fake_storage
+
+
+def make_table(num_rows=40000, num_columns=40) -> pa.Table:
+    columns = {
+        f"column_{i}": pa.array(
+            [os.urandom(8).hex() for _ in range(num_rows)]
+            if i % 2
+            else range(i * num_rows, (i + 1) * num_rows)
+        )
+        for i in range(num_columns)
+    }
+    columns["category"] = pa.array(["a", "b", "c", "d"] * (num_rows // 4))
+    return pa.table(columns)
+
+
+def to_parquet(table: pa.Table, row_group_size=10000) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+class TestParquetBlobReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = make_table()
+        cls.content = to_parquet(cls.table)
+
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+        self.storage.add_blob("test-blob", "data.parquet", self.content)
+        self.service_client = create_blob_service_client(
+            self.storage.connection_string, False
+        )
+
+    def open(self, max_concurrency=4):
+        raw = BlobRawIO(
+            self.service_client.get_blob_client("test-blob", "data.parquet"),
+            SeekableOptions(block_size=16384, cache_size=16777216),
+        )
+        return ParquetBlobReader(raw, max_concurrency=max_concurrency)
+
+    def test_metadata(self):
+        with self.open() as reader:
+            self.assertEqual(reader.num_row_groups, 4)
+            self.assertEqual(reader.schema_arrow, self.table.schema)
+            self.assertEqual(reader.metadata.num_rows, 40000)
+            # The footer is at the end of the blob
+            self.assertLess(reader.bytes_downloaded, len(self.content) // 10)
+
+    def test_column_projection(self):
+        columns = ["column_0", "column_3", "category"]
+        with self.open() as reader:
+            table = reader.read(columns)
+            self.assertEqual(table, self.table.select(columns))
+            # 3 columns out of 41, and the footer
+            self.assertLess(reader.bytes_downloaded, len(self.content) // 8)
+
+    def test_column_chunks_are_downloaded_before_decoding(self):
+        with self.open() as reader:
+            reader.metadata
+            requests = reader.requests
+            batches = list(
+                reader.iter_batches(["column_1", "column_20"], row_groups=[2])
+            )
+            # One GET per column chunk, and none while decoding
+            self.assertEqual(reader.requests, requests + 2)
+            self.assertEqual(
+                pa.Table.from_batches(batches),
+                self.table.select(["column_1", "column_20"]).slice(20000, 10000),
+            )
+
+    def test_batch_size(self):
+        with self.open(max_concurrency=1) as reader:
+            batches = list(reader.iter_batches(["column_0"], batch_size=4000))
+        self.assertEqual(len(batches), 12)
+        self.assertTrue(all(batch.num_rows <= 4000 for batch in batches))
+        self.assertEqual(sum(batch.num_rows for batch in batches), 40000)
+
+    def test_all_columns(self):
+        with self.open() as reader:
+            self.assertEqual(reader.read(), self.table)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            self.open(max_concurrency=0)
+
+
+class TestParquetBlob(unittest.TestCase):
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(ParquetBlob))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=ParquetBlob
+            )
+        )
+
+    def test_input_populated(self):
+        table = pa.table({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+        storage = start_fake_storage(self)
+        storage.add_blob("test-blob", "data.parquet", to_parquet(table))
+        reader = decode_blob(ParquetBlob, "data.parquet", MaxConcurrency=2)
+        self.assertEqual(storage.requests, 0)
+        self.assertIsInstance(reader, ParquetBlobReader)
+        self.assertEqual(reader._max_concurrency, 2)
+        self.assertEqual(reader.read(["name"]), table.select(["name"]))
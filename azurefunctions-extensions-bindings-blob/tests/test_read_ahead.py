@@ -0,0 +1,211 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import gc
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from azurefunctions.extensions.bindings.blob import LazyStorageStreamDownloader, aio
+from azurefunctions.extensions.bindings.blob.readAhead import (
+    AsyncReadAheadIterator,
+    ReadAheadIterator,
+)
+
+
+def failing_chunks():
+    yield b"a"
+    raise ConnectionError("connection reset")
+
+
+class TestReadAheadIterator(unittest.TestCase):
+    def test_yields_all_chunks_in_order(self):
+        chunks = [bytes([i]) * 10 for i in range(20)]
+        with ReadAheadIterator(iter(chunks), 4) as iterator:
+            self.assertEqual(list(iterator), chunks)
+
+        self.assertEqual(iterator.stats.chunks, 20)
+        self.assertEqual(iterator.stats.bytes, 200)
+        self.assertLessEqual(iterator.stats.max_queue_depth, 4)
+
+    def test_prefetches_while_consumer_works(self):
+        def slow_source():
+            for i in range(4):
+                time.sleep(0.05)
+                yield bytes([i])
+
+        iterator = ReadAheadIterator(slow_source(), 4)
+        # The chunks are downloaded while the consumer is busy
+        time.sleep(0.3)
+        started = time.perf_counter()
+        self.assertEqual(len(list(iterator)), 4)
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertEqual(iterator.stats.max_queue_depth, 4)
+
+    def test_producer_stalls_on_full_queue(self):
+        iterator = ReadAheadIterator(iter([b"a", b"b", b"c"]), 1)
+        time.sleep(0.05)
+        list(iterator)
+        self.assertGreater(iterator.stats.producer_stall_time, 0.0)
+        self.assertEqual(iterator.stats.max_queue_depth, 1)
+
+    def test_error_is_raised_to_consumer(self):
+        iterator = ReadAheadIterator(failing_chunks(), 2)
+        self.assertEqual(next(iterator), b"a")
+        with self.assertRaises(ConnectionError):
+            next(iterator)
+        with self.assertRaises(StopIteration):
+            next(iterator)
+
+    def test_close_stops_producer(self):
+        produced = []
+        event = threading.Event()
+
+        def source():
+            for i in range(100):
+                produced.append(i)
+                yield b"x"
+            event.set()
+
+        iterator = ReadAheadIterator(source(), 2)
+        next(iterator)
+        iterator.close()
+
+        self.assertFalse(iterator._thread.is_alive())
+        self.assertFalse(event.is_set())
+        self.assertLess(len(produced), 100)
+
+    def test_dropped_iterator_stops_producer(self):
+        closed = threading.Event()
+
+        def source():
+            try:
+                while True:
+                    yield b"x" * 1024
+            finally:
+                closed.set()
+
+        baseline = threading.active_count()
+        for _ in range(5):
+            iterator = ReadAheadIterator(source(), 2)
+            next(iterator)
+            # The function returns without closing the iterator
+            del iterator
+        gc.collect()
+
+        deadline = time.monotonic() + 5
+        while threading.active_count() > baseline:
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        self.assertEqual(threading.active_count(), baseline)
+        self.assertTrue(closed.is_set())
+
+    def test_invalid_depth(self):
+        with self.assertRaises(ValueError):
+            ReadAheadIterator(iter([]), 0)
+
+
+class TestAsyncReadAheadIterator(unittest.TestCase):
+    def test_yields_all_chunks(self):
+        async def source():
+            for i in range(10):
+                await asyncio.sleep(0)
+                yield bytes([i])
+
+        async def run():
+            async with AsyncReadAheadIterator(source(), 3) as iterator:
+                return [chunk async for chunk in iterator], iterator.stats
+
+        chunks, stats = asyncio.run(run())
+        self.assertEqual(chunks, [bytes([i]) for i in range(10)])
+        self.assertEqual(stats.chunks, 10)
+        self.assertLessEqual(stats.max_queue_depth, 3)
+
+    def test_error_is_raised_to_consumer(self):
+        async def source():
+            yield b"a"
+            raise ConnectionError("connection reset")
+
+        async def run():
+            iterator = AsyncReadAheadIterator(source(), 2)
+            self.assertEqual(await iterator.__anext__(), b"a")
+            with self.assertRaises(ConnectionError):
+                await iterator.__anext__()
+
+        asyncio.run(run())
+
+    def test_aclose_cancels_producer(self):
+        async def source():
+            while True:
+                yield b"x"
+
+        async def run():
+            iterator = AsyncReadAheadIterator(source(), 2)
+            await iterator.__anext__()
+            await iterator.aclose()
+            return iterator._task
+
+        self.assertTrue(asyncio.run(run()).cancelled())
+
+    def test_dropped_iterator_cancels_producer(self):
+        async def source():
+            while True:
+                yield b"x"
+
+        async def run():
+            iterator = AsyncReadAheadIterator(source(), 2)
+            await iterator.__anext__()
+            task = iterator._task
+            # The function returns without closing the iterator
+            del iterator
+            gc.collect()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            return task.cancelled()
+
+        self.assertTrue(asyncio.run(run()))
+
+
+class TestLazyDownloaderReadAhead(unittest.TestCase):
+    def test_chunks_read_ahead(self):
+        blob_client = MagicMock()
+        blob_client.download_blob.return_value.chunks.return_value = iter([b"a", b"b"])
+
+        lazy = LazyStorageStreamDownloader(blob_client, read_ahead=2)
+        chunks = lazy.chunks()
+
+        self.assertIsInstance(chunks, ReadAheadIterator)
+        self.assertEqual(chunks.stats.depth, 2)
+        self.assertEqual(list(chunks), [b"a", b"b"])
+        blob_client.download_blob.assert_called_once_with()
+
+    def test_chunks_read_ahead_disabled(self):
+        blob_client = MagicMock()
+        lazy = LazyStorageStreamDownloader(blob_client, read_ahead=2)
+
+        chunks = lazy.chunks(read_ahead=0)
+        self.assertIs(
+            chunks, blob_client.download_blob.return_value.chunks.return_value
+        )
+
+    def test_async_chunks_read_ahead(self):
+        async def chunks():
+            yield b"a"
+            yield b"b"
+
+        blob_client = MagicMock()
+        downloader = MagicMock()
+        downloader.chunks = chunks
+        blob_client.download_blob = AsyncMock(return_value=downloader)
+        lazy = aio.LazyStorageStreamDownloader(blob_client)
+
+        async def run():
+            iterator = lazy.chunks(read_ahead=4)
+            self.assertIsInstance(iterator, AsyncReadAheadIterator)
+            return [chunk async for chunk in iterator]
+
+        self.assertEqual(asyncio.run(run()), [b"a", b"b"])
+        blob_client.download_blob.assert_awaited_once_with()
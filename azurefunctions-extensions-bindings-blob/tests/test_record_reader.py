@@ -0,0 +1,222 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import csv
+import gzip
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+import numpy
+import pyarrow
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import (
+    BlobClientConverter,
+    RecordBlob,
+    RecordReader,
+)
+from azurefunctions.extensions.bindings.blob.recordReader import (
+    BATCH_SIZE_SETTING,
+    RecordOptions,
+    detect_format,
+)
+from tests.utils import decode_blob, start_fake_storage
+
+RECORDS = [
+    {"id": i, "name": f"item {i}", "price": i * 1.5, "tags": ["a", "b"][: i % 3]}
+    for i in range(1000)
+]
+NDJSON = b"".join(json.dumps(record).encode() + b"\n" for record in RECORDS)
+
+
+def to_csv(rows, delimiter=",") -> bytes:
+    text = io.StringIO(newline="")
+    writer = csv.writer(text, delimiter=delimiter)
+    writer.writerows(rows)
+    return text.getvalue().encode()
+
+
+CSV_ROWS = [["id", "comment"]] + [
+    [str(i), f"line one\nline two of {i}" if i % 7 == 0 else f"comment, {i}"]
+    for i in range(500)
+]
+CSV = to_csv(CSV_ROWS)
+
+
+class ChunkedStream(io.RawIOBase):
+    """
+    A stream whose chunks() splits the content into chunks of a given size.
+    """
+
+    def __init__(self, content: bytes, size: int, name: str = ""):
+        self._content = io.BytesIO(content)
+        self._size = size
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._content.read(min(len(buffer), self._size))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def chunks(self):
+        return iter(lambda: self._content.read(self._size), b"")
+
+
+class TestRecordOptions(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RecordOptions(format="parquet")
+        with self.assertRaises(ValueError):
+            RecordOptions(batch_size=0)
+        with self.assertRaises(ValueError):
+            RecordOptions(delimiter=";;")
+
+    @patch.dict(os.environ, {BATCH_SIZE_SETTING: "500"})
+    def test_from_binding(self):
+        self.assertEqual(RecordOptions.from_binding({}), RecordOptions(batch_size=500))
+        self.assertEqual(
+            RecordOptions.from_binding(
+                {"RecordFormat": "CSV", "RecordBatchSize": 10, "CsvDelimiter": ";"}
+            ),
+            RecordOptions(format="csv", batch_size=10, delimiter=";"),
+        )
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("events/2024.jsonl"), "ndjson")
+        self.assertEqual(detect_format("events.NDJSON.gz"), "ndjson")
+        self.assertEqual(detect_format("sales.csv.zst"), "csv")
+        self.assertEqual(detect_format("sales.tsv"), "csv")
+        with self.assertRaises(ValueError):
+            detect_format("sales.parquet")
+        # A .json blob may be a single document, e.g. an array
+        with self.assertRaisesRegex(ValueError, "RecordFormat"):
+            detect_format("events.json")
+
+
+class TestRecordReader(unittest.TestCase):
+    def reader(self, content: bytes, name: str, size: int = 1000, **options):
+        return RecordReader(
+            ChunkedStream(content, size), RecordOptions(**options), name=name
+        )
+
+    def test_ndjson_records_across_chunks(self):
+        for size in (1, 13, 4096, len(NDJSON)):
+            with self.subTest(size=size):
+                reader = self.reader(NDJSON, "data.jsonl", size)
+                self.assertEqual(list(reader), RECORDS)
+                self.assertEqual(reader.records_read, len(RECORDS))
+
+    def test_ndjson_batches(self):
+        batches = list(self.reader(NDJSON, "data.jsonl").batches(300))
+        self.assertEqual([len(batch) for batch in batches], [300, 300, 300, 100])
+        self.assertEqual(sum(batches, []), RECORDS)
+
+    def test_ndjson_edge_cases(self):
+        content = b'\xef\xbb\xbf{"a": 1}\r\n\n  \n{"a": 2}\n{"a": 3}'
+        for size in (1, 2, len(content)):
+            with self.subTest(size=size):
+                self.assertEqual(
+                    list(self.reader(content, "data.ndjson", size)),
+                    [{"a": 1}, {"a": 2}, {"a": 3}],
+                )
+
+    def test_invalid_ndjson(self):
+        reader = self.reader(b'{"a": 1}\n{"a": \n', "data.jsonl")
+        with self.assertRaisesRegex(ValueError, "Invalid JSON record"):
+            list(reader)
+
+    def test_csv_records_across_chunks(self):
+        expected = [dict(zip(CSV_ROWS[0], row)) for row in CSV_ROWS[1:]]
+        for size in (1, 7, len(CSV)):
+            with self.subTest(size=size):
+                reader = self.reader(b"\xef\xbb\xbf" + CSV, "data.csv", size)
+                self.assertEqual(list(reader), expected)
+
+    def test_csv_delimiter(self):
+        content = to_csv([["a", "b"], ["1", "x,y"]], delimiter="\t")
+        self.assertEqual(
+            list(self.reader(content, "data.tsv")), [{"a": "1", "b": "x,y"}]
+        )
+        content = to_csv([["a", "b"], ["1", "2"]], delimiter=";")
+        self.assertEqual(
+            list(self.reader(content, "data", format="csv", delimiter=";")),
+            [{"a": "1", "b": "2"}],
+        )
+
+    def test_arrow_batches(self):
+        reader = self.reader(NDJSON, "data.jsonl", 13)
+        batches = list(reader.arrow_batches(256))
+        self.assertEqual([batch.num_rows for batch in batches], [256, 256, 256, 232])
+        table = pyarrow.Table.from_batches(batches)
+        self.assertEqual(table.to_pylist(), RECORDS)
+        self.assertEqual(reader.records_read, len(RECORDS))
+
+        batches = list(self.reader(CSV, "data.csv", 7).arrow_batches())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            batches[0].column("comment").to_pylist(), [row[1] for row in CSV_ROWS[1:]]
+        )
+
+    def test_numpy_batches(self):
+        batches = list(self.reader(NDJSON, "data.jsonl").numpy_batches(400))
+        self.assertEqual(len(batches), 3)
+        ids = numpy.concatenate([batch["id"] for batch in batches])
+        numpy.testing.assert_array_equal(ids, numpy.arange(1000))
+        self.assertEqual(batches[0]["price"].dtype, numpy.float64)
+
+    def test_read_once(self):
+        reader = self.reader(NDJSON, "data.jsonl")
+        list(reader)
+        with self.assertRaises(ValueError):
+            next(reader.batches())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(self.reader(NDJSON, "data.bin"))
+
+
+class TestRecordBlob(unittest.TestCase):
+    def setUp(self):
+        self.storage = start_fake_storage(self)
+
+    def decode(self, blob: str, **properties) -> RecordReader:
+        reader = decode_blob(
+            RecordBlob,
+            blob,
+            MaxSingleGetSize=4096,
+            MaxChunkGetSize=4096,
+            **properties,
+        )
+        self.addCleanup(reader.close)
+        return reader
+
+    def test_compressed_records(self):
+        self.storage.add_blob("test-blob", "data.jsonl.gz", gzip.compress(NDJSON))
+        reader = self.decode("data.jsonl.gz", DecompressedChunkSize=100)
+        self.assertEqual(self.storage.requests, 0)
+        self.assertEqual(reader.format, "ndjson")
+        self.assertEqual(reader.batch_size, 10000)
+        self.assertEqual(list(reader), RECORDS)
+        self.assertGreater(self.storage.operations["GetBlob"], 1)
+
+    def test_binding_options(self):
+        self.storage.add_blob("test-blob", "export", CSV)
+        reader = self.decode("export", RecordFormat="csv", RecordBatchSize=100)
+        batches = list(reader.arrow_batches())
+        self.assertEqual([batch.num_rows for batch in batches], [100] * 5)
+
+    def test_input_type(self):
+        self.assertTrue(BlobClientConverter.check_input_type_annotation(RecordBlob))
+
+    def test_none_input(self):
+        datum = Datum(value=None, type="model_binding_data")
+        self.assertIsNone(
+            BlobClientConverter.decode(
+                data=datum, trigger_metadata=None, pytype=RecordBlob
+            )
+        )
@@ -11,6 +11,7 @@ from azurefunctions.extensions.base import Datum
 
 from azurefunctions.extensions.bindings.blob import (
     BlobClientConverter,
+    LazyStorageStreamDownloader,
     StorageStreamDownloader,
 )
 
@@ -122,12 +123,14 @@ class TestStorageStreamDownloader(unittest.TestCase):
         )
 
         self.assertIsNotNone(result)
-        self.assertIsInstance(result, SSDSdk)
+        self.assertIsInstance(result, LazyStorageStreamDownloader)
+        self.assertIsInstance(result.download(), SSDSdk)
 
         sdk_result = StorageStreamDownloader(data=datum.value).get_sdk_type()
 
         self.assertIsNotNone(sdk_result)
-        self.assertIsInstance(sdk_result, SSDSdk)
+        self.assertIsInstance(sdk_result, LazyStorageStreamDownloader)
+        self.assertIsInstance(sdk_result.download(), SSDSdk)
 
     def test_invalid_input_populated(self):
         content = {
@@ -198,12 +201,14 @@ class TestStorageStreamDownloader(unittest.TestCase):
         )
 
         self.assertIsNotNone(result)
-        self.assertIsInstance(result, SSDSdk)
+        self.assertIsInstance(result, LazyStorageStreamDownloader)
+        self.assertIsInstance(result.download(), SSDSdk)
 
         sdk_result = StorageStreamDownloader(data=datum.value).get_sdk_type()
 
         self.assertIsNotNone(sdk_result)
-        self.assertIsInstance(sdk_result, SSDSdk)
+        self.assertIsInstance(sdk_result, LazyStorageStreamDownloader)
+        self.assertIsInstance(sdk_result.download(), SSDSdk)
 
     def test_input_populated_managed_identity_trigger(self):
         content = {
@@ -225,12 +230,14 @@ class TestStorageStreamDownloader(unittest.TestCase):
         )
 
         self.assertIsNotNone(result)
-        self.assertIsInstance(result, SSDSdk)
+        self.assertIsInstance(result, LazyStorageStreamDownloader)
+        self.assertIsInstance(result.download(), SSDSdk)
 
         sdk_result = StorageStreamDownloader(data=datum.value).get_sdk_type()
 
         self.assertIsNotNone(sdk_result)
-        self.assertIsInstance(sdk_result, SSDSdk)
+        self.assertIsInstance(sdk_result, LazyStorageStreamDownloader)
+        self.assertIsInstance(sdk_result.download(), SSDSdk)
 
     def test_input_invalid_pytype(self):
         content = {
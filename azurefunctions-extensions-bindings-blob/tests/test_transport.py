@@ -0,0 +1,116 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+import asyncio
+import os
+import unittest
+from unittest.mock import patch
+
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azurefunctions.extensions.bindings.blob.clientPool import (
+    create_blob_service_client,
+)
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+from azurefunctions.extensions.bindings.blob.transport import (
+    KEEP_ALIVE_SETTING,
+    POOL_MAXSIZE_SETTING,
+    READ_TIMEOUT_SETTING,
+    SharedAsyncTransport,
+    TransportOptions,
+    close_transports,
+    get_async_transport,
+    get_transport,
+)
+
+
+class TestTransportOptions(unittest.TestCase):
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TransportOptions(pool_maxsize=0)
+        with self.assertRaises(ValueError):
+            TransportOptions(read_timeout=0)
+        with self.assertRaises(ValueError):
+            TransportOptions(keep_alive=-1)
+
+    def test_defaults(self):
+        self.assertEqual(TransportOptions.from_settings(), TransportOptions())
+
+    @patch.dict(
+        os.environ,
+        {
+            POOL_MAXSIZE_SETTING: "128",
+            READ_TIMEOUT_SETTING: "0",
+            KEEP_ALIVE_SETTING: "0",
+        },
+    )
+    def test_from_settings(self):
+        self.assertEqual(
+            TransportOptions.from_settings(),
+            TransportOptions(pool_maxsize=128, keep_alive=0),
+        )
+
+
+class TestSharedTransport(unittest.TestCase):
+    def setUp(self):
+        close_transports()
+        self.addCleanup(close_transports)
+        self.storages = [FakeBlobStorage(), FakeBlobStorage()]
+        for storage in self.storages:
+            storage.__enter__()
+            self.addCleanup(storage.__exit__)
+            storage.add_blob("test-blob", "input.bin", b"content")
+
+    def test_clients_share_transport(self):
+        clients = [
+            create_blob_service_client(storage.connection_string, False)
+            for storage in self.storages
+        ]
+        for client in clients:
+            self.assertIs(client._pipeline._transport, get_transport())
+            blob = client.get_blob_client("test-blob", "input.bin")
+            self.assertEqual(blob.download_blob().readall(), b"content")
+
+        # Closing a client keeps the connections of the others
+        clients[0].close()
+        blob = clients[1].get_blob_client("test-blob", "input.bin")
+        self.assertEqual(blob.download_blob().readall(), b"content")
+        self.assertIsNotNone(get_transport().session)
+
+    @patch.dict(os.environ, {POOL_MAXSIZE_SETTING: "100", KEEP_ALIVE_SETTING: "0"})
+    def test_options_from_settings(self):
+        transport = get_transport()
+
+        adapter = transport.session.get_adapter("https://")
+        self.assertEqual(adapter._pool_maxsize, 100)
+        self.assertEqual(transport.session.headers["Connection"], "close")
+        self.assertEqual(transport.connection_config.read_timeout, 60)
+
+    def test_close_transports(self):
+        transport = get_transport()
+        close_transports()
+        self.assertIsNot(get_transport(), transport)
+
+    def test_async_clients_share_transport(self):
+        async def run():
+            transport = get_async_transport()
+            contents = []
+            for storage in self.storages:
+                client = create_blob_service_client(
+                    storage.connection_string, False, AsyncBlobServiceClient
+                )
+                self.assertIs(client._pipeline._transport, transport)
+                blob = client.get_blob_client("test-blob", "input.bin")
+                contents.append(await (await blob.download_blob()).readall())
+                await client.close()
+            await transport.aclose()
+            return contents
+
+        self.assertEqual(asyncio.run(run()), [b"content", b"content"])
+
+    def test_async_transport_per_loop(self):
+        async def get():
+            return get_async_transport()
+
+        first = asyncio.run(get())
+        self.assertIsInstance(first, SharedAsyncTransport)
+        self.assertIsNot(asyncio.run(get()), first)
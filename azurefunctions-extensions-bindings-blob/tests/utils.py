@@ -0,0 +1,78 @@
+#  Copyright (c) Microsoft Corporation. All rights reserved.
+#  Licensed under the MIT License.
+
+"""Helpers shared by the tests of the blob bindings."""
+
+import json
+import os
+import unittest
+from typing import Any
+from unittest.mock import patch
+
+from azurefunctions.extensions.base import Datum
+from azurefunctions.extensions.bindings.blob import BlobClientConverter
+from azurefunctions.extensions.bindings.blob.bindingContent import (
+    clear_binding_content_cache,
+)
+from azurefunctions.extensions.bindings.blob.testing import FakeBlobStorage
+
+
+class MockMBD:
+    """
+    The model_binding_data the host sends for a blob binding.
+    """
+
+    def __init__(self, content: dict):
+        self.version = "1.0"
+        self.source = "AzureStorageBlobs"
+        self.content_type = "application/json"
+        self.content = json.dumps(content)
+
+
+def make_datum(
+    blob: str,
+    *,
+    container: str = "test-blob",
+    connection: str = "FakeStorage",
+    **properties: Any,
+) -> Datum:
+    """
+    Returns the model_binding_data of a blob. The keyword arguments are
+    added to the binding properties, e.g. MaxBlockSize.
+    """
+    return Datum(
+        value=MockMBD(
+            {
+                "Connection": connection,
+                "ContainerName": container,
+                "BlobName": blob,
+                **properties,
+            }
+        ),
+        type="model_binding_data",
+    )
+
+
+def decode_blob(pytype: type, blob: str, **properties: Any) -> Any:
+    """
+    Decodes a blob of the FakeStorage connection into pytype.
+    """
+    return BlobClientConverter.decode(
+        data=make_datum(blob, **properties), trigger_metadata=None, pytype=pytype
+    )
+
+
+def start_fake_storage(test: unittest.TestCase, **options: Any) -> FakeBlobStorage:
+    """
+    Starts a FakeBlobStorage for the duration of a test, and points the
+    FakeStorage connection at it. The keyword arguments are passed to
+    FakeBlobStorage, e.g. latency.
+    """
+    storage = FakeBlobStorage(**options)
+    storage.__enter__()
+    test.addCleanup(storage.__exit__)
+    environ = patch.dict(os.environ, storage.environ("FakeStorage"))
+    environ.start()
+    test.addCleanup(environ.stop)
+    test.addCleanup(clear_binding_content_cache)
+    return storage